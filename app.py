@@ -1,34 +1,124 @@
-from flask import Flask, render_template, request, redirect, url_for, session
+import hashlib
+import os
+from datetime import date, datetime
+
+from flask import (
+    Flask, render_template, request, redirect, url_for, session, jsonify,
+    make_response
+)
+import numpy as np
+import orjson
 import pandas as pd
 import plotly.express as px
 import plotly.io as pio
-from flask_caching import Cache
 
 print("=== LOADING app.py FROM:", __file__)
 
 
 # ---------------- COMPONENT IMPORTS ----------------
 from logic.component1_transfers import run_component1
-from logic.component2_inventory import run_component2
-from logic.component3a_vendor_ontime import run_component3a
-from logic.component3b_order_delivery import run_component3b
-from logic.component3c_vendor_performance import run_component3c
-from logic.component4_sales_invoice import run_component4
-from logic.component5_po_sla import run_component5
-from logic.component5a_rm_quarterly import run_component5a_rm
-from logic.component6_short_closed_so import run_component6
+from logic.component2_inventory import (
+    run_component2, run_component2_state, run_component2_trend
+)
+from logic.component3c_vendor_performance import run_component3c_scorecard
 from logic.component7_cost_optimization import run_component7
+from logic import (
+    component1_transfers,
+    component2_inventory,
+    component3a_vendor_ontime,
+    component3b_order_delivery,
+    component3c_vendor_performance,
+    component4_sales_invoice,
+    component5_po_sla,
+    component5a_rm_quarterly,
+    component6_short_closed_so,
+    component7_cost_optimization,
+    po_facts,
+)
+from logic.ingest import input_columns, file_digest, dataset_key, parse_uploads
+from logic.keys import KeyDictionary
+from logic.dataset_store import DatasetStore
+from logic.po_facts import (
+    FACT_INPUTS, facts_key, in_groups, load_po_facts, posting_groups
+)
+from logic.dormancy_state import load_dormancy_state
+from logic.delivery_histogram import MAX_SLA_DAYS
+from logic.vendor_scorecard import events_key, load_vendor_events
+from logic.vendors import DIMENSION_NAME, load_vendor_dimension, match_key
+from logic.o2c_sketch import (
+    SKETCH_INPUTS, load_o2c_sketch, o2c_metrics, o2c_monthly, sketch_key
+)
+from logic.short_closure_cube import (
+    DIMENSIONS, cube_key, load_short_closure_cube, slice_cube
+)
+from logic.result_cache import ResultCache
+from logic.chart_data import CHART_TOP_N, top_n
+from logic.jobs import JobQueue
+from logic.schemas import FIELD_SCHEMAS
 
 # --------------------------------------------------
 # APP INIT
 # --------------------------------------------------
-app = Flask(__name__, static_folder="static", template_folder="templates")
+# Components work on projections of the stored frames instead of copies;
+# copy-on-write keeps that safe (always on from pandas 3)
+if pd.__version__.startswith("2."):
+    pd.set_option("mode.copy_on_write", True)
+
+# plotly.js bundle of the pinned plotly release, served from static/.
+# The file name carries the version, so browsers may cache it for a year.
+PLOTLY_JS = "js/plotly-4.1.1.min.js"
+PLOTLY_JS_MAX_AGE = 365 * 24 * 3600
+
+
+class DashboardApp(Flask):
+    def get_send_file_max_age(self, filename):
+        if filename == PLOTLY_JS:
+            return PLOTLY_JS_MAX_AGE
+        return super().get_send_file_max_age(filename)
+
+
+app = DashboardApp(__name__, static_folder="static", template_folder="templates")
 app.secret_key = "kt-secret-key"
 
-cache = Cache(app, config={
-    "CACHE_TYPE": "SimpleCache",
-    "CACHE_DEFAULT_TIMEOUT": 1800
-})
+# Uploaded frames live on disk (CONA_DATA_DIR) and are shared by all workers
+store = DatasetStore()
+
+# Uploads are parsed in the background; job state lives next to the store
+jobs = JobQueue(
+    store.root,
+    max_workers=int(os.environ.get("CONA_INGEST_WORKERS", 2))
+)
+
+# Computed dashboards, keyed by input dataset versions + parameters
+results = ResultCache()
+
+# Rendered dashboard pages (HTML, ETag), keyed by template + result key
+pages = ResultCache(int(os.environ.get("CONA_PAGE_CACHE_SIZE", 64)))
+
+
+@app.context_processor
+def plotly_assets():
+    return {"plotly_js": PLOTLY_JS}
+
+
+# --------------------------------------------------
+# CHARTS
+# --------------------------------------------------
+def chart_html(fig):
+    """
+    `fig` as a JSON spec rendered client side by static/js/charts.js.
+    The layout template is left out: charts.js applies the shared copy
+    in static/js/plotly-template.js.
+    """
+
+    spec = fig.to_plotly_json()
+    spec["layout"].pop("template", None)
+
+    # to_json_plotly escapes <, > and /, so the JSON is safe inside <script>
+    return (
+        '<script type="application/json" class="plotly-figure">'
+        f"{pio.json.to_json_plotly(spec)}</script>"
+    )
 
 # --------------------------------------------------
 # USERS
@@ -51,6 +141,11 @@ KPI_FILES = {
         ("receipt_file", "Posted Purchase Receipts.xlsx"),
         ("lines_file", "Purchase Lines.xlsx")
     ],
+    "component3c": [
+        ("po_file", "Purchase Order.xlsx"),
+        ("receipt_file", "Posted Purchase Receipts.xlsx"),
+        ("lines_file", "Purchase Lines.xlsx")
+    ],
     "component4": [
         ("sales_order_file", "Sales Order.xlsx"),
         ("sales_invoice_file", "Posted Sales Invoice.xlsx")
@@ -74,6 +169,22 @@ KPI_FILES = {
     ],
 }
 
+# Header names each upload field is projected to at ingestion
+INPUT_COLUMNS = input_columns(
+    component1_transfers.INPUT_COLUMNS,
+    component2_inventory.INPUT_COLUMNS,
+    component4_sales_invoice.INPUT_COLUMNS,
+    component6_short_closed_so.INPUT_COLUMNS,
+    component7_cost_optimization.INPUT_COLUMNS,
+    po_facts.INPUT_COLUMNS,  # purchase KPIs 3A, 3B, 3C, 5, 5A
+)
+
+# KPIs rendered by another component's dashboard builder
+DASHBOARD_OF = {
+    "component7a": "component7",
+    "component7b": "component7",
+}
+
 KRA_KPI_MAP = {
 
     # -------- PURCHASE --------
@@ -117,6 +228,409 @@ KRA_KPI_MAP = {
 }
 
 
+def dataset_name(field):
+    return field.replace("_file", "_df")
+
+
+def load_facts():
+    """
+    Purchase-order facts (see logic.po_facts) of the current uploads, or
+    None while the PO, receipts or lines export is missing (load_po_facts
+    checks the versions). Built once per set of uploaded exports.
+    """
+
+    return load_po_facts(
+        store, [store.version(dataset_name(field)) for field in FACT_INPUTS]
+    )
+
+
+def load_events(versions):
+    """
+    Sorted vendor delivery events (see logic.vendor_scorecard) of the
+    facts built from `versions`. Built once per set of uploaded exports.
+    """
+
+    return load_vendor_events(
+        store, facts_key(versions), load_po_facts(store, versions)
+    )
+
+
+def load_sketch():
+    """
+    O2C sketch (see logic.o2c_sketch), or None if a sales export is
+    missing. Built once per pair of uploaded exports.
+    """
+
+    if not all(store.has(dataset_name(field)) for field in SKETCH_INPUTS):
+        return None
+
+    return load_o2c_sketch(
+        store, [store.version(dataset_name(field)) for field in SKETCH_INPUTS]
+    )
+
+
+def derived_keys():
+    """
+    Store keys of the derived tables of the current uploads. Their refs
+    may still point at a newer build (e.g. after a dedup-linked
+    re-upload of older files), so cleanup keeps them explicitly.
+    """
+
+    def versions(fields):
+        return [store.version(dataset_name(field)) for field in fields]
+
+    keys = []
+
+    fact_versions = versions(FACT_INPUTS)
+    if None not in fact_versions[:3]:
+        key = facts_key(fact_versions)
+        keys += [key, events_key(key)]
+
+    sketch_versions = versions(SKETCH_INPUTS)
+    if None not in sketch_versions:
+        keys.append(sketch_key(sketch_versions))
+
+    so_version = store.version(dataset_name("sales_order_file"))
+    if so_version is not None:
+        keys.append(cube_key(so_version))
+
+    return keys
+
+
+# --------------------------------------------------
+# KPI RESULTS (CACHED)
+# --------------------------------------------------
+# Dashboard builders: name → {build, fields, module, source, options}
+DASHBOARDS = {}
+
+PURCHASE_FILES = ["po_file", "receipt_file", "lines_file"]
+
+
+def delivery_source(module):
+    """
+    Source of `module`'s delivery-days histogram over the PO facts, built
+    once per facts version; any SLA threshold is then answered from it.
+    """
+
+    def load(versions):
+        return [results.get_or_compute(
+            results.key(f"{module.__name__}.histogram", versions),
+            lambda: module.delivery_histogram(load_po_facts(store, versions))
+        )]
+
+    return FACT_INPUTS, load
+
+
+# Derived tables a builder can take instead of the stored frames:
+# source → (upload fields it is built from, loader(versions) → inputs)
+SOURCES = {
+    "po_facts": (
+        FACT_INPUTS,
+        lambda versions: [load_po_facts(store, versions)]
+    ),
+    "dormancy_state": (
+        ["ledger_file"],
+        lambda versions: [
+            load_dormancy_state(store, versions[0]),
+            store.get_object(versions[0])
+        ]
+    ),
+    "vendor_events": (FACT_INPUTS, lambda versions: [load_events(versions)]),
+    "o2c_sketch": (
+        SKETCH_INPUTS,
+        lambda versions: [load_o2c_sketch(store, versions)]
+    ),
+    "short_closure_cube": (
+        ["sales_order_file"],
+        lambda versions: [load_short_closure_cube(store, versions[0])]
+    ),
+    "delivery_3a": delivery_source(component3a_vendor_ontime),
+    "delivery_3b": delivery_source(component3b_order_delivery),
+    "delivery_5": delivery_source(component5_po_sla),
+    "delivery_5a": delivery_source(component5a_rm_quarterly),
+}
+
+
+def today_iso():
+    return date.today().isoformat()
+
+
+def sla_option(module):
+    # ?sla= overrides the module's SLA_DAYS
+    return {"sla": lambda: module.SLA_DAYS}
+
+
+def sla_arg():
+    """The request's ?sla= in days, None if absent; ValueError if invalid."""
+
+    sla = request.args.get("sla")
+    if not sla:
+        return None
+
+    if not sla.isdigit() or int(sla) > MAX_SLA_DAYS:
+        raise ValueError(
+            f"Invalid sla: {sla} (whole days, 0 to {MAX_SLA_DAYS})"
+        )
+    return int(sla)
+
+
+def offset_arg():
+    """The request's ?offset= rank, None if absent; ValueError if invalid."""
+
+    offset = request.args.get("offset")
+    if not offset:
+        return None
+
+    if not offset.isdigit():
+        raise ValueError(f"Invalid offset: {offset} (a whole number)")
+    return int(offset)
+
+
+def as_of_arg():
+    """The request's ?as_of= (ISO date), None if absent; ValueError if invalid."""
+
+    as_of = request.args.get("as_of") or None
+    if not as_of:
+        return None
+
+    try:
+        return date.fromisoformat(as_of).isoformat()
+    except ValueError:
+        raise ValueError(f"Invalid as_of date: {as_of}") from None
+
+
+def month_arg(option):
+    """The request's ?<option>= as YYYY-MM, "" if absent; ValueError if invalid."""
+
+    month = request.args.get(option, "").strip()
+    if not month:
+        return month
+
+    try:
+        return datetime.strptime(month, "%Y-%m").strftime("%Y-%m")
+    except ValueError:
+        raise ValueError(f"Invalid {option} month: {month}") from None
+
+
+def groups_arg():
+    """?group=RM&group=PM → "PM,RM" (one cache entry per combination)."""
+
+    groups = request.args.getlist("group")
+    return ",".join(sorted(set(groups))) if groups else None
+
+
+def by_arg():
+    """The request's ?by= (component 6), None if absent; ValueError if invalid."""
+
+    by = request.args.get("by") or None
+    if by is not None and by not in DIMENSIONS:
+        raise ValueError(f"Invalid by: {by} (one of {', '.join(DIMENSIONS)})")
+    return by
+
+
+def sla_curve_chart(histogram, sla):
+    """Overall on-time % against the SLA threshold, marking `sla`."""
+
+    curve = px.line(
+        histogram.curve(), x="SLA_Days", y="On_Time_Pct", markers=True
+    )
+    curve.add_vline(x=sla, line_dash="dash")
+
+    return chart_html(curve)
+
+
+def dashboard(name, fields, module, source=None, options=None):
+    """
+    Register a dashboard builder. It takes the stored frames of `fields`
+    (or the derived table `source`, see SOURCES) plus its request
+    `options` as keywords, and returns the template context.
+    `options` maps option name → default factory (called per request).
+    The module's PARAMS and the option values are part of the cache key.
+    """
+
+    def decorator(build):
+        DASHBOARDS[name] = {
+            "build": build,
+            "fields": fields,
+            "module": module,
+            "source": source,
+            "options": options or {},
+        }
+        return build
+
+    return decorator
+
+
+def dashboard_request(name, **options):
+    """
+    (result cache key, compute) of dashboard `name` with `options`; None
+    if an input has not been uploaded. Reads store metadata only.
+    """
+
+    spec = DASHBOARDS[name]
+    if not all(store.has(dataset_name(field)) for field in spec["fields"]):
+        return None
+
+    inputs = SOURCES[spec["source"]][0] if spec["source"] else spec["fields"]
+    versions = [store.version(dataset_name(field)) for field in inputs]
+
+    params = {
+        param: getattr(spec["module"], param)
+        for param in getattr(spec["module"], "PARAMS", ())
+    }
+    options = {
+        option: default() if options.get(option) is None else options[option]
+        for option, default in spec["options"].items()
+    }
+
+    def compute():
+        # Built from the exact versions in the key, even if a re-upload
+        # lands meanwhile
+        if spec["source"]:
+            frames = SOURCES[spec["source"]][1](versions)
+        else:
+            frames = [store.get_object(version) for version in versions]
+        return spec["build"](*frames, **options)
+
+    return results.key(name, versions, {**params, **options}), compute
+
+
+def dashboard_context(name, **options):
+    """
+    Template context of dashboard `name`, served from the result cache
+    while its input datasets, parameters and options are unchanged. None
+    if an input has not been uploaded.
+    """
+
+    entry = dashboard_request(name, **options)
+    if entry is None:
+        return None
+
+    return results.get_or_compute(*entry)
+
+
+def render_dashboard(name, template, **options):
+    """
+    Dashboard `name` rendered with `template`; None if an input has not
+    been uploaded. The page is cached under the result key, with a
+    strong ETag (hash of the HTML): a matching If-None-Match gets a 304,
+    and repeat views skip the build and Jinja.
+    """
+
+    entry = dashboard_request(name, **options)
+    if entry is None:
+        return None
+    key, compute = entry
+
+    def render():
+        html = render_template(template, **results.get_or_compute(key, compute))
+        return html, hashlib.sha256(html.encode()).hexdigest()
+
+    html, etag = pages.get_or_compute((template, key), render)
+
+    response = make_response(html)
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+def ingest_uploads(job, uploads, component=None):
+    """Background job: parse spooled uploads into the dataset store."""
+
+    uploaded_at = datetime.now().isoformat(timespec="seconds")
+
+    rows = parse_uploads(store.root, [
+        {
+            "field": field,
+            "name": dataset_name(field),
+            "path": path,
+            "columns": INPUT_COLUMNS.get(field),
+            "key": key,
+            "meta": {"filename": filename, "uploaded_at": uploaded_at},
+        }
+        for field, path, filename, key in uploads
+    ], job=job)
+
+    # Vendor ids were assigned while parsing; refresh the dimension (a
+    # re-upload that added no vendor reuses the stored one)
+    if any(field == "po_file" for field, _, _, _ in uploads):
+        load_vendor_dimension(store, KeyDictionary(store.root))
+
+    # Purchase dashboards then only read the prebuilt facts table
+    if any(field in FACT_INPUTS for field, _, _, _ in uploads):
+        # … and component 3C the vendor delivery events; no facts (None)
+        # until PO, receipts and lines are all uploaded
+        if load_facts() is not None:
+            load_events([
+                store.version(dataset_name(field)) for field in FACT_INPUTS
+            ])
+
+    # Component 4 then only reads the O2C sketch
+    if any(field in SKETCH_INPUTS for field, _, _, _ in uploads):
+        load_sketch()
+
+    # … and component 6 the short-closure cube
+    if any(field == "sales_order_file" for field, _, _, _ in uploads):
+        load_short_closure_cube(
+            store, store.version(dataset_name("sales_order_file"))
+        )
+
+    for field, _, _, _ in uploads:
+        job.report(field, rows=rows[field], status="done")
+
+    # Superseded uploads and derived tables, and old job directories
+    store.collect(keep=derived_keys())
+    jobs.prune()
+
+    start_precompute(component)
+
+
+def kra_dashboards():
+    """Dashboard names behind the KPIs of KRA_KPI_MAP, in map order."""
+
+    names = []
+    for kpis in KRA_KPI_MAP.values():
+        for component, _ in kpis:
+            name = DASHBOARD_OF.get(component, component)
+            if name in DASHBOARDS and name not in names:
+                names.append(name)
+    return names
+
+
+def start_precompute(component=None):
+    """
+    Queue a background job computing every KRA dashboard whose inputs are
+    all stored, so the first dashboard open after an upload is a cache hit.
+    The uploading component goes first.
+    """
+
+    names = kra_dashboards()
+    first = DASHBOARD_OF.get(component, component)
+    if first in names:
+        names.remove(first)
+        names.insert(0, first)
+
+    job = jobs.create(files=names, kind="precompute", component=component)
+    jobs.start(job, precompute_results, names)
+    return job
+
+
+def precompute_results(job, names):
+    """Background job: fill the result cache for the given dashboards."""
+
+    for name in names:
+        job.report(name, status="computing")
+        try:
+            context = dashboard_context(name)
+        except Exception:
+            # One broken KPI must not keep the others cold
+            app.logger.exception("Precomputing %s failed", name)
+            job.report(name, status="failed")
+            continue
+
+        job.report(name, status="skipped" if context is None else "done")
+
+
 # --------------------------------------------------
 # KPI UPLOAD ROUTE  ✅ MUST COME AFTER KPI_FILES
 # --------------------------------------------------
@@ -129,22 +643,128 @@ def upload_component(component):
     if not files_needed:
         return f"Invalid component: {component}", 404
 
+    present = {
+        field: store.meta(dataset_name(field))
+        for field, _ in files_needed
+    }
+
     if request.method == "POST":
+        pending = []
+        linked = False
         for field, _ in files_needed:
             file = request.files.get(field)
             if not file:
-                return f"Missing file: {field}", 400
-            cache.set(field.replace("_file", "_df"), pd.read_excel(file))
+                # Inputs shared with other KPIs may already be stored
+                if present[field] is None:
+                    return f"Missing file: {field}", 400
+                continue
+
+            key = dataset_key(file_digest(file), INPUT_COLUMNS.get(field))
+
+            # Identical bytes were parsed before (possibly for another KPI)
+            if store.has_object(key):
+                if store.version(dataset_name(field)) != key:
+                    store.link(dataset_name(field), key)
+                    linked = True
+                continue
+
+            pending.append((field, file, key))
+
+        if not pending:
+            if linked:
+                start_precompute(component)
+            return redirect(url_for(f"{component}_dashboard"))
+
+        # Spool to disk and parse in the background
+        job = jobs.create(
+            files=[field for field, _, _ in pending],
+            component=component
+        )
+
+        uploads = []
+        for field, file, key in pending:
+            path = job.file_path(f"{field}.xlsx")
+            file.save(path)
+            uploads.append((field, path, file.filename, key))
 
-        return redirect(url_for(f"{component}_dashboard"))
+        jobs.start(job, ingest_uploads, uploads, component)
+
+        return redirect(
+            url_for("upload_status", component=component, job_id=job.id)
+        )
 
     return render_template(
         "upload_kpi.html",
         component=component,
-        files=files_needed
+        files=files_needed,
+        present=present
     )
 
 
+# --------------------------------------------------
+# UPLOAD JOBS
+# --------------------------------------------------
+@app.route("/upload/<component>/jobs/<job_id>")
+def upload_status(component, job_id):
+    if "user" not in session:
+        return redirect(url_for("login"))
+
+    if component not in KPI_FILES:
+        return f"Invalid component: {component}", 404
+
+    job = jobs.get(job_id)
+    if job is None:
+        return f"Unknown upload job: {job_id}", 404
+
+    dashboard_url = url_for(f"{component}_dashboard")
+    if job["status"] == "done":
+        return redirect(dashboard_url)
+
+    return render_template(
+        "upload_status.html",
+        component=component,
+        job=job,
+        status_url=url_for("job_status", job_id=job_id),
+        dashboard_url=dashboard_url
+    )
+
+
+@app.route("/jobs/<job_id>")
+def job_status(job_id):
+    if "user" not in session:
+        return jsonify({"error": "login required"}), 401
+
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": f"Unknown job: {job_id}"}), 404
+
+    return jsonify(job)
+
+
+# --------------------------------------------------
+# DATASET MEMORY REPORT
+# --------------------------------------------------
+@app.route("/datasets/memory")
+def dataset_memory():
+    """Per-upload memory as read vs after schema coercion."""
+
+    if "user" not in session:
+        return redirect(url_for("login"))
+
+    report = {}
+    for field in FIELD_SCHEMAS:
+        meta = store.meta(dataset_name(field))
+        if meta and "memory" in meta:
+            report[field] = {
+                "schema": FIELD_SCHEMAS[field],
+                "filename": meta.get("filename"),
+                "rows": meta["rows"],
+                **meta["memory"],
+            }
+
+    return jsonify(report)
+
+
 # --------------------------------------------------
 # LOGIN
 # --------------------------------------------------
@@ -276,33 +896,45 @@ def kpis(department, kra, subdepartment=None):
 # --------------------------------------------------
 # COMPONENT 1 — TRANSFER
 # --------------------------------------------------
+@dashboard("component1", ["transfer_file"], component1_transfers)
+def build_component1(df_transfers):
+    summary, df = run_component1(df_transfers)
+
+    status = (
+        df["Status"].value_counts().rename_axis("Status").reset_index(name="Count")
+    )
+    bar = px.bar(status, x="Status", y="Count", text="Count")
+
+    return {
+        "summary": summary,
+        "bar_chart": chart_html(bar),
+        "series": {"status": status},
+    }
+
+
 @app.route("/dashboard/component1")
 def component1_dashboard():
-    df = cache.get("transfer_df")
-    if df is None:
+    page = render_dashboard("component1", "component1.html")
+    if page is None:
         return redirect(url_for("upload_component", component="component1"))
 
-    summary, df = run_component1(df)
-
-    bar = px.bar(
-        df["Status"].value_counts().reset_index(),
-        x="index", y="Status", text="Status"
-    )
-
-    return render_template("component1.html",
-                           summary=summary,
-                           bar_chart=pio.to_html(bar, full_html=False))
+    return page
 
 # --------------------------------------------------
 # COMPONENT 2 — INVENTORY (NEW LEDGER)
 # --------------------------------------------------
-@app.route("/dashboard/component2")
-def component2_dashboard():
-    df = cache.get("ledger_df")
-    if df is None:
-        return redirect(url_for("upload_component", component="component2"))
-
-    summary, _ = run_component2(df)
+@dashboard(
+    "component2", ["ledger_file"], component2_inventory,
+    source="dormancy_state", options={"as_of": today_iso}
+)
+def build_component2(state, ledger, as_of):
+    # Today reads the incremental state; past dates replay the ledger
+    if as_of == today_iso():
+        summary, _ = run_component2_state(state, as_of)
+    else:
+        summary, _ = run_component2(ledger, as_of)
+
+    trend = run_component2_trend(ledger, as_of)
 
     bar = px.bar(
         pd.DataFrame({
@@ -316,46 +948,92 @@ def component2_dashboard():
         x="Status", y="Count", text="Count"
     )
 
-    return render_template("component2.html",
-                           bar_chart=pio.to_html(bar, full_html=False))
+    trend_line = px.line(
+        trend, x="As_Of", y=["Slow %", "Dead %"], markers=True
+    )
+
+    return {
+        "as_of": as_of,
+        "summary": summary,
+        "bar_chart": chart_html(bar),
+        "trend_chart": chart_html(trend_line),
+        "series": {"trend": trend},
+    }
+
+
+@app.route("/dashboard/component2")
+def component2_dashboard():
+    try:
+        as_of = as_of_arg()
+    except ValueError as error:
+        return str(error), 400
+
+    page = render_dashboard("component2", "component2.html", as_of=as_of)
+    if page is None:
+        return redirect(url_for("upload_component", component="component2"))
+
+    return page
 
 # --------------------------------------------------
 # COMPONENT 3A — VENDOR ON-TIME
 # --------------------------------------------------
+@dashboard(
+    "component3a", PURCHASE_FILES, component3a_vendor_ontime,
+    source="delivery_3a",
+    options={**sla_option(component3a_vendor_ontime), "offset": lambda: 0}
+)
+def build_component3a(histogram, sla, offset):
+    metrics, vendor_df = component3a_vendor_ontime.summarize_sla(histogram, sla)
+
+    # Busiest vendors from rank `offset`, the rest pooled into "Other"
+    chart_df = top_n(
+        vendor_df[["Vendor", "Total_POs", "On_Time_POs"]], by="Total_POs",
+        label="Vendor", sums=["Total_POs", "On_Time_POs"], offset=offset
+    )
+    chart_df["On_Time_Pct"] = round(
+        chart_df["On_Time_POs"] / chart_df["Total_POs"] * 100, 2
+    )
+
+    bar = px.bar(chart_df, x="Vendor", y="On_Time_Pct", text="On_Time_Pct")
+
+    return {
+        "sla": sla,
+        "offset": offset,
+        "top_n": CHART_TOP_N,
+        "vendor_count": len(vendor_df),
+        "metrics": metrics,
+        "bar_chart": chart_html(bar),
+        "sla_chart": sla_curve_chart(histogram, sla),
+        "series": {"vendors": vendor_df, "sla_curve": histogram.curve()},
+    }
+
+
 @app.route("/dashboard/component3a")
 def component3a_dashboard():
-    if not all([cache.get("po_df"), cache.get("receipt_df"), cache.get("lines_df")]):
-        return redirect(url_for("upload_component", component="component3"))
-
-    metrics, vendor_df = run_component3a(
-        cache.get("po_df"),
-        cache.get("receipt_df"),
-        cache.get("lines_df")
+    try:
+        sla = sla_arg()
+        offset = offset_arg()
+    except ValueError as error:
+        return str(error), 400
+
+    page = render_dashboard(
+        "component3a", "component3a_vendor_management.html",
+        sla=sla, offset=offset
     )
+    if page is None:
+        return redirect(url_for("upload_component", component="component3a"))
 
-    bar = px.bar(vendor_df, x="Vendor", y="On_Time_Pct", text="On_Time_Pct")
-
-    return render_template("component3a_vendor_management.html",
-                           metrics=metrics,
-                           bar_chart=pio.to_html(bar, full_html=False))
+    return page
 
 # --------------------------------------------------
 # COMPONENT 3B — ORDER DELIVERY
 # --------------------------------------------------
-@app.route("/dashboard/component3b")
-def component3b_dashboard():
-    metrics, df = run_component3b(
-        cache.get("po_df"),
-        cache.get("receipt_df"),
-        cache.get("lines_df")
-    )
-    return redirect(url_for("upload_component", component="component3b"))
-
-    metrics, df = run_component3b(
-        cache.get("po_df"),
-        cache.get("receipt_df"),
-        cache.get("lines_df")
-    )
+@dashboard(
+    "component3b", PURCHASE_FILES, component3b_order_delivery,
+    source="delivery_3b", options=sla_option(component3b_order_delivery)
+)
+def build_component3b(histogram, sla):
+    metrics = component3b_order_delivery.summarize_sla(histogram, sla)
 
     pie = px.pie(
         pd.DataFrame({
@@ -365,121 +1043,567 @@ def component3b_dashboard():
         names="Status", values="Count"
     )
 
-    return render_template("component3b_order_delivery.html",
-                           metrics=metrics,
-                           pie_chart=pio.to_html(pie, full_html=False))
+    return {
+        "sla": sla,
+        "metrics": metrics,
+        "pie_chart": chart_html(pie),
+        "sla_chart": sla_curve_chart(histogram, sla),
+        "series": {"sla_curve": histogram.curve()},
+    }
+
+
+@app.route("/dashboard/component3b")
+def component3b_dashboard():
+    try:
+        sla = sla_arg()
+    except ValueError as error:
+        return str(error), 400
+
+    page = render_dashboard(
+        "component3b", "component3b_order_delivery.html", sla=sla
+    )
+    if page is None:
+        return redirect(url_for("upload_component", component="component3b"))
+
+    return page
+
+# --------------------------------------------------
+# COMPONENT 3C — VENDOR PERFORMANCE
+# --------------------------------------------------
+@dashboard(
+    "component3c", PURCHASE_FILES, component3c_vendor_performance,
+    source="vendor_events", options={"as_of": lambda: "", "offset": lambda: 0}
+)
+def build_component3c(events, as_of, offset):
+    # Rolling windows end at `as_of`, by default the latest receipt
+    metrics, scorecard, bucket_summary = run_component3c_scorecard(
+        events, as_of or None
+    )
+
+    bar = px.bar(bucket_summary, x="Bucket", y="Vendor_Count", text="Vendor_Count")
+    pie = px.pie(bucket_summary, names="Bucket", values="Vendor_Count")
+
+    return {
+        "as_of": as_of,
+        "offset": offset,
+        "top_n": CHART_TOP_N,
+        "vendor_count": len(scorecard),
+        "metrics": metrics,
+        "windows": component3c_vendor_performance.WINDOWS,
+        "percentiles": component3c_vendor_performance.LEAD_PERCENTILES,
+        # One page of the table; the API series keeps every vendor
+        "scorecard": scorecard.iloc[offset:offset + CHART_TOP_N].to_dict("records"),
+        "bar_chart": chart_html(bar),
+        "pie_chart": chart_html(pie),
+        "series": {"scorecard": scorecard, "buckets": bucket_summary},
+    }
+
+
+@app.route("/dashboard/component3c")
+def component3c_dashboard():
+    try:
+        as_of = as_of_arg()
+        offset = offset_arg()
+    except ValueError as error:
+        return str(error), 400
+
+    page = render_dashboard(
+        "component3c", "component3c_vendor_performance.html",
+        as_of=as_of, offset=offset
+    )
+    if page is None:
+        return redirect(url_for("upload_component", component="component3c"))
+
+    return page
 
 # --------------------------------------------------
 # COMPONENT 4 — SALES O2C
 # --------------------------------------------------
+@dashboard(
+    "component4", SKETCH_INPUTS, component4_sales_invoice,
+    source="o2c_sketch",
+    options={"start": lambda: "", "end": lambda: "", "customer": lambda: ""}
+)
+def build_component4(sketch, start, end, customer):
+    metrics = o2c_metrics(sketch, start, end, customer)
+    monthly = o2c_monthly(sketch, start, end, customer)
+
+    line = px.line(
+        monthly, x="Month", y=["median_cycle", "p95_cycle"], markers=True
+    ) if len(monthly) else px.line()
+
+    return {
+        "start": start,
+        "end": end,
+        "customer": customer,
+        "metrics": metrics,
+        "o2c_chart": chart_html(line),
+        "series": {"monthly": monthly},
+    }
+
+
 @app.route("/dashboard/component4")
 def component4_dashboard():
-   if not all([cache.get("sales_order_df"), cache.get("sales_invoice_df")]):
-        return redirect(url_for("upload_component", component="component4"))
+    # Month range (YYYY-MM, inclusive) and customer filters
+    try:
+        options = {
+            "start": month_arg("start"),
+            "end": month_arg("end"),
+            "customer": request.args.get("customer", "").strip(),
+        }
+    except ValueError as error:
+        return str(error), 400
 
-        metrics, _ = run_component4(
-            cache.get("sales_order_df"),
-            cache.get("sales_invoice_df")
-    )
+    page = render_dashboard("component4", "component4.html", **options)
+    if page is None:
+        return redirect(url_for("upload_component", component="component4"))
 
-        return render_template("component4.html", metrics=metrics)
+    return page
 
 # --------------------------------------------------
 # COMPONENT 5 — PO SLA
 # --------------------------------------------------
-@app.route("/dashboard/component5")
-def component5_dashboard():
-    metrics, df = run_component5(
-        cache.get("po_df"),
-        cache.get("receipt_df"),
-        cache.get("lines_df")
+@dashboard(
+    "component5", PURCHASE_FILES, component5_po_sla,
+    source="delivery_5", options=sla_option(component5_po_sla)
+)
+def build_component5(histogram, sla):
+    metrics = component5_po_sla.summarize_sla(histogram, sla)
+    monthly = histogram.counts(sla, by=("Month",))
+
+    bar = px.bar(
+        monthly.rename(columns={"Total": "Completed POs"}),
+        x="Month", y="Completed POs"
     )
 
-    return redirect(url_for("upload_component", component="component5"))
+    return {
+        "sla": sla,
+        "metrics": metrics,
+        "bar_chart": chart_html(bar),
+        "sla_chart": sla_curve_chart(histogram, sla),
+        "series": {"monthly": monthly, "sla_curve": histogram.curve()},
+    }
 
-    metrics, df = run_component5(
-        cache.get("po_df"),
-        cache.get("receipt_df"),
-        cache.get("lines_df")
-    )
 
+@app.route("/dashboard/component5")
+def component5_dashboard():
+    try:
+        sla = sla_arg()
+    except ValueError as error:
+        return str(error), 400
 
-    bar = px.bar(
-        df.groupby("Month").size().reset_index(name="Completed POs"),
-        x="Month", y="Completed POs"
-    )
+    page = render_dashboard("component5", "component5.html", sla=sla)
+    if page is None:
+        return redirect(url_for("upload_component", component="component5"))
 
-    return render_template("component5.html",
-                           metrics=metrics,
-                           bar_chart=pio.to_html(bar, full_html=False))
+    return page
 
 # --------------------------------------------------
 # COMPONENT 5A — RM SLA
 # --------------------------------------------------
+@dashboard(
+    "component5a", ["items_file"] + PURCHASE_FILES, component5a_rm_quarterly,
+    source="delivery_5a",
+    options={
+        **sla_option(component5a_rm_quarterly),
+        "groups": lambda: ",".join(component5a_rm_quarterly.POSTING_GROUPS),
+    }
+)
+def build_component5a(histogram, sla, groups):
+    # Any posting-group combination reads the same histogram
+    selected = groups.split(",") if groups else []
+    metrics, df_monthly = component5a_rm_quarterly.summarize_sla(
+        histogram, sla, selected
+    )
+
+    bar = px.bar(df_monthly, x="Month", y="PO_Count", color="SLA_Status")
+    selection = histogram.select(in_groups(histogram.cells, selected))
+
+    return {
+        "sla": sla,
+        "groups": selected,
+        "all_groups": posting_groups(histogram.cells),
+        "metrics": metrics,
+        "bar_chart": chart_html(bar),
+        "sla_chart": sla_curve_chart(selection, sla),
+        "series": {"monthly": df_monthly, "sla_curve": selection.curve()},
+    }
+
+
 @app.route("/dashboard/component5a")
 def component5a_dashboard():
-    metrics, df_monthly = run_component5a_rm(
-        cache.get("items_df"),
-        cache.get("po_df"),
-        cache.get("receipt_df"),
-        cache.get("lines_df")
-    )
-    return redirect(url_for("upload_component", component="component5a"))
+    try:
+        sla = sla_arg()
+    except ValueError as error:
+        return str(error), 400
 
-    metrics, df_monthly = run_component5a_rm(
-        cache.get("items_df"),
-        cache.get("po_df"),
-        cache.get("receipt_df"),
-        cache.get("lines_df")
-    )
+    groups = groups_arg()
 
-    bar = px.bar(df_monthly, x="Month", y="PO_Count", color="SLA_Status")
+    page = render_dashboard(
+        "component5a", "component5a_rm.html", sla=sla, groups=groups
+    )
+    if page is None:
+        return redirect(url_for("upload_component", component="component5a"))
 
-    return render_template("component5a_rm.html",
-                           metrics=metrics,
-                           bar_chart=pio.to_html(bar, full_html=False))
+    return page
 
 # --------------------------------------------------
 # COMPONENT 6 — SHORT CLOSURE
 # --------------------------------------------------
-@app.route("/dashboard/component6")
-def component6_dashboard():
-    if not cache.get("sales_order_df"):
-        return redirect(url_for("upload_component", component="component6"))
-    metrics, df_monthly = run_component6(cache.get("sales_order_df"))
+@dashboard(
+    "component6", ["sales_order_file"], component6_short_closed_so,
+    source="short_closure_cube",
+    options={
+        "by": lambda: "Month",
+        **{dimension.lower(): lambda: "" for dimension in DIMENSIONS},
+    }
+)
+def build_component6(cube, by, **members):
+    # Slice on the selected members, drill down by `by`
+    metrics, df_by = slice_cube(
+        cube, by=(by,),
+        **{dimension: members[dimension.lower()] for dimension in DIMENSIONS}
+    )
 
-    bar = px.bar(df_monthly,
-                 x="Month",
+    bar = px.bar(df_by,
+                 x=by,
                  y=["Short_Closed", "Not_Short_Closed"],
                  barmode="stack")
 
-    return render_template("component6.html",
-                           metrics=metrics,
-                           bar_chart=pio.to_html(bar, full_html=False))
+    return {
+        "by": by,
+        "dimensions": DIMENSIONS,
+        "members": members,
+        "metrics": metrics,
+        "bar_chart": chart_html(bar),
+        "series": {"drilldown": df_by},
+    }
+
+
+@app.route("/dashboard/component6")
+def component6_dashboard():
+    try:
+        by = by_arg()
+    except ValueError as error:
+        return str(error), 400
+
+    page = render_dashboard("component6", "component6.html", by=by, **{
+        dimension.lower(): request.args.get(dimension.lower(), "").strip()
+        for dimension in DIMENSIONS
+    })
+    if page is None:
+        return redirect(url_for("upload_component", component="component6"))
+
+    return page
 
 # --------------------------------------------------
 # COMPONENT 7 — COST OPTIMIZATION
 # --------------------------------------------------
+# 7A and 7B render the same result with different templates
+@dashboard("component7", ["items_file", "ledger_file"], component7_cost_optimization)
+def build_component7(df_items, df_ledger):
+    _, _, company_view = run_component7(df_items, df_ledger)
+
+    stock = (
+        company_view.groupby("Stock_Status", observed=True)["Total_Qty"]
+        .sum()
+        .reset_index()
+    )
+    bar = px.bar(stock, x="Stock_Status", y="Total_Qty")
+
+    summary = company_view["Stock_Status"].value_counts()
+
+    return {
+        "summary": {status: int(count) for status, count in summary.items()},
+        "bar_chart": chart_html(bar),
+        "series": {"stock": stock},
+    }
+
+
+def component7_page(component, template):
+    page = render_dashboard("component7", template)
+    if page is None:
+        return redirect(url_for("upload_component", component=component))
+
+    return page
+
+
 @app.route("/dashboard/component7a")
+def component7a_dashboard():
+    return component7_page("component7a", "component7a_supply_availability.html")
+
+
 @app.route("/dashboard/component7b")
-def component7_dashboard():
-    if not all([cache.get("items_df"), cache.get("ledger_df")]):
-        return redirect(url_for("upload_component", component="component7a"))
+def component7b_dashboard():
+    return component7_page("component7b", "component7b_packaging_stoppage.html")
+
+# --------------------------------------------------
+# VENDORS (CROSS-KPI)
+# --------------------------------------------------
+# Per-vendor delivery KPIs on the vendor page: dashboard → vendor role
+# (3A/3B measure the Pay-to vendor, 5/5A the Buy-from vendor)
+VENDOR_KPIS = {
+    "component3a": "Pay-to",
+    "component3b": "Pay-to",
+    "component5": "Buy-from",
+    "component5a": "Buy-from",
+}
 
+# Vendors listed per page of /vendors
+VENDOR_LIST_LIMIT = 200
 
-    bar = px.bar(
-        company_view.groupby("Stock_Status")["Total_Qty"].sum().reset_index(),
-        x="Stock_Status", y="Total_Qty"
+
+def dashboard_inputs(name):
+    """Derived inputs of dashboard `name` (its source), None if missing."""
+
+    spec = DASHBOARDS[name]
+    if not all(store.has(dataset_name(field)) for field in spec["fields"]):
+        return None
+
+    fields, load = SOURCES[spec["source"]]
+    return load([store.version(dataset_name(field)) for field in fields])
+
+
+def vendor_kpis(vendor_key):
+    """
+    The vendor's row of every purchase KPI, read from the cached
+    histograms and delivery events by vendor id (binary searches).
+    """
+
+    kpis = []
+    for name, role in VENDOR_KPIS.items():
+        inputs = dashboard_inputs(name)
+        if inputs is None:
+            continue
+
+        module = DASHBOARDS[name]["module"]
+        histogram = inputs[0].vendor(vendor_key)
+        groups = getattr(module, "POSTING_GROUPS", None)
+        if groups:
+            histogram = histogram.select(in_groups(histogram.cells, groups))
+
+        counts = histogram.counts(module.SLA_DAYS, by=()).iloc[0]
+        kpis.append({
+            "KPI": name,
+            "Role": role,
+            "SLA_Days": module.SLA_DAYS,
+            "Total": int(counts["Total"]),
+            "On_Time": int(counts["On_Time"]),
+            "Late": int(counts["Late"]),
+            "On_Time_Pct": round(
+                counts["On_Time"] / counts["Total"] * 100, 2
+            ) if counts["Total"] else 0,
+        })
+
+    return kpis
+
+
+@app.route("/vendors")
+def vendor_list():
+    if "user" not in session:
+        return redirect(url_for("login"))
+
+    if not store.has(DIMENSION_NAME):
+        return redirect(url_for("upload_component", component="component3a"))
+
+    vendors = store.get(DIMENSION_NAME)
+
+    # ?q= matches any alias, spelled any way
+    query = request.args.get("q", "").strip()
+    if query and match_key([query]).notna().all():
+        found = match_key(vendors["Alias"]).str.contains(
+            match_key([query])[0], regex=False
+        )
+        vendors = vendors[found.to_numpy()]
+
+    vendors = (
+        vendors.groupby(["Vendor_Key", "Vendor"], sort=True)
+        .size()
+        .reset_index(name="Aliases")
+    )
+
+    return render_template(
+        "vendors.html",
+        query=query,
+        total=len(vendors),
+        vendors=vendors.head(VENDOR_LIST_LIMIT).to_dict("records")
     )
 
-    template = (
-        "component7a_supply_availability.html"
-        if request.path.endswith("7a")
-        else "component7b_packaging_stoppage.html"
+
+@app.route("/vendors/<int:vendor_key>")
+def vendor_page(vendor_key):
+    if "user" not in session:
+        return redirect(url_for("login"))
+
+    vendors = store.get(DIMENSION_NAME) if store.has(DIMENSION_NAME) else None
+    if vendors is None:
+        return f"Unknown vendor: {vendor_key}", 404
+
+    # Dimension rows are sorted by id
+    keys = vendors["Vendor_Key"].to_numpy()
+    start, end = np.searchsorted(keys, [vendor_key, vendor_key + 1])
+    if start == end:
+        return f"Unknown vendor: {vendor_key}", 404
+    aliases = vendors.iloc[start:end]
+
+    scorecard = None
+    events = dashboard_inputs("component3c")
+    if events is not None:
+        rows = component3c_vendor_performance.score_vendors(
+            events[0], vendor_keys=[vendor_key]
+        )
+        scorecard = rows.to_dict("records")[0] if len(rows) else None
+
+    return render_template(
+        "vendor.html",
+        vendor_key=vendor_key,
+        vendor=aliases["Vendor"].iloc[0],
+        aliases=list(aliases["Alias"]),
+        kpis=vendor_kpis(vendor_key),
+        windows=component3c_vendor_performance.WINDOWS,
+        scorecard=scorecard
     )
 
-    return render_template(template,
-                           bar_chart=pio.to_html(bar, full_html=False))
+# --------------------------------------------------
+# KPI API (JSON)
+# --------------------------------------------------
+# Metrics and aggregated series of the cached dashboard contexts (the
+# builders' "metrics" / "summary" dict and "series" tables), serialized
+# by orjson: numeric and datetime columns go out as NumPy arrays.
+API_METRICS = ("metrics", "summary")
+
+# Series columns the ?from= / ?to= range applies to (ISO date / month text)
+API_DATE_COLUMNS = ("Month", "As_Of")
+
+API_OPTION_ARGS = {
+    "sla": sla_arg,
+    "offset": offset_arg,
+    "as_of": as_of_arg,
+    "start": lambda: month_arg("start"),
+    "end": lambda: month_arg("end"),
+    "groups": groups_arg,
+    "by": by_arg,
+}
+
+JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def api_options(name):
+    """Options of dashboard `name` from the query string (ValueError if invalid)."""
+
+    return {
+        option: API_OPTION_ARGS.get(
+            option, lambda: request.args.get(option, "").strip() or None
+        )()
+        for option in DASHBOARDS[name]["options"]
+    }
+
+
+def range_arg(option):
+    """?from= / ?to=: ISO date or YYYY-MM, "" if absent; ValueError if invalid."""
+
+    value = request.args.get(option, "").strip()
+    if len(value) <= len("YYYY-MM"):
+        return month_arg(option)
+
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise ValueError(f"Invalid {option} date: {value}") from None
+
+
+def in_date_range(values, start, end):
+    """
+    Rows of `values` (ISO date / month text) within start … end, both
+    inclusive and either optional. Compared at the coarser precision of
+    the two: month 2024-03 is in from=2024-03-15, and 2024-05-31 is in
+    to=2024-05.
+    """
+
+    text = values.astype(str)
+    width = int(text.str.len().max()) if len(text) else 10
+
+    keep = np.ones(len(text), dtype=bool)
+    for bound, inside in ((start, np.greater_equal), (end, np.less_equal)):
+        if bound:
+            n = min(width, len(bound))
+            keep &= inside(text.str[:n].to_numpy(dtype=object), bound[:n])
+    return keep
+
+
+def json_columns(df):
+    """Column → values of `df`, NumPy arrays where orjson writes them natively."""
+
+    columns = {}
+    for column in df.columns:
+        values = df[column]
+        if isinstance(values.dtype, np.dtype) and values.dtype.kind in "biufM":
+            columns[column] = values.to_numpy()
+        else:
+            columns[column] = values.astype(object).where(values.notna()).tolist()
+    return columns
+
+
+def json_default(value):
+    # Timestamps, Periods, etc. as text
+    return str(value)
+
+
+@app.route("/api/kpi/<component>")
+def kpi_api(component):
+    """
+    JSON metrics and series of dashboard `component`, from the result
+    cache. ?fields=a,b keeps only those metrics and series; ?from= and
+    ?to= (ISO date or month) filter series rows on Month / As_Of; other
+    arguments are the dashboard's options (sla, as_of, group, ...).
+    """
+
+    if "user" not in session:
+        return jsonify({"error": "login required"}), 401
+
+    if component not in DASHBOARDS:
+        return f"Unknown component: {component}", 404
+
+    try:
+        options = api_options(component)
+        start, end = range_arg("from"), range_arg("to")
+    except ValueError as error:
+        return str(error), 400
+
+    context = dashboard_context(component, **options)
+    if context is None:
+        return f"Inputs of {component} not uploaded", 404
+
+    fields = [
+        field for field in request.args.get("fields", "").split(",") if field
+    ]
+
+    metrics = next(
+        (context[key] for key in API_METRICS if key in context), {}
+    )
+    series = {}
+    for name, df in context.get("series", {}).items():
+        if fields and name not in fields:
+            continue
+        for column in API_DATE_COLUMNS:
+            if column in df.columns and (start or end):
+                df = df[in_date_range(df[column], start, end)]
+        series[name] = json_columns(df)
+
+    payload = {
+        "component": component,
+        "options": options,
+        "metrics": {
+            key: value for key, value in metrics.items()
+            if not fields or key in fields
+        },
+        "series": series,
+    }
+
+    return app.response_class(
+        orjson.dumps(payload, default=json_default, option=JSON_OPTIONS),
+        mimetype="application/json"
+    )
 
 # --------------------------------------------------
 # LOGOUT
@@ -0,0 +1,100 @@
+"""
+Component 3A vendor chart: top-N + "Other" (logic.chart_data.top_n,
+argpartition) vs a full stable sort of the vendor table, and the figure
+JSON of the reduced chart vs one bar per vendor. Both selections must
+give the same rows at every page offset.
+
+    python -m benchmarks.bench_chart_top_n --pos 1000000
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from app import chart_html
+from benchmarks.synthetic import purchase_set
+from logic import component3a_vendor_ontime
+from logic.chart_data import CHART_TOP_N, top_n
+from logic.ingest import prepare
+from logic.keys import KeyDictionary
+from logic.po_facts import build_po_facts
+
+COLUMNS = ["Vendor", "Total_POs", "On_Time_POs"]
+REPEAT = 20
+
+
+def sorted_top_n(df, offset):
+    # The same rows from a full sort
+    ranked = df.sort_values("Total_POs", ascending=False, kind="stable")
+    top = ranked.iloc[offset:offset + CHART_TOP_N]
+    rest = pd.concat([ranked.iloc[:offset], ranked.iloc[offset + CHART_TOP_N:]])
+
+    return top, rest[["Total_POs", "On_Time_POs"]].sum()
+
+
+def bar(df):
+    df = df.assign(On_Time_Pct=round(df["On_Time_POs"] / df["Total_POs"] * 100, 2))
+    return px.bar(df, x="Vendor", y="On_Time_Pct", text="On_Time_Pct")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pos", type=int, default=1000000)
+    args = parser.parse_args()
+
+    frames = purchase_set(args.pos)
+    with tempfile.TemporaryDirectory() as tmp:
+        keys = KeyDictionary(tmp)
+        facts = build_po_facts(*(
+            prepare(field, frames[field], keys=keys)
+            for field in ("po_file", "receipt_file", "lines_file", "items_file")
+        ))
+
+    histogram = component3a_vendor_ontime.delivery_histogram(facts)
+    _, vendor_df = component3a_vendor_ontime.summarize_sla(histogram)
+    vendor_df = vendor_df[COLUMNS]
+
+    offsets = [0, CHART_TOP_N, len(vendor_df) // 2, len(vendor_df) - 1]
+
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        reduced = [
+            top_n(vendor_df, "Total_POs", "Vendor",
+                  ["Total_POs", "On_Time_POs"], offset=offset)
+            for offset in offsets
+        ]
+    top_s = (time.perf_counter() - start) / REPEAT
+
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        expected = [sorted_top_n(vendor_df, offset) for offset in offsets]
+    sort_s = (time.perf_counter() - start) / REPEAT
+
+    for chart, (top, rest) in zip(reduced, expected):
+        assert list(chart["Vendor"][:len(top)]) == list(top["Vendor"])
+        assert np.array_equal(chart["Total_POs"][:len(top)], top["Total_POs"])
+        assert chart["Total_POs"].iloc[-1] == rest["Total_POs"]
+        assert chart["On_Time_POs"].iloc[-1] == rest["On_Time_POs"]
+
+    start = time.perf_counter()
+    full_json = chart_html(bar(vendor_df))
+    full_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    top_json = chart_html(bar(reduced[0]))
+    chart_s = time.perf_counter() - start
+
+    n = len(offsets)
+    print(f"vendors             {len(vendor_df):>12,}  (top {CHART_TOP_N} + Other)")
+    print(f"{n} pages top_n       {top_s * 1000:>10.1f}ms")
+    print(f"{n} pages full sort   {sort_s * 1000:>10.1f}ms  ({sort_s / top_s:.1f}x)")
+    print(f"chart, all vendors  {len(full_json) / 1024:>10.0f}KB  ({full_s * 1000:.0f}ms)")
+    print(f"chart, top-N        {len(top_json) / 1024:>10.1f}KB  ({chart_s * 1000:.0f}ms)")
+
+
+if __name__ == "__main__":
+    main()
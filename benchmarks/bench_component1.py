@@ -0,0 +1,96 @@
+"""
+run_component1 on synthetic Transfer Lines, vectorized engine vs the
+previous per-document Python loop (checked for identical output; the
+loop is only timed up to --legacy-max rows, it takes minutes beyond).
+
+    python -m benchmarks.bench_component1 --rows 100000 1000000 5000000
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic import transfer_lines
+from logic.component1_transfers import run_component1
+from logic.ingest import prepare
+
+
+def legacy_component1(df):
+    """The per-document loop run_component1 used before vectorization."""
+
+    df = df.dropna(subset=["Document No.", "Created At"])
+
+    for col in ["Quantity", "Quantity Shipped", "Quantity Received"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
+
+    df["Transfer-from Code"] = df["Transfer-from Code"].astype(str)
+    df["Transfer-to Code"] = df["Transfer-to Code"].astype(str)
+
+    df["Created At"] = pd.to_datetime(df["Created At"], errors="coerce")
+    df = df.dropna(subset=["Created At"])
+
+    df = df[
+        df["Transfer-from Code"].str.startswith("LF-") &
+        df["Transfer-to Code"].str.startswith("LF-")
+    ]
+
+    records = []
+    for doc_no, g in df.groupby("Document No."):
+        total_qty = g["Quantity"].sum()
+        shipped_qty = g["Quantity Shipped"].sum()
+        received_qty = g["Quantity Received"].sum()
+
+        if received_qty >= shipped_qty:
+            status = "Completed"
+        elif shipped_qty >= total_qty:
+            status = "In Transit"
+        else:
+            status = "Partially Shipped"
+
+        records.append({
+            "Document No": doc_no,
+            "Total Qty": total_qty,
+            "Shipped Qty": shipped_qty,
+            "Received Qty": received_qty,
+            "In Transit Qty": shipped_qty - received_qty,
+            "Status": status,
+            "Month": g["Created At"].min().strftime("%Y-%m")
+        })
+
+    return pd.DataFrame(records)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[100000, 1000000, 5000000]
+    )
+    parser.add_argument("--legacy-max", type=int, default=200000)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10}{'documents':>11}{'vectorized':>12}{'loop':>10}")
+    for rows in args.rows:
+        df = prepare("transfer_file", transfer_lines(rows))
+
+        seconds, (summary, orders) = timed(run_component1, df)
+
+        loop = "-"
+        if rows <= args.legacy_max:
+            loop_seconds, expected = timed(legacy_component1, df)
+            pd.testing.assert_frame_equal(
+                orders, expected, check_dtype=False, check_exact=True
+            )
+            loop = f"{loop_seconds:.2f}s"
+
+        print(f"{rows:>10,}{summary['Total']:>11,}{seconds:>11.2f}s{loop:>10}")
+
+
+if __name__ == "__main__":
+    main()
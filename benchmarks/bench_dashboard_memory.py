@@ -0,0 +1,87 @@
+"""
+Peak memory allocated by each run_component* on one dashboard request,
+with inputs loaded from the dataset store exactly as app.py does
+(purchase KPIs read the prebuilt PO facts table).
+
+    python -m benchmarks.bench_dashboard_memory --rows 200000
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+
+from app import INPUT_COLUMNS, dataset_name
+from benchmarks.synthetic import item_ledger, purchase_set, sales_set, transfer_lines
+from logic.component1_transfers import run_component1
+from logic.component2_inventory import run_component2
+from logic.component3a_vendor_ontime import run_component3a
+from logic.component3b_order_delivery import run_component3b
+from logic.component4_sales_invoice import run_component4
+from logic.component5_po_sla import run_component5
+from logic.component5a_rm_quarterly import run_component5a_rm
+from logic.component6_short_closed_so import run_component6
+from logic.dataset_store import DatasetStore
+from logic.ingest import prepare
+from logic.keys import KeyDictionary
+from logic.po_facts import FACT_INPUTS, load_po_facts
+
+RUNS = [
+    ("component1", run_component1, ["transfer_file"]),
+    ("component2", run_component2, ["ledger_file"]),
+    ("component3a", run_component3a, ["po_facts"]),
+    ("component3b", run_component3b, ["po_facts"]),
+    ("component4", run_component4, ["sales_order_file", "sales_invoice_file"]),
+    ("component5", run_component5, ["po_facts"]),
+    ("component5a", run_component5a_rm, ["po_facts"]),
+    ("component6", run_component6, ["sales_order_file"]),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    frames = {
+        "transfer_file": transfer_lines(args.rows),
+        "ledger_file": item_ledger(args.rows, extra_cols=0),
+        **purchase_set(args.rows // 4),
+        **sales_set(args.rows // 2),
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DatasetStore(tmp)
+        keys = KeyDictionary(tmp)
+        for field, df in frames.items():
+            # Same projection and pipeline as an upload
+            df = df[[c for c in df.columns if c in INPUT_COLUMNS[field]]]
+            store.put(dataset_name(field), prepare(field, df, keys=keys))
+
+        start = time.perf_counter()
+        versions = [store.version(dataset_name(field)) for field in FACT_INPUTS]
+        load_po_facts(store, versions)
+        print(f"po facts built in {time.perf_counter() - start:.2f}s (once per upload set)")
+
+        print(f"{'component':<14}{'seconds':>9}{'peak MB':>10}")
+        for name, fn, fields in RUNS:
+            inputs = [
+                load_po_facts(store, versions) if field == "po_facts"
+                else store.get(dataset_name(field))
+                for field in fields
+            ]
+
+            start = time.perf_counter()
+            fn(*inputs)
+            elapsed = time.perf_counter() - start
+
+            tracemalloc.start()
+            fn(*inputs)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(f"{name:<14}{elapsed:>9.2f}{peak / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
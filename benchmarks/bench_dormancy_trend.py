@@ -0,0 +1,52 @@
+"""
+12-month dormancy aging trend: one searchsorted pass over the ledger
+(run_component2_trend) vs rerunning run_component2 at every as-of date.
+Both must give the same summaries.
+
+    python -m benchmarks.bench_dormancy_trend --rows 1000000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import item_ledger
+from logic.component2_inventory import run_component2, run_component2_trend
+from logic.ingest import prepare
+
+COUNTS = ["Total Items", "Active Items", "Slow-Moving Items", "Dead Items"]
+VALUES = ["Total Value", "Slow-Moving Value", "Dead Value", "Slow %", "Dead %"]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--as-of", default="2025-03-15")
+    args = parser.parse_args()
+
+    ledger = prepare("ledger_file", item_ledger(args.rows, extra_cols=0))
+
+    start = time.perf_counter()
+    trend = run_component2_trend(ledger, args.as_of)
+    trend_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _, point in trend.iterrows():
+        summary, _ = run_component2(ledger, point["As_Of"])
+
+        for name in COUNTS:
+            assert summary[name] == point[name], (point["As_Of"], name)
+        for name in VALUES:
+            assert np.isclose(summary[name], point[name]), (point["As_Of"], name)
+    rerun_s = time.perf_counter() - start
+
+    print(trend[["As_Of"] + COUNTS[1:] + ["Slow %", "Dead %"]].to_string(index=False))
+    print()
+    print(f"ledger rows         {len(ledger):>12,}")
+    print(f"one-pass trend      {trend_s:>11.2f}s")
+    print(f"{len(trend)} reruns          {rerun_s:>11.2f}s  ({rerun_s / trend_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Parse time and peak memory of the upload path:
+full pd.read_excel vs the column-projected readers in logic.ingest.
+
+    python -m benchmarks.bench_ingest --rows 100000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+import pandas as pd
+
+from benchmarks.synthetic import item_ledger, to_xlsx
+from logic.component2_inventory import INPUT_COLUMNS
+from logic.ingest import READERS, read_sheet
+
+
+def measure(fn):
+    # Timed and traced separately: tracemalloc slows openpyxl down ~10x
+    start = time.perf_counter()
+    df = fn()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak, df.shape
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=50000)
+    args = parser.parse_args()
+
+    columns = frozenset(INPUT_COLUMNS["ledger_file"])
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = to_xlsx(item_ledger(args.rows), os.path.join(tmp, "ledger.xlsx"))
+        print(f"ledger: {args.rows} rows, {os.path.getsize(path) / 1e6:.1f} MB")
+
+        runs = [("pd.read_excel (full)", lambda: pd.read_excel(path))]
+        for name in READERS:
+            runs.append((
+                f"{name} (projected)",
+                lambda name=name: read_sheet(path, columns=columns, reader=name)
+            ))
+
+        print(f"{'reader':<28}{'seconds':>10}{'peak MB':>10}  shape")
+        for label, fn in runs:
+            elapsed, peak, shape = measure(fn)
+            print(f"{label:<28}{elapsed:>10.2f}{peak / 1e6:>10.1f}  {shape}")
+
+
+if __name__ == "__main__":
+    main()
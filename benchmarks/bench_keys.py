@@ -0,0 +1,102 @@
+"""
+String-key joins vs integer-code joins (logic.keys) on the purchase
+exports: outstanding quantity per PO and the receipt date of each PO.
+
+    python -m benchmarks.bench_keys --lines 1000000
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import purchase_set
+from logic.ingest import prepare
+from logic.keys import (
+    KeyDictionary, dense_lookup, dense_sum, dense_table, domain_size
+)
+
+
+def string_joins(po, rcpt, lines):
+    outstanding = lines.groupby("Document No.")["Outstanding Quantity"].sum()
+
+    df = po.merge(
+        rcpt[["No.", "Posting Date"]].rename(columns={"No.": "Receipt_No"}),
+        left_on="Last Receiving No.",
+        right_on="Receipt_No",
+        how="left"
+    )
+    df["Outstanding_Qty"] = df["No."].map(outstanding).fillna(0)
+    return df
+
+
+def code_joins(po, rcpt, lines):
+    po_codes = po["PO_Key"].to_numpy()
+    po_receipts = po["Receipt_Key"].to_numpy()
+    line_codes = lines["PO_Key"].to_numpy()
+    rcpt_codes = rcpt["Receipt_Key"].to_numpy()
+
+    outstanding = dense_sum(
+        line_codes,
+        lines["Outstanding Quantity"].to_numpy(),
+        domain_size(po_codes, line_codes)
+    )
+    receipt_dates = dense_table(
+        rcpt_codes,
+        rcpt["Posting Date"].to_numpy(),
+        domain_size(rcpt_codes, po_receipts),
+        np.datetime64("NaT")
+    )
+
+    return po.assign(**{
+        "Posting Date": dense_lookup(receipt_dates, po_receipts, np.datetime64("NaT")),
+        "Outstanding_Qty": dense_lookup(outstanding, po_codes, 0),
+    })
+
+
+def best_of(fn, *args, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=1000000)
+    args = parser.parse_args()
+
+    frames = purchase_set(args.lines // 4, lines_per_po=4)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        keys = KeyDictionary(tmp)
+
+        start = time.perf_counter()
+        po, rcpt, lines = (
+            prepare(field, frames[field], keys=keys)
+            for field in ("po_file", "receipt_file", "lines_file")
+        )
+        encode = time.perf_counter() - start
+
+    string_s, expected = best_of(string_joins, po, rcpt, lines)
+    code_s, actual = best_of(code_joins, po, rcpt, lines)
+
+    assert np.array_equal(
+        expected["Outstanding_Qty"].to_numpy(), actual["Outstanding_Qty"].to_numpy()
+    )
+    assert expected["Posting Date"].equals(
+        pd.Series(actual["Posting Date"].to_numpy(), name="Posting Date")
+    )
+
+    print(f"purchase lines      {len(lines):>12,}")
+    print(f"ingest (+encoding)  {encode:>11.2f}s  (once per upload)")
+    print(f"string joins        {string_s:>11.3f}s")
+    print(f"integer-code joins  {code_s:>11.3f}s  ({string_s / code_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
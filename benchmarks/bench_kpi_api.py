@@ -0,0 +1,79 @@
+"""
+/api/kpi serialization of the 3C vendor scorecard series: orjson over
+NumPy columns (app.json_columns) vs the stdlib json of per-row records
+with values converted to Python one by one. Both must decode to the same
+columns.
+
+    python -m benchmarks.bench_kpi_api --pos 1000000
+"""
+
+import argparse
+import json
+import math
+import tempfile
+import time
+
+import orjson
+
+from app import JSON_OPTIONS, json_columns, json_default
+from benchmarks.synthetic import purchase_set
+from logic.component3c_vendor_performance import score_vendors
+from logic.ingest import prepare
+from logic.keys import KeyDictionary
+from logic.po_facts import build_po_facts
+from logic.vendor_scorecard import build_vendor_events
+
+REPEAT = 20
+
+
+def records_json(df):
+    # The usual hand-rolled path: rows as dicts of Python values
+    rows = [
+        {
+            column: None if isinstance(value, float) and math.isnan(value)
+            else value.item() if hasattr(value, "item") else value
+            for column, value in row.items()
+        }
+        for row in df.to_dict("records")
+    ]
+    return json.dumps(rows).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pos", type=int, default=1000000)
+    args = parser.parse_args()
+
+    frames = purchase_set(args.pos)
+    with tempfile.TemporaryDirectory() as tmp:
+        keys = KeyDictionary(tmp)
+        facts = build_po_facts(*(
+            prepare(field, frames[field], keys=keys)
+            for field in ("po_file", "receipt_file", "lines_file", "items_file")
+        ))
+    scorecard = score_vendors(build_vendor_events(facts))
+
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        columnar = orjson.dumps(
+            json_columns(scorecard), default=json_default, option=JSON_OPTIONS
+        )
+    columnar_s = (time.perf_counter() - start) / REPEAT
+
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        records = records_json(scorecard)
+    records_s = (time.perf_counter() - start) / REPEAT
+
+    columns, rows = orjson.loads(columnar), json.loads(records)
+    assert list(columns) == list(scorecard.columns)
+    for column, values in columns.items():
+        assert values == [row[column] for row in rows], column
+
+    print(f"scorecard rows      {len(scorecard):>12,}  ({len(scorecard.columns)} columns)")
+    print(f"orjson columns      {columnar_s * 1000:>10.1f}ms  ({len(columnar) / 1024:.0f} KB)")
+    print(f"json records        {records_s * 1000:>10.1f}ms  ({records_s / columnar_s:.0f}x, {len(records) / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
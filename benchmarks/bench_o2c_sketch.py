@@ -0,0 +1,94 @@
+"""
+Component 4 O2C metrics from the per-month / per-customer sketch
+(logic.o2c_sketch) vs run_component4 on the orders themselves, for the
+whole period, month ranges and single customers. The sketch must give
+identical metrics (mean, median, p90/p95/p99, within-N-days shares).
+
+    python -m benchmarks.bench_o2c_sketch --orders 1000000
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import sales_set
+from logic.component4_sales_invoice import run_component4
+from logic.ingest import prepare
+from logic.keys import KeyDictionary
+from logic.o2c_sketch import build_o2c_sketch, o2c_metrics
+
+
+def same(expected, actual):
+    # Equal values; NaN (no valid cycle) matches NaN
+    return expected.keys() == actual.keys() and all(
+        e == a or (np.isnan(e) and np.isnan(a))
+        for e, a in zip(expected.values(), actual.values())
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--orders", type=int, default=1000000)
+    parser.add_argument("--customers", type=int, default=5)
+    args = parser.parse_args()
+
+    frames = sales_set(args.orders)
+    with tempfile.TemporaryDirectory() as tmp:
+        keys = KeyDictionary(tmp)
+        df_so, df_inv = (
+            prepare(field, frames[field], keys=keys)
+            for field in ("sales_order_file", "sales_invoice_file")
+        )
+
+    start = time.perf_counter()
+    expected, _ = run_component4(df_so, df_inv)
+    exact_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    sketch = build_o2c_sketch(df_so, df_inv)
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = o2c_metrics(sketch)
+    merge_s = time.perf_counter() - start
+
+    assert same(expected, actual), (expected, actual)
+
+    # Month ranges and customers: the exact run only sees their orders
+    month = df_so["Document Date"].dt.to_period("M").astype(str)
+    customers = df_so["Sell-to Customer No."].dropna().unique()[:args.customers]
+    queries = [
+        ("2024-01", "2024-03", None),
+        ("2024-06", "2024-06", None),
+        ("2024-04", None, None),
+        ("2030-01", None, None),  # no orders
+    ] + [(None, None, customer) for customer in customers] + [
+        ("2024-02", "2024-05", customers[0])
+    ]
+
+    for first, last, customer in queries:
+        keep = pd.Series(True, index=df_so.index)
+        if first:
+            keep &= month >= first
+        if last:
+            keep &= month <= last
+        if customer:
+            keep &= df_so["Sell-to Customer No."] == customer
+
+        expected, _ = run_component4(df_so[keep], df_inv)
+        actual = o2c_metrics(sketch, first, last, customer)
+        assert same(expected, actual), (first, last, customer, expected, actual)
+
+    print(f"sales orders        {len(df_so):>12,}")
+    print(f"sketch rows         {len(sketch):>12,}")
+    print(f"run_component4      {exact_s:>11.2f}s")
+    print(f"sketch build        {build_s:>11.2f}s  (once per upload)")
+    print(f"metrics from sketch {merge_s:>11.3f}s  ({exact_s / merge_s:.0f}x)")
+    print(f"{len(queries)} range / customer queries identical to exact runs")
+
+
+if __name__ == "__main__":
+    main()
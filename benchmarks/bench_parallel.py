@@ -0,0 +1,76 @@
+"""
+Upload wall time for the multi-file KPIs, sequential vs one process per
+file (logic.ingest.parse_uploads).
+
+    python -m benchmarks.bench_parallel --pos 20000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.synthetic import purchase_set, to_xlsx
+from logic.ingest import parse_into_store, parse_pool, parse_uploads
+
+KPIS = {
+    "component3a (3 files)": ["po_file", "receipt_file", "lines_file"],
+    "component5a (4 files)": ["items_file", "po_file", "receipt_file", "lines_file"],
+}
+
+
+def uploads_for(fields, paths):
+    return [
+        {
+            "field": field,
+            "name": field.replace("_file", "_df"),
+            "path": paths[field],
+            "columns": None,
+            "key": None,
+            "meta": None,
+        }
+        for field in fields
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pos", type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {
+            field: to_xlsx(df, os.path.join(tmp, f"{field}.xlsx"))
+            for field, df in purchase_set(args.pos, n_items=args.pos).items()
+        }
+        store_root = os.path.join(tmp, "store")
+
+        # Largest single file bounds the parallel wall time
+        single = {}
+        for field, path in paths.items():
+            start = time.perf_counter()
+            parse_into_store(store_root, uploads_for([field], paths)[0])
+            single[field] = time.perf_counter() - start
+            print(f"{field:<14}{os.path.getsize(path) / 1e6:>7.1f} MB{single[field]:>8.2f} s")
+
+        # Start the workers before timing
+        if parse_pool() is not None:
+            parse_uploads(store_root, uploads_for(["items_file", "po_file"], paths))
+
+        print(f"\n{'kpi':<24}{'sequential':>12}{'parallel':>10}{'largest':>10}{'speedup':>9}")
+        for label, fields in KPIS.items():
+            sequential = sum(single[field] for field in fields)
+
+            start = time.perf_counter()
+            parse_uploads(store_root, uploads_for(fields, paths))
+            parallel = time.perf_counter() - start
+
+            largest = max(single[field] for field in fields)
+            print(
+                f"{label:<24}{sequential:>12.2f}{parallel:>10.2f}"
+                f"{largest:>10.2f}{sequential / parallel:>8.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
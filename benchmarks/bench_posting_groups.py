@@ -0,0 +1,78 @@
+"""
+PO → Inventory Posting Group membership: one membership pass over the
+Purchase Lines per group (how the facts found RM POs) vs the bitmask
+pass that builds every Group_<group> flag of the PO facts at once.
+Flags are checked against the per-group passes.
+
+    python -m benchmarks.bench_posting_groups --lines 1000000
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import purchase_set
+from logic.ingest import prepare
+from logic.keys import KeyDictionary, dense_lookup, domain_size, member_mask
+from logic.po_facts import build_po_facts, posting_groups
+
+
+def group_pass(items, lines, po, group):
+    # The former Is_RM computation, for one group
+    item_codes = items["Item_Key"].to_numpy()
+    line_items = lines["Item_Key"].to_numpy()
+    po_codes = po["PO_Key"].to_numpy()
+    line_codes = lines["PO_Key"].to_numpy()
+
+    group_items = member_mask(
+        item_codes[(items["Inventory Posting Group"] == group).to_numpy()],
+        domain_size(item_codes, line_items)
+    )
+    group_pos = member_mask(
+        line_codes[dense_lookup(group_items, line_items, False)],
+        domain_size(po_codes, line_codes)
+    )
+    return dense_lookup(group_pos, po_codes, False)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, default=1000000)
+    args = parser.parse_args()
+
+    frames = purchase_set(args.lines // 4, lines_per_po=4)
+    with tempfile.TemporaryDirectory() as tmp:
+        keys = KeyDictionary(tmp)
+        po, rcpt, lines, items = (
+            prepare(field, frames[field], keys=keys)
+            for field in ("po_file", "receipt_file", "lines_file", "items_file")
+        )
+
+    start = time.perf_counter()
+    without_groups = build_po_facts(po, rcpt, lines)
+    base_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    facts = build_po_facts(po, rcpt, lines, items)
+    facts_s = time.perf_counter() - start
+
+    groups = posting_groups(facts)
+
+    start = time.perf_counter()
+    expected = {group: group_pass(items, lines, po, group) for group in groups}
+    pass_s = time.perf_counter() - start
+
+    for group in groups:
+        assert np.array_equal(facts[f"Group_{group}"].to_numpy(), expected[group])
+    assert len(facts) == len(without_groups)
+
+    print(f"purchase lines      {len(lines):>12,}")
+    print(f"posting groups      {', '.join(groups):>12}")
+    print(f"one pass per group  {pass_s:>11.2f}s")
+    print(f"bitmask (all)       {facts_s - base_s:>11.2f}s  (inside facts build)")
+
+
+if __name__ == "__main__":
+    main()
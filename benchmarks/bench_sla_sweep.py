@@ -0,0 +1,80 @@
+"""
+On-time % over a sweep of SLA thresholds (component 3A): rerunning the
+KPI on the PO facts per threshold vs reading one delivery-days histogram
+(logic.delivery_histogram). Per-vendor results are checked against a
+direct count of the POs delivered within each threshold.
+
+    python -m benchmarks.bench_sla_sweep --pos 1000000
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import purchase_set
+from logic.component3a_vendor_ontime import (
+    delivery_histogram, run_component3a, summarize_sla
+)
+from logic.ingest import prepare
+from logic.keys import KeyDictionary
+from logic.po_facts import build_po_facts
+
+
+def direct_counts(facts, sla_days):
+    df = facts[facts["Completed"]].dropna(subset=["Order_Date", "Receipt_Date"])
+    days = (df["Receipt_Date"] - df["Order_Date"]).dt.days
+    df = df[days >= 0].assign(On_Time=days[days >= 0] <= sla_days)
+    return df.groupby("Vendor", observed=True)["On_Time"].agg(["size", "sum"])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pos", type=int, default=1000000)
+    parser.add_argument("--max-sla", type=int, default=60)
+    args = parser.parse_args()
+
+    frames = purchase_set(args.pos)
+    with tempfile.TemporaryDirectory() as tmp:
+        keys = KeyDictionary(tmp)
+        facts = build_po_facts(*(
+            prepare(field, frames[field], keys=keys)
+            for field in ("po_file", "receipt_file", "lines_file", "items_file")
+        ))
+
+    thresholds = range(args.max_sla + 1)
+
+    start = time.perf_counter()
+    rerun = [run_component3a(facts, sla) for sla in thresholds]
+    rerun_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    histogram = delivery_histogram(facts)
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    swept = [summarize_sla(histogram, sla) for sla in thresholds]
+    curve = histogram.curve(thresholds)
+    sweep_s = time.perf_counter() - start
+
+    for sla, (metrics, vendor_kpi), (expected, _) in zip(thresholds, swept, rerun):
+        assert metrics == expected, sla
+        assert curve["On_Time_Pct"][sla] == metrics["Overall_On_Time_Pct"], sla
+
+    for sla in (0, 10, args.max_sla):
+        direct = direct_counts(facts, sla)
+        vendor_kpi = swept[sla][1].set_index("Vendor")
+        assert np.array_equal(vendor_kpi["Total_POs"], direct["size"]), sla
+        assert np.array_equal(vendor_kpi["On_Time_POs"], direct["sum"]), sla
+
+    n = len(thresholds)
+    print(f"purchase orders     {len(facts):>12,}")
+    print(f"histogram cells     {len(histogram.cells):>12,}  × {histogram.width + 1} bins")
+    print(f"{n} KPI reruns      {rerun_s:>11.2f}s")
+    print(f"histogram build     {build_s:>11.2f}s  (once per upload)")
+    print(f"{n} SLA lookups     {sweep_s:>11.3f}s  ({sweep_s / n * 1000:.2f}ms each)")
+
+
+if __name__ == "__main__":
+    main()
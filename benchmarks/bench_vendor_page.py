@@ -0,0 +1,120 @@
+"""
+Cross-KPI vendor page: one vendor's 3A / 3B / 5 / 5A counts and 3C
+scorecard by vendor id (binary searches in the prebuilt histograms and
+delivery events) vs recomputing every KPI table and picking the vendor's
+row by name. Both must give the same numbers.
+
+    python -m benchmarks.bench_vendor_page --pos 1000000
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import purchase_set
+from logic import (
+    component3a_vendor_ontime,
+    component3b_order_delivery,
+    component3c_vendor_performance,
+    component5_po_sla,
+    component5a_rm_quarterly,
+)
+from logic.ingest import prepare
+from logic.keys import KeyDictionary
+from logic.po_facts import build_po_facts, in_groups
+from logic.vendor_scorecard import build_vendor_events
+
+MODULES = [
+    component3a_vendor_ontime,
+    component3b_order_delivery,
+    component5_po_sla,
+    component5a_rm_quarterly,
+]
+
+
+def overall_counts(module, histogram):
+    groups = getattr(module, "POSTING_GROUPS", None)
+    if groups:
+        histogram = histogram.select(in_groups(histogram.cells, groups))
+
+    overall = histogram.counts(module.SLA_DAYS, by=())
+    total, within = int(overall["Total"].sum()), int(overall["On_Time"].sum())
+    return {"Total": total, "On_Time": within, "Late": total - within}
+
+
+def by_id(histograms, events, vendor_key):
+    counts = []
+    for module, histogram in zip(MODULES, histograms):
+        counts.append(overall_counts(module, histogram.vendor(vendor_key)))
+
+    scorecard = component3c_vendor_performance.score_vendors(
+        events, vendor_keys=[vendor_key]
+    )
+    return counts, scorecard
+
+
+def by_name(facts, events, vendor, buy_from):
+    # Every KPI table rebuilt and filtered on the vendor's name
+    counts = []
+    for module in MODULES:
+        role = "Buy_From_Vendor" if module in MODULES[2:] else "Vendor"
+        name = buy_from if role == "Buy_From_Vendor" else vendor
+        counts.append(overall_counts(
+            module, module.delivery_histogram(facts[facts[role] == name])
+        ))
+
+    scorecard = component3c_vendor_performance.score_vendors(events)
+    return counts, scorecard[scorecard["Vendor"] == vendor]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pos", type=int, default=1000000)
+    parser.add_argument("--vendors", type=int, default=20)
+    args = parser.parse_args()
+
+    frames = purchase_set(args.pos)
+    with tempfile.TemporaryDirectory() as tmp:
+        keys = KeyDictionary(tmp)
+        facts = build_po_facts(*(
+            prepare(field, frames[field], keys=keys)
+            for field in ("po_file", "receipt_file", "lines_file", "items_file")
+        ))
+
+    # Built once per upload (cached by the app)
+    histograms = [module.delivery_histogram(facts) for module in MODULES]
+    events = build_vendor_events(facts)
+
+    rng = np.random.default_rng(0)
+    sample = facts.iloc[rng.choice(len(facts), args.vendors, replace=False)]
+    sample = sample[sample["Vendor_Key"] == sample["Buy_From_Vendor_Key"]]
+
+    start = time.perf_counter()
+    fast = [by_id(histograms, events, key) for key in sample["Vendor_Key"]]
+    id_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    slow = [
+        by_name(facts, events, vendor, buy_from)
+        for vendor, buy_from in zip(sample["Vendor"], sample["Buy_From_Vendor"])
+    ]
+    name_s = time.perf_counter() - start
+
+    for (counts, scorecard), (expected, expected_scorecard) in zip(fast, slow):
+        assert counts == expected
+        pd.testing.assert_frame_equal(
+            scorecard.reset_index(drop=True),
+            expected_scorecard.reset_index(drop=True)
+        )
+
+    n = len(sample)
+    print(f"purchase orders     {len(facts):>12,}")
+    print(f"{n} vendor pages    {'':>3}by id   {id_s:>7.3f}s  ({id_s / n * 1000:.1f}ms each)")
+    print(f"{n} vendor pages    {'':>1}by name   {name_s:>7.2f}s  ({name_s / id_s:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Rolling vendor scorecards (component 3C) at 12 month-end as-of dates:
+binary searches over the sorted delivery events (logic.vendor_scorecard)
+vs filtering and grouping the deliveries of every window. Both must give
+the same scorecards.
+
+    python -m benchmarks.bench_vendor_scorecard --pos 1000000
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import purchase_set
+from logic.ingest import prepare
+from logic.keys import KeyDictionary
+from logic.po_facts import build_po_facts
+from logic.vendor_scorecard import build_vendor_events, vendor_scorecard
+
+SLA_DAYS = 10
+WINDOWS = (30, 90, 365)
+MEASURES = ["On_Time_Pct", "Lead_P50", "Lead_P90", "Fill_Rate"]
+
+
+def direct_scorecard(events, as_of, days):
+    window = events[
+        (events["Receipt_Date"] > as_of - pd.Timedelta(days=days)) &
+        (events["Receipt_Date"] <= as_of)
+    ].assign(On_Time=lambda df: df["Lead_Days"] <= SLA_DAYS)
+    vendors = window.groupby("Vendor", observed=True)
+
+    return pd.DataFrame({
+        "Deliveries": vendors.size(),
+        "On_Time_Pct": (vendors["On_Time"].mean() * 100).round(2),
+        "Lead_P50": vendors["Lead_Days"].quantile(0.5).round(2),
+        "Lead_P90": vendors["Lead_Days"].quantile(0.9).round(2),
+        "Fill_Rate": (
+            vendors["Received_Qty"].sum() / vendors["Ordered_Qty"].sum() * 100
+        ).round(2),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pos", type=int, default=1000000)
+    args = parser.parse_args()
+
+    frames = purchase_set(args.pos)
+    with tempfile.TemporaryDirectory() as tmp:
+        keys = KeyDictionary(tmp)
+        facts = build_po_facts(*(
+            prepare(field, frames[field], keys=keys)
+            for field in ("po_file", "receipt_file", "lines_file", "items_file")
+        ))
+
+    start = time.perf_counter()
+    events = build_vendor_events(facts)
+    build_s = time.perf_counter() - start
+
+    latest = events["Receipt_Date"].max()
+    as_of_dates = pd.date_range(end=latest, periods=12, freq="ME")
+
+    start = time.perf_counter()
+    scorecards = [
+        vendor_scorecard(events, as_of, SLA_DAYS, WINDOWS)
+        for as_of in as_of_dates
+    ]
+    scorecard_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    direct = [
+        [direct_scorecard(events, as_of, days) for days in WINDOWS]
+        for as_of in as_of_dates
+    ]
+    direct_s = time.perf_counter() - start
+
+    for as_of, scorecard, windows in zip(as_of_dates, scorecards, direct):
+        scorecard = scorecard.set_index("Vendor")
+        for days, expected in zip(WINDOWS, windows):
+            computed = scorecard.loc[expected.index]
+            assert (
+                scorecard[f"Deliveries_{days}"].sum() == expected["Deliveries"].sum()
+            ), (as_of, days)
+            assert np.array_equal(
+                computed[f"Deliveries_{days}"], expected["Deliveries"]
+            ), (as_of, days)
+            for name in MEASURES:
+                assert np.allclose(
+                    computed[f"{name}_{days}"], expected[name]
+                ), (as_of, days, name)
+
+    n = len(as_of_dates)
+    print(f"delivery events     {len(events):>12,}")
+    print(f"vendors scored      {len(scorecards[-1]):>12,}  (latest as-of)")
+    print(f"events build        {build_s:>11.2f}s  (once per upload)")
+    print(f"{n} scorecards       {scorecard_s:>11.2f}s  ({len(WINDOWS)} windows each)")
+    print(f"{n} direct groupbys  {direct_s:>11.2f}s  ({direct_s / scorecard_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Synthetic Business Central exports for the benchmarks.
+Column names follow the real exports; values are random but shaped
+like production data (codes repeat, dates span a year).
+"""
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+
+def _codes(rng, prefix, n_unique, size):
+    return np.char.add(prefix, rng.integers(0, n_unique, size).astype(str))
+
+
+def _dates(rng, size, start="2024-01-01", days=365):
+    offsets = rng.integers(0, days, size)
+    return pd.Timestamp(start) + pd.to_timedelta(offsets, unit="D")
+
+
+def item_ledger(rows, seed=0, extra_cols=30):
+    rng = np.random.default_rng(seed)
+    qty = rng.integers(-500, 1000, rows).astype(float)
+
+    df = pd.DataFrame({
+        "Entry No.": np.arange(1, rows + 1),
+        "Item No.": _codes(rng, "ITM-", max(rows // 20, 1), rows),
+        "Location Code": _codes(rng, "LF-", 12, rows),
+        "Posting Date": _dates(rng, rows),
+        "Quantity": qty,
+        "Remaining Quantity": np.where(qty > 0, qty * rng.random(rows), 0),
+        "Cost Amount (Actual)": qty * rng.uniform(5, 50, rows),
+        "Description": _codes(rng, "Item description ", 2000, rows),
+        "Item Category Code": _codes(rng, "CAT", 15, rows),
+        "Item Subcategory Code": _codes(rng, "SUB", 60, rows),
+    })
+
+    # Real exports carry many columns no KPI reads
+    for i in range(extra_cols):
+        df[f"Unused Column {i}"] = _codes(rng, "X", 100, rows)
+
+    return df
+
+
+def transfer_lines(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    qty = rng.integers(1, 500, rows).astype(float)
+    shipped = np.floor(qty * rng.choice([0, 0.5, 1], rows))
+    received = np.floor(shipped * rng.choice([0, 1], rows))
+
+    return pd.DataFrame({
+        "Document No.": _codes(rng, "TO-", max(rows // 4, 1), rows),
+        "Transfer-from Code": _codes(rng, "LF-", 6, rows),
+        "Transfer-to Code": _codes(rng, "LF-", 6, rows),
+        "Quantity": qty,
+        "Quantity Shipped": shipped,
+        "Quantity Received": received,
+        "Created At": _dates(rng, rows),
+    })
+
+
+def purchase_set(n_pos, lines_per_po=4, seed=0, n_items=5000):
+    """Purchase Order, Posted Purchase Receipts, Purchase Lines and Items."""
+
+    rng = np.random.default_rng(seed)
+    po_no = np.char.add("PO-", np.arange(n_pos).astype(str))
+    rcpt_no = np.char.add("PR-", np.arange(n_pos).astype(str))
+    order_date = _dates(rng, n_pos)
+    vendor = _codes(rng, "Vendor ", max(n_pos // 50, 1), n_pos)
+
+    items = pd.DataFrame({
+        "No.": np.char.add("ITM-", np.arange(n_items).astype(str)),
+        "Inventory Posting Group": rng.choice(["RM", "PM", "FG"], n_items),
+        "Gen. Prod. Posting Group": rng.choice(["LED", "PKG", "RAW"], n_items),
+    })
+
+    po = pd.DataFrame({
+        "No.": po_no,
+        "Pay-to Name": vendor,
+        "Buy-from Vendor Name": vendor,
+        "Order Date": order_date,
+        "Last Receiving No.": rcpt_no,
+    })
+
+    receipts = pd.DataFrame({
+        "No.": rcpt_no,
+        "Order No.": po_no,
+        "Posting Date": order_date + pd.to_timedelta(
+            rng.integers(0, 40, n_pos), unit="D"
+        ),
+    })
+
+    n_lines = n_pos * lines_per_po
+    lines = pd.DataFrame({
+        "Document No.": np.repeat(po_no, lines_per_po),
+        "No.": _codes(rng, "ITM-", n_items, n_lines),
+        "Quantity": rng.integers(1, 100, n_lines).astype(float),
+        "Outstanding Quantity": np.where(
+            rng.random(n_lines) < 0.8, 0, rng.integers(1, 50, n_lines)
+        ).astype(float),
+    })
+
+    return {
+        "items_file": items,
+        "po_file": po,
+        "receipt_file": receipts,
+        "lines_file": lines,
+    }
+
+
+def to_xlsx(df, path):
+    """Write with openpyxl write-only mode (fast enough for 100k+ rows)."""
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(list(df.columns))
+
+    columns = [
+        col.dt.to_pydatetime() if col.dtype.kind == "M" else col.tolist()
+        for _, col in df.items()
+    ]
+    for row in zip(*columns):
+        ws.append(row)
+
+    wb.save(path)
+    return path
+
+
+def sales_set(n_orders, invoices_per_order=2, seed=0):
+    """Sales Order and Posted Sales Invoice."""
+
+    rng = np.random.default_rng(seed)
+    so_no = np.char.add("SO-", np.arange(n_orders).astype(str))
+    doc_date = _dates(rng, n_orders)
+
+    orders = pd.DataFrame({
+        "No.": so_no,
+        "Document Date": doc_date,
+        "Completely Shipped": rng.random(n_orders) < 0.7,
+        "Short Closed": rng.random(n_orders) < 0.2,
+        "Sell-to Customer No.": _codes(rng, "C", max(n_orders // 100, 1), n_orders),
+        "Location Code": _codes(rng, "LF-", 12, n_orders),
+        "Salesperson Code": _codes(rng, "SP", 25, n_orders),
+    })
+
+    n_inv = n_orders * invoices_per_order
+    invoices = pd.DataFrame({
+        "Order No.": np.repeat(so_no, invoices_per_order),
+        "Posting Date": np.repeat(doc_date, invoices_per_order) + pd.to_timedelta(
+            rng.integers(0, 120, n_inv), unit="D"
+        ),
+    })
+
+    return {"sales_order_file": orders, "sales_invoice_file": invoices}
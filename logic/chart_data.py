@@ -0,0 +1,52 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Rows a high-cardinality chart draws; the rest is pooled into one bar
+CHART_TOP_N = int(os.environ.get("CONA_CHART_TOP_N", 25))
+
+OTHER_LABEL = "Other"
+
+
+def top_positions(values, n, offset=0):
+    """
+    Positions of the rows ranked offset … offset + n - 1 by `values`
+    (descending, ties in row order), as np.argsort(-values, kind="stable")
+    would give. argpartition finds the cut-off value in O(rows); only the
+    rows at or above it are sorted.
+    """
+
+    key = -np.asarray(values, dtype=np.float64)
+    end = min(offset + n, len(key))
+    if offset >= end:
+        return np.array([], dtype=np.intp)
+
+    cutoff = key[np.argpartition(key, end - 1)[end - 1]]
+    candidates = np.flatnonzero(key <= cutoff)
+    ranked = candidates[np.argsort(key[candidates], kind="stable")]
+
+    return ranked[offset:end]
+
+
+def top_n(df: pd.DataFrame, by, label, sums, n=CHART_TOP_N, offset=0):
+    """
+    Chart rows of `df`: the rows ranked offset … offset + n - 1 by column
+    `by`, then one "Other (k)" row (label in column `label`) holding the
+    `sums` columns totalled over the k rows not shown. Its other columns
+    are NaN; ratios are for the caller to derive from the sums.
+    """
+
+    shown = top_positions(df[by].to_numpy(), n, offset)
+    rest = np.ones(len(df), dtype=bool)
+    rest[shown] = False
+
+    top = df.iloc[shown]
+    if not rest.any():
+        return top.reset_index(drop=True)
+
+    other = pd.DataFrame({
+        label: [f"{OTHER_LABEL} ({int(rest.sum()):,})"],
+        **{column: [df[column].to_numpy()[rest].sum()] for column in sums},
+    })
+    return pd.concat([top, other], ignore_index=True)
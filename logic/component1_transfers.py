@@ -1,21 +1,9 @@
+import numpy as np
 import pandas as pd
 
-def run_component1(df: pd.DataFrame):
-    """
-    Serverless-safe version
-    Expects a DataFrame (already loaded from Excel in app.py)
-    """
-
-    # -------------------------
-    # CLEAN COLUMN NAMES
-    # -------------------------
-    df = df.copy()
-    df.columns = df.columns.str.strip()
-
-    # -------------------------
-    # REQUIRED COLUMNS
-    # -------------------------
-    required_cols = [
+# Columns read from each upload (see logic.ingest)
+INPUT_COLUMNS = {
+    "transfer_file": [
         "Document No.",
         "Transfer-from Code",
         "Transfer-to Code",
@@ -24,6 +12,33 @@ def run_component1(df: pd.DataFrame):
         "Quantity Received",
         "Created At"
     ]
+}
+
+
+def _starts_with(col, prefix):
+    """col.astype(str).str.startswith(prefix), per category when categorical."""
+
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        matches = col.cat.categories.astype(str).str.startswith(prefix)
+        codes = col.cat.codes.to_numpy()
+        return pd.Series(
+            np.asarray(matches)[codes] & (codes >= 0),
+            index=col.index
+        )
+
+    return col.astype(str).str.startswith(prefix)
+
+
+def run_component1(df: pd.DataFrame):
+    """
+    Serverless-safe version
+    Expects the normalized Transfer Lines frame (see logic.normalize)
+    """
+
+    # -------------------------
+    # REQUIRED COLUMNS
+    # -------------------------
+    required_cols = INPUT_COLUMNS["transfer_file"]
 
     df = df[required_cols]
 
@@ -35,9 +50,6 @@ def run_component1(df: pd.DataFrame):
     for col in ["Quantity", "Quantity Shipped", "Quantity Received"]:
         df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
 
-    df["Transfer-from Code"] = df["Transfer-from Code"].astype(str)
-    df["Transfer-to Code"] = df["Transfer-to Code"].astype(str)
-
     df["Created At"] = pd.to_datetime(df["Created At"], errors="coerce")
     df = df.dropna(subset=["Created At"])
 
@@ -45,40 +57,43 @@ def run_component1(df: pd.DataFrame):
     # LF → LF FILTER
     # -------------------------
     df = df[
-        df["Transfer-from Code"].str.startswith("LF-") &
-        df["Transfer-to Code"].str.startswith("LF-")
+        _starts_with(df["Transfer-from Code"], "LF-") &
+        _starts_with(df["Transfer-to Code"], "LF-")
     ]
 
     # -------------------------
     # AGGREGATION LOGIC
     # -------------------------
-    records = []
-
-    for doc_no, g in df.groupby("Document No."):
-        total_qty = g["Quantity"].sum()
-        shipped_qty = g["Quantity Shipped"].sum()
-        received_qty = g["Quantity Received"].sum()
-
-        if received_qty >= shipped_qty:
-            status = "Completed"
-        elif shipped_qty >= total_qty:
-            status = "In Transit"
-        else:
-            status = "Partially Shipped"
-
-        created_at = g["Created At"].min()
-
-        records.append({
-            "Document No": doc_no,
-            "Total Qty": total_qty,
-            "Shipped Qty": shipped_qty,
-            "Received Qty": received_qty,
-            "In Transit Qty": shipped_qty - received_qty,
-            "Status": status,
-            "Month": created_at.strftime("%Y-%m")
+    df_orders = (
+        df.groupby("Document No.", sort=True)
+        .agg(**{
+            "Total Qty": ("Quantity", "sum"),
+            "Shipped Qty": ("Quantity Shipped", "sum"),
+            "Received Qty": ("Quantity Received", "sum"),
+            "Created At": ("Created At", "min"),
         })
-
-    df_orders = pd.DataFrame(records)
+        .rename_axis("Document No")
+        .reset_index()
+    )
+
+    total_qty = df_orders["Total Qty"].to_numpy()
+    shipped_qty = df_orders["Shipped Qty"].to_numpy()
+    received_qty = df_orders["Received Qty"].to_numpy()
+
+    df_orders["In Transit Qty"] = shipped_qty - received_qty
+
+    df_orders["Status"] = np.select(
+        [received_qty >= shipped_qty, shipped_qty >= total_qty],
+        ["Completed", "In Transit"],
+        default="Partially Shipped"
+    )
+
+    # "%Y-%m" of the first line, formatted once per distinct month
+    months, month_idx = np.unique(
+        df_orders.pop("Created At").to_numpy().astype("datetime64[M]"),
+        return_inverse=True
+    )
+    df_orders["Month"] = np.datetime_as_string(months, unit="M")[month_idx]
 
     # -------------------------
     # SUMMARY
@@ -2,96 +2,59 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 
+from logic.dormancy_state import (
+    LEDGER_COLUMNS, build_dormancy_state, dormancy_trend
+)
 
-def run_component2(df: pd.DataFrame):
+SLOW_MOVING_DAYS = 60   # dormant longer → Slow-Moving
+DEAD_DAYS = 365         # dormant longer → Dead
+
+# Module settings a result depends on (see logic.result_cache)
+PARAMS = ("SLOW_MOVING_DAYS", "DEAD_DAYS")
+
+# Columns read from each upload (see logic.ingest)
+INPUT_COLUMNS = {
+    "ledger_file": LEDGER_COLUMNS + ["Entry No."]
+}
+
+def run_component2(df: pd.DataFrame, as_of=None):
     """
     Component 2 — Inventory Dormancy Analysis
     Serverless-safe (Vercel compatible)
     Logic preserved exactly from original version
+    Expects the normalized Item Ledger frame (see logic.normalize)
+
+    as_of: date the analysis is run at (default today); when given, only
+    entries posted on or before it are considered.
     """
 
-    # ----------------------------
-    # COPY & CLEAN COLUMN NAMES
-    # ----------------------------
-    df = df.copy()
-    df.columns = df.columns.str.strip()
+    if as_of is not None:
+        as_of = pd.Timestamp(as_of).normalize()
+        df = df[pd.to_datetime(df["Posting Date"], errors="coerce") <= as_of]
 
-    # ----------------------------
-    # REQUIRED COLUMNS
-    # ----------------------------
-    required_cols = [
-        "Item No.",
-        "Location Code",
-        "Posting Date",
-        "Quantity",
-        "Remaining Quantity",
-        "Cost Amount (Actual)",
-        "Description",
-        "Item Category Code",
-        "Item Subcategory Code"
-    ]
-
-    df = df[required_cols]
+    return run_component2_state(build_dormancy_state(df), as_of)
 
-    # ----------------------------
-    # TYPE CLEANING
-    # ----------------------------
-    df["Posting Date"] = pd.to_datetime(df["Posting Date"], errors="coerce")
-
-    df["Quantity"] = pd.to_numeric(df["Quantity"], errors="coerce").fillna(0)
-    df["Remaining Quantity"] = pd.to_numeric(
-        df["Remaining Quantity"], errors="coerce"
-    ).fillna(0)
-
-    df["Cost Amount (Actual)"] = pd.to_numeric(
-        df["Cost Amount (Actual)"], errors="coerce"
-    ).fillna(0)
-
-    df["Location Code"] = (
-        df["Location Code"]
-        .astype(str)
-        .str.strip()
-        .replace("nan", "UNKNOWN")
-    )
-
-    today = pd.Timestamp(datetime.today().date())
 
-    # ----------------------------
-    # LAST OUTWARD DATE
-    # ----------------------------
-    last_outward = (
-        df[df["Quantity"] < 0]
-        .groupby(["Item No.", "Location Code"])["Posting Date"]
-        .max()
-        .reset_index()
-        .rename(columns={"Posting Date": "Last Outward Date"})
-    )
+def run_component2_state(state: pd.DataFrame, as_of=None):
+    """
+    Dormancy classification from a per-(item, location) state (see
+    logic.dormancy_state): O(items × locations), no ledger rows read.
+    """
 
     # ----------------------------
     # CURRENT STOCK ONLY
     # ----------------------------
-    current_stock = (
-        df[df["Remaining Quantity"] > 0]
-        .groupby(["Item No.", "Location Code"])
-        .agg(
-            Description=("Description", "first"),
-            Category=("Item Category Code", "first"),
-            Subcategory=("Item Subcategory Code", "first"),
-            On_Hand=("Remaining Quantity", "sum"),
-            Stock_Value=("Cost Amount (Actual)", "sum"),
-        )
-        .reset_index()
+    result = (
+        state[state["Has_Stock"]]
+        .drop(columns="Has_Stock")
+        .reset_index(drop=True)
     )
 
+    today = pd.Timestamp(as_of or datetime.today().date()).normalize()
+
     # ----------------------------
-    # MERGE & DORMANCY
+    # DORMANCY
     # ----------------------------
-    result = current_stock.merge(
-        last_outward,
-        on=["Item No.", "Location Code"],
-        how="left"
-    )
-
     result["Days Dormant"] = np.where(
         result["Last Outward Date"].notna(),
         (today - pd.to_datetime(result["Last Outward Date"])).dt.days,
@@ -103,8 +66,8 @@ def run_component2(df: pd.DataFrame):
     # ----------------------------
     result["Status"] = "Active"
 
-    result.loc[result["Days Dormant"] > 60, "Status"] = "Slow-Moving"
-    result.loc[result["Days Dormant"] > 365, "Status"] = "Dead"
+    result.loc[result["Days Dormant"] > SLOW_MOVING_DAYS, "Status"] = "Slow-Moving"
+    result.loc[result["Days Dormant"] > DEAD_DAYS, "Status"] = "Dead"
 
     result.loc[
         result["Last Outward Date"].isna() & (result["On_Hand"] > 0),
@@ -133,3 +96,24 @@ def run_component2(df: pd.DataFrame):
     }
 
     return summary, result
+
+
+def run_component2_trend(df: pd.DataFrame, as_of=None, months=12):
+    """
+    Aging trend: the dormancy summary at the end of each of the `months`
+    months up to `as_of` (the last point is `as_of` itself), computed in
+    one pass over the ledger (see logic.dormancy_state.dormancy_trend).
+    """
+
+    as_of = pd.Timestamp(as_of or datetime.today().date()).normalize()
+
+    month_ends = pd.date_range(
+        end=as_of.to_period("M").to_timestamp() - pd.Timedelta(days=1),
+        periods=months - 1,
+        freq="ME"
+    )
+
+    return dormancy_trend(
+        df, month_ends.append(pd.DatetimeIndex([as_of])),
+        SLOW_MOVING_DAYS, DEAD_DAYS
+    )
@@ -1,94 +1,30 @@
 import pandas as pd
 
+from logic.delivery_histogram import DeliveryHistogram
+from logic.vendors import vendor_names
+
 SLA_DAYS = 10   # keep configurable
 
+# Module settings a result depends on (see logic.result_cache)
+PARAMS = ("SLA_DAYS",)
+
 
-def run_component3a(df_po: pd.DataFrame,
-                    df_rcpt: pd.DataFrame,
-                    df_lines: pd.DataFrame):
+def delivery_histogram(po_facts: pd.DataFrame):
     """
-    Component 3A — Vendor On-Time Delivery Performance
-    Serverless-safe (Vercel compatible)
-    Logic preserved exactly from original version
+    Delivery days of the completed POs per vendor and receipt month
+    (see logic.delivery_histogram); run_component3a at any SLA reads it.
     """
 
-    # ---------------- CLEAN COLUMN NAMES ----------------
-    df_po = df_po.copy()
-    df_rcpt = df_rcpt.copy()
-    df_lines = df_lines.copy()
+    # ---------------- COMPLETED POs + RECEIPT DATE ----------------
+    df = po_facts[po_facts["Completed"]]
 
-    for df in [df_po, df_rcpt, df_lines]:
-        df.columns = df.columns.str.strip()
-
-    # ---------------- PURCHASE ORDER ----------------
-    df_po = df_po.rename(columns={
-        "No.": "PO_No",
-        "Pay-to Name": "Vendor",
-        "Order Date": "Order_Date",
-        "Last Receiving No.": "Last_Receiving_No"
-    })
-
-    df_po = df_po[[
+    df = df[[
         "PO_No",
+        "Vendor_Key",
         "Vendor",
         "Order_Date",
-        "Last_Receiving_No"
-    ]]
-
-    df_po["Order_Date"] = pd.to_datetime(
-        df_po["Order_Date"], errors="coerce"
-    )
-
-    # ---------------- PURCHASE LINES (COMPLETION CHECK) ----------------
-    df_lines = df_lines.rename(columns={
-        "Document No.": "PO_No",
-        "Outstanding Quantity": "Outstanding_Qty"
-    })
-
-    df_lines["Outstanding_Qty"] = pd.to_numeric(
-        df_lines["Outstanding_Qty"], errors="coerce"
-    ).fillna(0)
-
-    completed_pos = (
-        df_lines
-        .groupby("PO_No", as_index=False)["Outstanding_Qty"]
-        .sum()
-    )
-
-    completed_pos = completed_pos[
-        completed_pos["Outstanding_Qty"] == 0
-    ]
-
-    # ---------------- RECEIPT DATE ----------------
-    df_rcpt = df_rcpt.rename(columns={
-        "No.": "Receipt_No",
-        "Posting Date": "Posting_Date"
-    })
-
-    df_rcpt["Posting_Date"] = pd.to_datetime(
-        df_rcpt["Posting_Date"], errors="coerce"
-    )
-
-    receipt_dates = df_rcpt[[
-        "Receipt_No",
-        "Posting_Date"
-    ]]
-
-    # ---------------- MERGE ALL ----------------
-    df = (
-        df_po
-        .merge(
-            completed_pos[["PO_No"]],
-            on="PO_No",
-            how="inner"
-        )
-        .merge(
-            receipt_dates,
-            left_on="Last_Receiving_No",
-            right_on="Receipt_No",
-            how="left"
-        )
-    )
+        "Receipt_Date"
+    ]].rename(columns={"Receipt_Date": "Posting_Date"})
 
     df = df.dropna(
         subset=["Order_Date", "Posting_Date"]
@@ -101,17 +37,35 @@ def run_component3a(df_po: pd.DataFrame,
 
     df = df[df["Delivery_Days"] >= 0]
 
-    # ---------------- ON-TIME FLAG ----------------
-    df["On_Time"] = df["Delivery_Days"] <= SLA_DAYS
+    return DeliveryHistogram(pd.DataFrame({
+        "Vendor_Key": df["Vendor_Key"],
+        "Month": df["Posting_Date"].dt.to_period("M").astype(str),
+        "Days": df["Delivery_Days"],
+    }), vendors=vendor_names(df["Vendor_Key"], df["Vendor"]))
+
+
+def run_component3a(po_facts: pd.DataFrame, sla_days=SLA_DAYS):
+    """
+    Component 3A — Vendor On-Time Delivery Performance
+    Serverless-safe (Vercel compatible)
+    Logic preserved exactly from original version
+    Expects the purchase-order facts table (see logic.po_facts)
+    """
+
+    return summarize_sla(delivery_histogram(po_facts), sla_days)
+
+
+def summarize_sla(histogram, sla_days=SLA_DAYS):
+    """Component 3A metrics and vendor table at `sla_days`."""
 
     # ---------------- VENDOR KPI ----------------
     vendor_kpi = (
-        df.groupby("Vendor")
-        .agg(
-            Total_POs=("PO_No", "count"),
-            On_Time_POs=("On_Time", "sum")
-        )
-        .reset_index()
+        histogram.counts(sla_days, by=("Vendor_Key",))
+        .query("Vendor_Key >= 0")
+        .rename(columns={"Total": "Total_POs", "On_Time": "On_Time_POs"})
+        [["Vendor_Key", "Vendor", "Total_POs", "On_Time_POs"]]
+        .sort_values("Vendor")
+        .reset_index(drop=True)
     )
 
     vendor_kpi["On_Time_Pct"] = round(
@@ -121,12 +75,15 @@ def run_component3a(df_po: pd.DataFrame,
     )
 
     # ---------------- OVERALL METRICS ----------------
+    overall = histogram.counts(sla_days, by=())
+    total = int(overall["Total"].sum())
+
     metrics = {
-        "Total_Completed_POs": int(len(df)),
+        "Total_Completed_POs": total,
         "Overall_On_Time_Pct": round(
-            (df["On_Time"].sum() / len(df)) * 100,
+            (overall["On_Time"].sum() / total) * 100,
             2
-        ) if len(df) else 0,
+        ) if total else 0,
         "Vendors_Below_95": int(
             (vendor_kpi["On_Time_Pct"] < 95).sum()
         )
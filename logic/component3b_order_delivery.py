@@ -1,174 +1,119 @@
 import pandas as pd
 
-SLA_DAYS = 15   # same as Excel (≤15 / >15)
-
+from logic.delivery_histogram import DeliveryHistogram
 
-def run_component3b(
-    df_po: pd.DataFrame,
-    df_rcpt: pd.DataFrame,
-    df_lines: pd.DataFrame
-):
-    """
-    Component 3B — Order Delivery Tracking
-    Serverless-safe (Vercel compatible)
-    Excel logic preserved exactly
-    """
-
-    # ---------------- COPY & CLEAN ----------------
-    df_po = df_po.copy()
-    df_rcpt = df_rcpt.copy()
-    df_lines = df_lines.copy()
+SLA_DAYS = 15   # same as Excel (≤15 / >15)
 
-    for df in [df_po, df_rcpt, df_lines]:
-        df.columns = df.columns.str.strip()
+# Module settings a result depends on (see logic.result_cache)
+PARAMS = ("SLA_DAYS",)
 
-    # ---------------- PURCHASE ORDERS ----------------
-    df_po = df_po.rename(columns={
-        "No.": "PO_No",
-        "Pay-to Name": "Vendor",
-        "Order Date": "Order_Date",
-        "Last Receiving No.": "Last_Receiving_No"
-    })
 
-    df_po = df_po[[
+def _delivery_days(po_facts: pd.DataFrame):
+    # ---------------- MATCH EXCEL All_POs_Detail ----------------
+    df = po_facts[[
         "PO_No",
+        "Vendor_Key",
         "Vendor",
         "Order_Date",
-        "Last_Receiving_No"
-    ]]
+        "Last_Receiving_No",
+        "Receipt_Date",
+        "Outstanding_Qty"
+    ]].rename(columns={"Receipt_Date": "Last_Receipt_Date"})
 
-    df_po["PO_No"] = (
-        df_po["PO_No"]
-        .astype(str)
-        .str.strip()
-        .str.upper()
-    )
+    # ---------------- DAYS DIFFERENCE ----------------
+    df["Days_Difference"] = (
+        df["Last_Receipt_Date"] - df["Order_Date"]
+    ).dt.days
 
-    df_po["Last_Receiving_No"] = (
-        df_po["Last_Receiving_No"]
+    # ---------------- MONTH (FIXES KeyError: 'Month') ----------------
+    df["Month"] = (
+        df["Last_Receipt_Date"]
+        .dt.to_period("M")
         .astype(str)
-        .str.strip()
-        .str.upper()
     )
 
-    df_po["Vendor"] = (
-        df_po["Vendor"]
-        .astype(str)
-        .str.strip()
-    )
+    return df
 
-    df_po["Order_Date"] = pd.to_datetime(
-        df_po["Order_Date"],
-        errors="coerce"
-    )
 
-    # ---------------- RECEIPTS ----------------
-    df_rcpt = df_rcpt.rename(columns={
-        "No.": "Last_Receiving_No",
-        "Posting Date": "Posting_Date"
-    })
+def delivery_histogram(po_facts: pd.DataFrame):
+    """
+    Days from order to last receipt of the received POs per vendor and
+    receipt month (see logic.delivery_histogram).
+    """
 
-    df_rcpt["Last_Receiving_No"] = (
-        df_rcpt["Last_Receiving_No"]
-        .astype(str)
-        .str.strip()
-        .str.upper()
-    )
+    df = _delivery_days(po_facts)
+    df = df[df["Days_Difference"] >= 0]
 
-    df_rcpt["Posting_Date"] = pd.to_datetime(
-        df_rcpt["Posting_Date"],
-        errors="coerce"
-    )
+    return DeliveryHistogram(pd.DataFrame({
+        "Vendor_Key": df["Vendor_Key"],
+        "Month": df["Month"],
+        "Days": df["Days_Difference"],
+    }))
 
-    receipt_map = (
-        df_rcpt
-        .set_index("Last_Receiving_No")["Posting_Date"]
-        .to_dict()
-    )
 
-    # ---------------- PURCHASE LINES (COMPLETION INFO ONLY) ----------------
-    df_lines = df_lines.rename(columns={
-        "Document No.": "PO_No",
-        "Outstanding Quantity": "Outstanding_Qty"
-    })
+def _metrics(on_time, delayed, sla_days):
+    total_considered = on_time + delayed
 
-    df_lines["PO_No"] = (
-        df_lines["PO_No"]
-        .astype(str)
-        .str.strip()
-        .str.upper()
-    )
+    return {
+        # Excel-aligned
+        f"≤{sla_days}_days": on_time,
+        f">{sla_days}_days": delayed,
 
-    df_lines["Outstanding_Qty"] = pd.to_numeric(
-        df_lines["Outstanding_Qty"],
-        errors="coerce"
-    ).fillna(0)
+        # Flask dashboard expects these keys
+        "On_Time": on_time,
+        "Delayed": delayed,
 
-    po_completion = (
-        df_lines
-        .groupby("PO_No")["Outstanding_Qty"]
-        .sum()
-    )
+        "On_Time_Pct": round(
+            (on_time / total_considered) * 100,
+            2
+        ) if total_considered else 0
+    }
 
-    # ---------------- MERGE (MATCH EXCEL All_POs_Detail) ----------------
-    df = df_po.copy()
 
-    df["Last_Receipt_Date"] = (
-        df["Last_Receiving_No"]
-        .map(receipt_map)
-    )
+def summarize_sla(histogram, sla_days=SLA_DAYS):
+    """Component 3B metrics at `sla_days`."""
+
+    overall = histogram.counts(sla_days, by=())
 
-    df["Outstanding_Qty"] = (
-        df["PO_No"]
-        .map(po_completion)
-        .fillna(0)
+    return _metrics(
+        int(overall["On_Time"].sum()), int(overall["Late"].sum()), sla_days
     )
 
-    # ---------------- DAYS DIFFERENCE ----------------
-    df["Days_Difference"] = (
-        df["Last_Receipt_Date"] - df["Order_Date"]
-    ).dt.days
+
+def run_component3b(po_facts: pd.DataFrame, sla_days=SLA_DAYS):
+    """
+    Component 3B — Order Delivery Tracking
+    Serverless-safe (Vercel compatible)
+    Excel logic preserved exactly
+    Expects the purchase-order facts table (see logic.po_facts)
+    """
+
+    df = _delivery_days(po_facts)
 
     # ---------------- DELIVERY STATUS (EXACT EXCEL LOGIC) ----------------
+    on_time_label = f"≤{sla_days} days"
+    delayed_label = f">{sla_days} days"
+
     df["Delivery_Status"] = "No Receipt"
 
     df.loc[
-        df["Days_Difference"] > SLA_DAYS,
+        df["Days_Difference"] > sla_days,
         "Delivery_Status"
-    ] = ">15 days"
+    ] = delayed_label
 
     df.loc[
         (df["Days_Difference"] >= 0) &
-        (df["Days_Difference"] <= SLA_DAYS),
+        (df["Days_Difference"] <= sla_days),
         "Delivery_Status"
-    ] = "≤15 days"
+    ] = on_time_label
 
-    # ---------------- MONTH (FIXES KeyError: 'Month') ----------------
-    df["Month"] = (
-        df["Last_Receipt_Date"]
-        .dt.to_period("M")
-        .astype(str)
-    )
+    df["Month"] = df.pop("Month")
 
     # ---------------- METRICS (DASHBOARD SAFE) ----------------
-    le_15 = int((df["Delivery_Status"] == "≤15 days").sum())
-    gt_15 = int((df["Delivery_Status"] == ">15 days").sum())
-
-    total_considered = le_15 + gt_15
-
-    metrics = {
-        # Excel-aligned
-        "≤15_days": le_15,
-        ">15_days": gt_15,
-
-        # Flask dashboard expects these keys
-        "On_Time": le_15,
-        "Delayed": gt_15,
-
-        "On_Time_Pct": round(
-            (le_15 / total_considered) * 100,
-            2
-        ) if total_considered else 0
-    }
+    metrics = _metrics(
+        int((df["Delivery_Status"] == on_time_label).sum()),
+        int((df["Delivery_Status"] == delayed_label).sum()),
+        sla_days
+    )
 
     return metrics, df
@@ -1,5 +1,72 @@
+import numpy as np
 import pandas as pd
 
+from logic.vendor_scorecard import vendor_scorecard
+
+SLA_DAYS = 10   # keep configurable
+
+# Rolling scorecard windows (days up to the as-of date)
+WINDOWS = (30, 90, 365)
+
+# Lead-time percentiles reported per window
+LEAD_PERCENTILES = (50, 90)
+
+# Buckets are assigned on this window's on-time % and fill rate:
+# (bucket, min On_Time_Pct, min Fill_Rate), first match wins
+BUCKET_WINDOW = 90
+BUCKET_RULES = (
+    ("Excellent", 95, 98),
+    ("Good", 85, 90),
+    ("Average", 70, 0),
+)
+LOW_BUCKET = "Poor"
+INACTIVE_BUCKET = "Inactive"   # no deliveries in BUCKET_WINDOW
+
+# Module settings a result depends on (see logic.result_cache)
+PARAMS = (
+    "SLA_DAYS", "WINDOWS", "LEAD_PERCENTILES", "BUCKET_WINDOW", "BUCKET_RULES"
+)
+
+
+def assign_buckets(scorecard: pd.DataFrame):
+    """Performance bucket of every scorecard row (see BUCKET_RULES)."""
+
+    on_time = scorecard[f"On_Time_Pct_{BUCKET_WINDOW}"].to_numpy()
+    fill = scorecard[f"Fill_Rate_{BUCKET_WINDOW}"].fillna(0).to_numpy()
+
+    return np.select(
+        [scorecard[f"Deliveries_{BUCKET_WINDOW}"].to_numpy() == 0] + [
+            (on_time >= min_on_time) & (fill >= min_fill)
+            for _, min_on_time, min_fill in BUCKET_RULES
+        ],
+        [INACTIVE_BUCKET] + [bucket for bucket, _, _ in BUCKET_RULES],
+        default=LOW_BUCKET
+    )
+
+
+def score_vendors(events: pd.DataFrame, as_of=None, vendor_keys=None):
+    """
+    Rolling vendor scorecards (see logic.vendor_scorecard) bucketed by
+    BUCKET_RULES, for all vendors or the given vendor ids.
+    """
+
+    scorecard = vendor_scorecard(
+        events, as_of, SLA_DAYS, WINDOWS, LEAD_PERCENTILES, vendor_keys
+    )
+    scorecard["Bucket"] = assign_buckets(scorecard)
+
+    return scorecard
+
+
+def run_component3c_scorecard(events: pd.DataFrame, as_of=None):
+    """
+    Component 3C computed from the deliveries themselves: vendor
+    scorecards summarized exactly like an uploaded bucket list.
+    Expects the sorted delivery events of the PO facts.
+    """
+
+    return run_component3c(score_vendors(events, as_of))
+
 
 def run_component3c(df: pd.DataFrame):
     """
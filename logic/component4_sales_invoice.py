@@ -1,23 +1,40 @@
 import pandas as pd
 import numpy as np
 
+from logic.keys import dense_lookup, dense_max, domain_size
 
-def run_component4(
+# Columns read from each upload (see logic.ingest)
+INPUT_COLUMNS = {
+    "sales_order_file": [
+        "No.", "No", "Document No.", "Document Date", "Completely Shipped",
+        "Sell-to Customer No."
+    ],
+    "sales_invoice_file": ["Order No.", "Order No", "Posting Date"]
+}
+
+
+# Valid KT range of the O2C cycle, in days
+MAX_O2C_DAYS = 365
+
+# Percentiles reported next to the mean and median
+PERCENTILES = (90, 95, 99)
+
+# "Delivered within N days" shares
+WITHIN_DAYS = (7, 14, 30, 60)
+
+
+def o2c_cycles(
     df_so_raw: pd.DataFrame,
     df_inv_raw: pd.DataFrame
 ):
     """
-    Component 4 — Sales Order & Invoice (O2C Cycle)
-    Serverless-safe (Vercel compatible)
-    Logic preserved exactly
+    One row per dated sales order: SO_No, SO_Date, Completely_Shipped,
+    Customer, Invoice_Date (latest invoice) and O2C_Days.
+    Expects normalized frames with key codes (see logic.keys)
     """
 
-    # ---------------- COPY & CLEAN ----------------
-    df_so = df_so_raw.copy()
-    df_inv = df_inv_raw.copy()
-
-    df_so.columns = df_so.columns.str.strip()
-    df_inv.columns = df_inv.columns.str.strip()
+    df_so = df_so_raw
+    df_inv = df_inv_raw
 
     # ---------------- SALES ORDER ----------------
     # Detect SO number column
@@ -33,22 +50,21 @@ def run_component4(
         )
 
     df_so = df_so[
-        [so_col, "Document Date", "Completely Shipped"]
-    ].copy()
+        [so_col, "Document Date", "Completely Shipped", "SO_Key"]
+    ].assign(Customer=(
+        df_so["Sell-to Customer No."]
+        if "Sell-to Customer No." in df_so.columns
+        else np.nan
+    ))
 
     df_so.columns = [
         "SO_No",
         "SO_Date",
-        "Completely_Shipped"
+        "Completely_Shipped",
+        "SO_Key",
+        "Customer"
     ]
 
-    df_so["SO_No"] = (
-        df_so["SO_No"]
-        .astype(str)
-        .str.strip()
-        .str.upper()
-    )
-
     df_so["SO_Date"] = pd.to_datetime(
         df_so["SO_Date"],
         errors="coerce"
@@ -62,61 +78,34 @@ def run_component4(
 
     df_so = df_so.dropna(subset=["SO_Date"])
 
-    # ---------------- PART A: SHIPMENT COMPLETION ----------------
-    total_sos = len(df_so)
-    shipped_sos = int(df_so["Completely_Shipped"].sum())
-
-    shipment_pct = round(
-        (shipped_sos / total_sos) * 100,
-        2
-    ) if total_sos else 0
-
     # ---------------- INVOICE FILE ----------------
-    # Detect Order No column
-    if "Order No." in df_inv.columns:
-        inv_so_col = "Order No."
-    elif "Order No" in df_inv.columns:
-        inv_so_col = "Order No"
-    else:
+    # Invoices join on the SO_Key encoded from their Order No column
+    if not {"Order No.", "Order No"} & set(df_inv.columns):
         raise KeyError(
             f"Invoice Order No column not found. Found: {df_inv.columns.tolist()}"
         )
 
-    df_inv = df_inv[
-        [inv_so_col, "Posting Date"]
-    ].copy()
-
-    df_inv.columns = [
-        "SO_No",
-        "Invoice_Date"
-    ]
-
-    df_inv["SO_No"] = (
-        df_inv["SO_No"]
-        .astype(str)
-        .str.strip()
-        .str.upper()
-    )
+    inv_codes = df_inv["SO_Key"].to_numpy()
 
-    df_inv["Invoice_Date"] = pd.to_datetime(
-        df_inv["Invoice_Date"],
+    invoice_date = pd.to_datetime(
+        df_inv["Posting Date"],
         errors="coerce"
     )
 
-    df_inv = df_inv.dropna(subset=["Invoice_Date"])
-
     # ---------------- PART B: O2C CYCLE ----------------
-    latest_invoice = (
-        df_inv
-        .groupby("SO_No")["Invoice_Date"]
-        .max()
-        .reset_index()
+    # Latest invoice per SO (missing dates ignored), joined on SO_Key
+    so_codes = df_so["SO_Key"].to_numpy()
+
+    latest_invoice = dense_max(
+        inv_codes,
+        invoice_date,
+        domain_size(so_codes, inv_codes)
     )
 
-    df_main = df_so.merge(
-        latest_invoice,
-        on="SO_No",
-        how="left"
+    df_main = df_so.drop(columns="SO_Key").reset_index(drop=True)
+
+    df_main["Invoice_Date"] = dense_lookup(
+        latest_invoice, so_codes, np.datetime64("NaT")
     )
 
     df_main["O2C_Days"] = (
@@ -124,11 +113,36 @@ def run_component4(
         df_main["SO_Date"]
     ).dt.days
 
+    return df_main
+
+
+def run_component4(
+    df_so_raw: pd.DataFrame,
+    df_inv_raw: pd.DataFrame
+):
+    """
+    Component 4 — Sales Order & Invoice (O2C Cycle)
+    Serverless-safe (Vercel compatible)
+    Logic preserved exactly
+    Expects normalized frames with key codes (see logic.keys)
+    """
+
+    df_main = o2c_cycles(df_so_raw, df_inv_raw)
+
+    # ---------------- PART A: SHIPMENT COMPLETION ----------------
+    total_sos = len(df_main)
+    shipped_sos = int(df_main["Completely_Shipped"].sum())
+
+    shipment_pct = round(
+        (shipped_sos / total_sos) * 100,
+        2
+    ) if total_sos else 0
+
     # Valid KT range
     df_valid = df_main[
         (df_main["O2C_Days"] >= 0) &
-        (df_main["O2C_Days"] <= 365)
-    ].copy()
+        (df_main["O2C_Days"] <= MAX_O2C_DAYS)
+    ]
 
     # ---------------- METRICS ----------------
     avg_cycle = round(
@@ -141,21 +155,24 @@ def run_component4(
         2
     )
 
-    p95_cycle = round(
-        np.percentile(df_valid["O2C_Days"], 95),
-        2
-    ) if len(df_valid) else 0
-
     metrics = {
         "total_sos": int(total_sos),
         "shipment_pct": shipment_pct,
         "avg_cycle": avg_cycle,
         "median_cycle": median_cycle,
-        "pct_7": round((df_valid["O2C_Days"] <= 7).mean() * 100, 2),
-        "pct_14": round((df_valid["O2C_Days"] <= 14).mean() * 100, 2),
-        "pct_30": round((df_valid["O2C_Days"] <= 30).mean() * 100, 2),
-        "pct_60": round((df_valid["O2C_Days"] <= 60).mean() * 100, 2),
-        "p95_cycle": p95_cycle
+        **{
+            f"pct_{days}": round(
+                (df_valid["O2C_Days"] <= days).mean() * 100, 2
+            )
+            for days in WITHIN_DAYS
+        },
+        **{
+            f"p{q}_cycle": round(
+                np.percentile(df_valid["O2C_Days"], q),
+                2
+            ) if len(df_valid) else 0
+            for q in PERCENTILES
+        }
     }
 
     return metrics, df_valid
@@ -1,93 +1,29 @@
 import pandas as pd
 
+from logic.delivery_histogram import DeliveryHistogram
 
-def run_component5(
-    df_po: pd.DataFrame,
-    df_rcpt: pd.DataFrame,
-    df_lines: pd.DataFrame
-):
-    """
-    Component 5 — Purchase Order SLA (≤90 days vs >90 days)
-    Serverless-safe (Vercel compatible)
-    Logic preserved exactly
-    """
-
-    # ---------------- COPY & CLEAN ----------------
-    df_po = df_po.copy()
-    df_rcpt = df_rcpt.copy()
-    df_lines = df_lines.copy()
-
-    for df in [df_po, df_rcpt, df_lines]:
-        df.columns = df.columns.str.strip()
-
-    # ==================================================
-    # PURCHASE ORDER (MASTER)
-    # ==================================================
-    df_po = df_po.rename(columns={
-        "No.": "PO_No",
-        "Buy-from Vendor Name": "Vendor",
-        "Order Date": "Order_Date"
-    })
+SLA_DAYS = 90
 
-    df_po = df_po[["PO_No", "Vendor", "Order_Date"]]
+# Module settings a result depends on (see logic.result_cache)
+PARAMS = ("SLA_DAYS",)
 
-    df_po["PO_No"] = df_po["PO_No"].astype(str).str.strip().str.upper()
-    df_po["Order_Date"] = pd.to_datetime(
-        df_po["Order_Date"], errors="coerce"
-    )
 
+def _delivery_days(po_facts: pd.DataFrame):
     # ==================================================
-    # PURCHASE RECEIPT LINES
+    # PURCHASE ORDER + LAST RECEIPT + OUTSTANDING QTY
     # ==================================================
-    df_rcpt = df_rcpt.rename(columns={
-        "Order No.": "PO_No",
-        "Order No": "PO_No",
-        "Posting Date": "Posting_Date"
+    df = po_facts[[
+        "PO_No",
+        "Buy_From_Vendor_Key",
+        "Buy_From_Vendor",
+        "Order_Date",
+        "Last_Receipt_Date",
+        "Outstanding_Qty"
+    ]].rename(columns={
+        "Buy_From_Vendor_Key": "Vendor_Key",
+        "Buy_From_Vendor": "Vendor"
     })
 
-    df_rcpt["PO_No"] = df_rcpt["PO_No"].astype(str).str.strip().str.upper()
-    df_rcpt["Posting_Date"] = pd.to_datetime(
-        df_rcpt["Posting_Date"], errors="coerce"
-    )
-
-    last_receipt = (
-        df_rcpt
-        .groupby("PO_No", as_index=False)["Posting_Date"]
-        .max()
-        .rename(columns={"Posting_Date": "Last_Receipt_Date"})
-    )
-
-    # ==================================================
-    # PURCHASE LINES
-    # ==================================================
-    df_lines = df_lines.rename(columns={
-        "Document No.": "PO_No",
-        "Document No": "PO_No",
-        "Outstanding Quantity": "Outstanding_Qty"
-    })
-
-    df_lines["PO_No"] = df_lines["PO_No"].astype(str).str.strip().str.upper()
-    df_lines["Outstanding_Qty"] = pd.to_numeric(
-        df_lines["Outstanding_Qty"], errors="coerce"
-    ).fillna(0)
-
-    outstanding = (
-        df_lines
-        .groupby("PO_No", as_index=False)["Outstanding_Qty"]
-        .sum()
-    )
-
-    # ==================================================
-    # MERGE ALL
-    # ==================================================
-    df = (
-        df_po
-        .merge(last_receipt, on="PO_No", how="left")
-        .merge(outstanding, on="PO_No", how="left")
-    )
-
-    df["Outstanding_Qty"] = df["Outstanding_Qty"].fillna(0)
-
     # ==================================================
     # COMPLETION STATUS
     # ==================================================
@@ -108,30 +44,39 @@ def run_component5(
         df["Last_Receipt_Date"] - df["Order_Date"]
     ).dt.days
 
-    # ==================================================
-    # SLA BUCKET (EXACT LOGIC)
-    # ==================================================
-    df["SLA_Bucket"] = df["Days_To_Receive"].apply(
-        lambda x: "≤ 90 Days" if x <= 90 else "> 90 Days"
-    )
+    return df
 
+
+def _month(df):
     # ==================================================
     # MONTH (FOR TREND CHARTS)
     # ==================================================
-    df["Month"] = (
+    return (
         df["Last_Receipt_Date"]
         .dt.to_period("M")
         .astype(str)
     )
 
-    # ==================================================
-    # METRICS
-    # ==================================================
-    total_pos = int(len(df))
-    within_sla = int((df["SLA_Bucket"] == "≤ 90 Days").sum())
-    beyond_sla = int((df["SLA_Bucket"] == "> 90 Days").sum())
 
-    metrics = {
+def delivery_histogram(po_facts: pd.DataFrame):
+    """
+    Days to receive of the completed POs per vendor and last receipt
+    month (see logic.delivery_histogram).
+    """
+
+    df = _delivery_days(po_facts)
+
+    return DeliveryHistogram(pd.DataFrame({
+        "Vendor_Key": df["Vendor_Key"],
+        "Month": _month(df),
+        "Days": df["Days_To_Receive"],
+    }))
+
+
+def _metrics(within_sla, beyond_sla):
+    total_pos = within_sla + beyond_sla
+
+    return {
         "Total_POs": total_pos,
         "Within_SLA": within_sla,
         "Beyond_SLA": beyond_sla,
@@ -141,4 +86,43 @@ def run_component5(
         ) if total_pos else 0
     }
 
+
+def summarize_sla(histogram, sla_days=SLA_DAYS):
+    """Component 5 metrics at `sla_days`."""
+
+    overall = histogram.counts(sla_days, by=())
+
+    return _metrics(int(overall["On_Time"].sum()), int(overall["Late"].sum()))
+
+
+def run_component5(po_facts: pd.DataFrame, sla_days=SLA_DAYS):
+    """
+    Component 5 — Purchase Order SLA (≤90 days vs >90 days)
+    Serverless-safe (Vercel compatible)
+    Logic preserved exactly
+    Expects the purchase-order facts table (see logic.po_facts)
+    """
+
+    df = _delivery_days(po_facts)
+
+    # ==================================================
+    # SLA BUCKET (EXACT LOGIC)
+    # ==================================================
+    within_label = f"≤ {sla_days} Days"
+    beyond_label = f"> {sla_days} Days"
+
+    df["SLA_Bucket"] = df["Days_To_Receive"].apply(
+        lambda x: within_label if x <= sla_days else beyond_label
+    )
+
+    df["Month"] = _month(df)
+
+    # ==================================================
+    # METRICS
+    # ==================================================
+    metrics = _metrics(
+        int((df["SLA_Bucket"] == within_label).sum()),
+        int((df["SLA_Bucket"] == beyond_label).sum())
+    )
+
     return metrics, df
@@ -1,129 +1,45 @@
 import pandas as pd
 
-SLA_DAYS = 10   # Change if SLA differs
-
-
-def run_component5a_rm(
-    df_items: pd.DataFrame,
-    df_po: pd.DataFrame,
-    df_receipts: pd.DataFrame,
-    df_lines: pd.DataFrame
-):
-    """
-    Component 5A — RM Purchase Order SLA
-    Serverless-safe (Vercel compatible)
-    Logic preserved exactly
-    """
-
-    # ==================================================
-    # COPY & CLEAN
-    # ==================================================
-    df_items = df_items.copy()
-    df_po = df_po.copy()
-    df_receipts = df_receipts.copy()
-    df_lines = df_lines.copy()
-
-    for df in [df_items, df_po, df_receipts, df_lines]:
-        df.columns = df.columns.str.strip()
+from logic.delivery_histogram import DeliveryHistogram
+from logic.po_facts import GROUP_PREFIX, in_groups, posting_groups
 
-    # ==================================================
-    # 1. GET TRUE RM ITEM CODES
-    # ==================================================
-    df_items = df_items.rename(columns={
-        "No.": "Item_No",
-        "Inventory Posting Group": "Posting_Group"
-    })
-
-    rm_items = (
-        df_items[df_items["Posting_Group"] == "RM"]["Item_No"]
-        .astype(str)
-        .str.strip()
-        .unique()
-    )
-
-    rm_items_set = set(rm_items)
-
-    # ==================================================
-    # 2. FIND POs THAT CONTAIN AT LEAST ONE RM ITEM
-    # ==================================================
-    df_lines = df_lines.rename(columns={
-        "Document No.": "PO_No",
-        "No.": "Item_No",
-        "Outstanding Quantity": "Outstanding_Qty"
-    })
-
-    df_lines["PO_No"] = df_lines["PO_No"].astype(str).str.strip()
-    df_lines["Item_No"] = df_lines["Item_No"].astype(str).str.strip()
-    df_lines["Outstanding_Qty"] = pd.to_numeric(
-        df_lines["Outstanding_Qty"], errors="coerce"
-    ).fillna(0)
-
-    rm_po_list = (
-        df_lines[df_lines["Item_No"].isin(rm_items_set)]["PO_No"]
-        .unique()
-        .tolist()
-    )
-
-    # ==================================================
-    # 3. PURCHASE ORDER MASTER (RM ONLY)
-    # ==================================================
-    df_po = df_po.rename(columns={
-        "No.": "PO_No",
-        "Buy-from Vendor Name": "Vendor",
-        "Order Date": "Order_Date",
-        "Last Receiving No.": "Last_Receiving_No"
-    })
-
-    df_po["PO_No"] = df_po["PO_No"].astype(str).str.strip()
-    df_po["Last_Receiving_No"] = df_po["Last_Receiving_No"].astype(str).str.strip()
-    df_po["Order_Date"] = pd.to_datetime(
-        df_po["Order_Date"], errors="coerce"
-    )
+SLA_DAYS = 10   # Change if SLA differs
 
-    # 🔴 FILTER TO RM POs ONLY
-    df_po = df_po[df_po["PO_No"].isin(rm_po_list)]
+# Inventory Posting Groups measured by default (any combination can be
+# selected from the same histogram)
+POSTING_GROUPS = ("RM",)
 
-    # ==================================================
-    # 4. COMPLETION CHECK (Outstanding Qty == 0)
-    # ==================================================
-    po_completion = (
-        df_lines
-        .groupby("PO_No", as_index=False)["Outstanding_Qty"]
-        .sum()
-    )
+# Module settings a result depends on (see logic.result_cache)
+PARAMS = ("SLA_DAYS",)
 
-    completed_pos = po_completion[
-        po_completion["Outstanding_Qty"] == 0
-    ]["PO_No"]
 
-    df_po = df_po[df_po["PO_No"].isin(completed_pos)]
+def delivery_histogram(po_facts: pd.DataFrame):
+    """
+    Days to receive of the completed POs per vendor, order month and
+    posting-group flags (see logic.delivery_histogram); summarize_sla
+    selects the groups.
+    """
 
     # ==================================================
-    # 5. RECEIPT DATE
+    # 1-5. COMPLETED POs CONTAINING AT LEAST ONE GROUP ITEM
     # ==================================================
-    df_receipts = df_receipts.rename(columns={
-        "No.": "Receipt_No",
-        "Posting Date": "Posting_Date"
-    })
-
-    df_receipts["Receipt_No"] = (
-        df_receipts["Receipt_No"]
-        .astype(str)
-        .str.strip()
-    )
-
-    df_receipts["Posting_Date"] = pd.to_datetime(
-        df_receipts["Posting_Date"], errors="coerce"
-    )
+    groups = posting_groups(po_facts)
+    df_po = po_facts[
+        in_groups(po_facts, groups) & po_facts["Completed"].to_numpy()
+    ]
 
-    receipt_map = dict(
-        zip(df_receipts["Receipt_No"], df_receipts["Posting_Date"])
+    df_po = df_po[[
+        "PO_No",
+        "Buy_From_Vendor_Key",
+        "Order_Date",
+        "Last_Receiving_No",
+        "Receipt_Date"
+    ] + [f"{GROUP_PREFIX}{group}" for group in groups]].rename(
+        columns={"Buy_From_Vendor_Key": "Vendor_Key"}
     )
 
-    df_po["Receipt_Date"] = df_po["Last_Receiving_No"].map(receipt_map)
-
     # ==================================================
-    # 6. DELIVERY DAYS & SLA
+    # 6. DELIVERY DAYS
     # ==================================================
     df_po = df_po.dropna(subset=["Order_Date", "Receipt_Date"])
 
@@ -133,34 +49,66 @@ def run_component5a_rm(
 
     df_po = df_po[df_po["Days_To_Receive"] >= 0]
 
-    df_po["SLA_Status"] = df_po["Days_To_Receive"].apply(
-        lambda x: "On-Time" if x <= SLA_DAYS else "Late"
-    )
-
     # ==================================================
     # 7. MONTH EXTRACTION
     # ==================================================
-    df_po["Month"] = (
-        df_po["Order_Date"]
-        .dt.to_period("M")
-        .astype(str)
-    )
+    return DeliveryHistogram(pd.DataFrame({
+        "Vendor_Key": df_po["Vendor_Key"],
+        "Month": df_po["Order_Date"].dt.to_period("M").astype(str),
+        "Days": df_po["Days_To_Receive"],
+        **{
+            f"{GROUP_PREFIX}{group}": df_po[f"{GROUP_PREFIX}{group}"]
+            for group in groups
+        },
+    }))
+
+
+def run_component5a_rm(
+    po_facts: pd.DataFrame,
+    sla_days=SLA_DAYS,
+    groups=POSTING_GROUPS
+):
+    """
+    Component 5A — RM Purchase Order SLA
+    Serverless-safe (Vercel compatible)
+    Logic preserved exactly
+    Expects the purchase-order facts table (see logic.po_facts)
+    """
+
+    return summarize_sla(delivery_histogram(po_facts), sla_days, groups)
+
+
+def summarize_sla(histogram, sla_days=SLA_DAYS, groups=POSTING_GROUPS):
+    """
+    Component 5A metrics and monthly On-Time / Late counts at `sla_days`,
+    over the POs with an item of any of the posting `groups`.
+    """
+
+    histogram = histogram.select(in_groups(histogram.cells, groups))
 
     # ==================================================
     # 8. MONTHLY SUMMARY
     # ==================================================
     df_monthly = (
-        df_po
-        .groupby(["Month", "SLA_Status"])
-        .size()
-        .reset_index(name="PO_Count")
+        histogram.counts(sla_days, by=("Month",))
+        .rename(columns={"On_Time": "On-Time"})
+        .melt(
+            id_vars="Month",
+            value_vars=["Late", "On-Time"],
+            var_name="SLA_Status",
+            value_name="PO_Count"
+        )
+        .query("PO_Count > 0")
+        .sort_values(["Month", "SLA_Status"])
+        .reset_index(drop=True)
     )
 
     # ==================================================
     # 9. METRICS
     # ==================================================
-    total_pos = int(len(df_po))
-    on_time_pos = int((df_po["SLA_Status"] == "On-Time").sum())
+    overall = histogram.counts(sla_days, by=())
+    total_pos = int(overall["Total"].sum())
+    on_time_pos = int(overall["On_Time"].sum())
 
     metrics = {
         "Total_RM_POs": total_pos,
@@ -1,27 +1,44 @@
+import numpy as np
 import pandas as pd
 
+# Columns read from each upload (see logic.ingest)
+INPUT_COLUMNS = {
+    "sales_order_file": [
+        "No.", "Document Date", "Completely Shipped", "Short Closed",
+        "Sell-to Customer No.", "Location Code", "Salesperson Code"
+    ]
+}
 
-def run_component6(df: pd.DataFrame):
+# Optional Sales Order columns the orders are broken down by
+DIMENSION_COLUMNS = {
+    "Customer": "Sell-to Customer No.",
+    "Location": "Location Code",
+    "Salesperson": "Salesperson Code",
+}
+
+
+def non_shipped_orders(df: pd.DataFrame):
     """
-    Component 6 — Short-Closed Sales Orders
-    Serverless-safe (Vercel compatible)
-    Logic preserved exactly
+    Dated, numbered, not completely shipped sales orders: SO_No,
+    Document_Date, Short_Closed (bool), Month and the DIMENSION_COLUMNS
+    (NaN if absent).
+    Expects the normalized Sales Order frame (see logic.normalize)
     """
 
-    # ---------------- COPY & CLEAN ----------------
-    df = df.copy()
-    df.columns = df.columns.str.strip()
-
     # ---------------- RENAME (SAFE) ----------------
-    df = df.rename(columns={
+    df = df[["No.", "Document Date", "Completely Shipped", "Short Closed"]].rename(columns={
         "No.": "SO_No",
         "Document Date": "Document_Date",
         "Completely Shipped": "Completely_Shipped",
         "Short Closed": "Short_Closed"
+    }).assign(**{
+        dimension: df[column] if column in df.columns else np.nan
+        for dimension, column in DIMENSION_COLUMNS.items()
     })
 
     # ---------------- FILTER NON-SHIPPED ----------------
-    df = df[df["Completely_Shipped"] == False]
+    # Rows without an order number (blank / total lines) are not orders
+    df = df[(df["Completely_Shipped"] == False) & df["SO_No"].notna()]
 
     # ---------------- DATE CLEANING ----------------
     df["Document_Date"] = pd.to_datetime(
@@ -30,6 +47,8 @@ def run_component6(df: pd.DataFrame):
 
     df = df.dropna(subset=["Document_Date"])
 
+    df["Short_Closed"] = df["Short_Closed"] == True
+
     # ---------------- MONTH EXTRACTION ----------------
     df["Month"] = (
         df["Document_Date"]
@@ -37,12 +56,37 @@ def run_component6(df: pd.DataFrame):
         .astype(str)
     )
 
+    return df
+
+
+def short_closure_metrics(total_non_shipped, total_short_closed):
+    return {
+        "Total_Non_Shipped": total_non_shipped,
+        "Short_Closed": total_short_closed,
+        "Not_Short_Closed": total_non_shipped - total_short_closed,
+        "Short_Closed_Pct": round(
+            (total_short_closed / total_non_shipped) * 100,
+            2
+        ) if total_non_shipped else 0
+    }
+
+
+def run_component6(df: pd.DataFrame):
+    """
+    Component 6 — Short-Closed Sales Orders
+    Serverless-safe (Vercel compatible)
+    Logic preserved exactly
+    Expects the normalized Sales Order frame (see logic.normalize)
+    """
+
+    df = non_shipped_orders(df)
+
     # ---------------- MONTHLY METRICS ----------------
     monthly = (
         df.groupby("Month")
         .agg(
             Total_Non_Shipped=("SO_No", "count"),
-            Short_Closed=("Short_Closed", lambda x: (x == True).sum())
+            Short_Closed=("Short_Closed", "sum")
         )
         .reset_index()
     )
@@ -53,19 +97,8 @@ def run_component6(df: pd.DataFrame):
     )
 
     # ---------------- OVERALL METRICS ----------------
-    total_non_shipped = int(len(df))
-    total_short_closed = int(
-        (df["Short_Closed"] == True).sum()
+    metrics = short_closure_metrics(
+        int(len(df)), int(df["Short_Closed"].sum())
     )
 
-    metrics = {
-        "Total_Non_Shipped": total_non_shipped,
-        "Short_Closed": total_short_closed,
-        "Not_Short_Closed": total_non_shipped - total_short_closed,
-        "Short_Closed_Pct": round(
-            (total_short_closed / total_non_shipped) * 100,
-            2
-        ) if total_non_shipped else 0
-    }
-
     return metrics, monthly
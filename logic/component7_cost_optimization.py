@@ -1,5 +1,113 @@
+import json
+import os
+
+import numpy as np
 import pandas as pd
 
+from logic.keys import dense_lookup, dense_table, domain_size
+
+RED_MAX_QTY = 50000      # ≤ → RED
+YELLOW_MAX_QTY = 200000  # ≤ → YELLOW, above → GREEN
+
+
+def parse_thresholds(text, source="CONA_STOCK_THRESHOLDS"):
+    """
+    Per-group limits from JSON `text` ({"group": [RED max, YELLOW max]}),
+    validated: non-blank group names, two numbers each, RED ≤ YELLOW.
+    ValueError naming `source` and the bad entry otherwise.
+    """
+
+    try:
+        groups = json.loads(text)
+    except ValueError as error:
+        raise ValueError(f"{source} is not valid JSON: {error}") from None
+
+    if not isinstance(groups, dict):
+        raise ValueError(
+            f'{source} must be an object: {{"group": [RED max, YELLOW max]}}'
+        )
+
+    thresholds = {}
+    for group, limits in groups.items():
+        if not group.strip():
+            raise ValueError(f"{source}: blank posting group name")
+
+        if (
+            not isinstance(limits, list) or len(limits) != 2
+            or not all(
+                isinstance(limit, (int, float)) and not isinstance(limit, bool)
+                and np.isfinite(limit)
+                for limit in limits
+            )
+        ):
+            raise ValueError(
+                f"{source}[{group!r}]: expected [RED max, YELLOW max] "
+                f"numbers, got {limits!r}"
+            )
+
+        if limits[0] > limits[1]:
+            raise ValueError(
+                f"{source}[{group!r}]: RED max {limits[0]} is above "
+                f"YELLOW max {limits[1]}"
+            )
+
+        thresholds[group] = tuple(limits)
+
+    return thresholds
+
+
+# Per Gen. Prod. Posting Group overrides: group → (RED max, YELLOW max),
+# e.g. CONA_STOCK_THRESHOLDS='{"PKG": [10000, 40000]}'. Other groups use
+# RED_MAX_QTY / YELLOW_MAX_QTY. Checked at import (see parse_thresholds).
+GROUP_THRESHOLDS = parse_thresholds(
+    os.environ.get("CONA_STOCK_THRESHOLDS", "{}")
+)
+
+# Module settings a result depends on (see logic.result_cache)
+PARAMS = ("RED_MAX_QTY", "YELLOW_MAX_QTY", "GROUP_THRESHOLDS")
+
+# Stock_Status categories (alphabetical, as the grouped views sort them)
+STOCK_STATUSES = ["GREEN", "RED", "YELLOW"]
+
+# Columns read from each upload (see logic.ingest)
+INPUT_COLUMNS = {
+    "items_file": ["No.", "Gen. Prod. Posting Group"],
+    "ledger_file": ["Item No.", "Remaining Quantity", "Location Code"]
+}
+
+
+def stock_status(qty, product_group, thresholds=None):
+    """
+    RED / YELLOW / GREEN per row of `qty`, with the thresholds of each
+    row's `product_group` (categorical). Vectorized: the limits are
+    looked up per group code, then compared once per row.
+    """
+
+    thresholds = GROUP_THRESHOLDS if thresholds is None else thresholds
+    groups = product_group.cat.categories
+
+    # Group code → limits; code -1 (no group) is the last row
+    default = (RED_MAX_QTY, YELLOW_MAX_QTY)
+    red_max, yellow_max = np.array(
+        [thresholds.get(group, default) for group in groups] + [default],
+        dtype=np.float64
+    ).T
+
+    codes = product_group.cat.codes.to_numpy()
+    qty = np.asarray(qty)
+
+    status = np.where(
+        qty <= red_max[codes],
+        STOCK_STATUSES.index("RED"),
+        np.where(
+            qty <= yellow_max[codes],
+            STOCK_STATUSES.index("YELLOW"),
+            STOCK_STATUSES.index("GREEN")
+        )
+    )
+
+    return pd.Categorical.from_codes(status, categories=STOCK_STATUSES)
+
 
 def run_component7(
     df_item: pd.DataFrame,
@@ -9,22 +117,13 @@ def run_component7(
     Component 7 — Cost Optimization / Stock Health
     Serverless-safe (Vercel compatible)
     Logic preserved exactly
+    Expects normalized frames with key codes (see logic.keys)
     """
 
-    # ---------- COPY & CLEAN ----------
-    df_item = df_item.copy()
-    df_ledger = df_ledger.copy()
-
-    df_item.columns = df_item.columns.str.strip()
-    df_ledger.columns = df_ledger.columns.str.strip()
-
     # ---------- RENAME ----------
-    df_item = df_item.rename(columns={
-        "No.": "Item_No",
-        "Gen. Prod. Posting Group": "Product_Group"
-    })
-
-    df_ledger = df_ledger.rename(columns={
+    df_ledger = df_ledger[[
+        "Item No.", "Remaining Quantity", "Location Code", "Item_Key"
+    ]].rename(columns={
         "Item No.": "Item_No",
         "Remaining Quantity": "Remaining_Qty"
     })
@@ -37,29 +136,36 @@ def run_component7(
 
     df_ledger = df_ledger[df_ledger["Remaining_Qty"] > 0]
 
-    # ---------- MERGE ----------
-    df = df_ledger.merge(
-        df_item[["Item_No", "Product_Group"]],
-        on="Item_No",
-        how="left"
+    # ---------- PRODUCT GROUP (ITEM_KEY LOOKUP) ----------
+    item_codes = df_item["Item_Key"].to_numpy()
+    ledger_codes = df_ledger["Item_Key"].to_numpy()
+    product_group = df_item["Gen. Prod. Posting Group"].astype("category")
+
+    group_codes = dense_table(
+        item_codes,
+        product_group.cat.codes.to_numpy(),
+        domain_size(item_codes, ledger_codes),
+        -1
     )
 
-    # ---------- STOCK BUCKET (UNCHANGED LOGIC) ----------
-    def stock_bucket(qty):
-        if qty <= 50000:
-            return "RED"
-        elif qty <= 200000:
-            return "YELLOW"
-        else:
-            return "GREEN"
+    df = df_ledger.drop(columns="Item_Key").reset_index(drop=True)
+
+    df["Product_Group"] = pd.Categorical.from_codes(
+        dense_lookup(group_codes, ledger_codes, -1),
+        dtype=product_group.dtype
+    )
 
-    df["Stock_Status"] = df["Remaining_Qty"].apply(stock_bucket)
+    # ---------- STOCK BUCKET (PER PRODUCT GROUP) ----------
+    df["Stock_Status"] = stock_status(
+        df["Remaining_Qty"].to_numpy(), df["Product_Group"]
+    )
 
     # ---------- LOCATION LEVEL ----------
     location_view = (
         df.groupby(
             ["Item_No", "Location Code", "Stock_Status"],
-            as_index=False
+            as_index=False,
+            observed=True
         )
         .agg(Total_Qty=("Remaining_Qty", "sum"))
     )
@@ -68,7 +174,8 @@ def run_component7(
     company_view = (
         df.groupby(
             ["Item_No", "Stock_Status"],
-            as_index=False
+            as_index=False,
+            observed=True
         )
         .agg(Total_Qty=("Remaining_Qty", "sum"))
     )
@@ -0,0 +1,245 @@
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = os.environ.get(
+    "CONA_DATA_DIR",
+    os.path.join(tempfile.gettempdir(), "cona_datasets")
+)
+
+# Unreferenced objects are kept this many seconds after their last ref
+# moved away, so requests still reading an older version can finish
+GC_GRACE = int(os.environ.get("CONA_GC_GRACE", 3600))
+
+
+class DatasetStore:
+    """
+    Local columnar store for uploaded frames.
+
+    Each dataset is written once as one .npy file per column and read back
+    with np.load(mmap_mode="r"), so every worker process shares the same
+    page cache instead of unpickling its own copy.
+
+    Layout:
+        <root>/objects/<key>/meta.json     column layout + user meta
+        <root>/objects/<key>/<n>.npy       values (or category codes)
+        <root>/refs/<name>                 key the name currently points to
+
+    Objects are immutable, so several names may point at the same key
+    (e.g. a content hash shared by every KPI that reads the same file).
+    Objects no name points to any more are removed by collect().
+
+    Strings and categoricals are dictionary-encoded: integer codes are
+    memory-mapped, the (small) dictionary is pickled alongside.
+    """
+
+    def __init__(self, root=DATA_DIR):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.refs_dir = os.path.join(root, "refs")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.refs_dir, exist_ok=True)
+
+    # ---------------- WRITE ----------------
+    def put(self, name, df, meta=None, key=None):
+        """
+        Store `df` under `name`; returns its key.
+        Pass a content-derived `key` to make identical uploads share one
+        object; a random key is used otherwise.
+        """
+
+        key = key or uuid.uuid4().hex
+        if not self.has_object(key):
+            self._write_object(key, df, meta)
+        self._write_ref(name, key)
+        return key
+
+    def link(self, name, key):
+        """Point `name` at an existing object."""
+
+        if not self.has_object(key):
+            raise KeyError(f"Unknown dataset object: {key}")
+        self._write_ref(name, key)
+        return key
+
+    def _write_object(self, key, df, meta=None):
+        final = os.path.join(self.objects_dir, key)
+        tmp = os.path.join(self.objects_dir, f".tmp-{uuid.uuid4().hex}")
+        os.makedirs(tmp)
+
+        columns = []
+        for i, (name, col) in enumerate(df.items()):
+            columns.append(_write_column(tmp, str(i), name, col))
+
+        with open(os.path.join(tmp, "meta.json"), "w") as fh:
+            json.dump({
+                "rows": int(len(df)),
+                "columns": columns,
+                "meta": meta or {},
+            }, fh)
+
+        try:
+            os.replace(tmp, final)
+        except OSError:
+            # Another worker published the same key first
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def _write_ref(self, name, key):
+        previous = self.version(name)
+
+        path = os.path.join(self.refs_dir, name)
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, "w") as fh:
+            fh.write(key)
+        os.replace(tmp, path)
+
+        # The grace period of the object left behind starts now
+        if previous and previous != key:
+            try:
+                os.utime(os.path.join(self.objects_dir, previous))
+            except FileNotFoundError:
+                pass
+
+    # ---------------- CLEANUP ----------------
+    def collect(self, keep=(), grace=GC_GRACE):
+        """
+        Remove objects no ref points to and not in `keep`, untouched for
+        `grace` seconds (abandoned partial writes included); returns the
+        removed keys.
+        """
+
+        live = set(keep)
+        for name in os.listdir(self.refs_dir):
+            if not name.endswith(".tmp"):
+                live.add(self.version(name))
+
+        cutoff = time.time() - grace
+        removed = []
+        for key in os.listdir(self.objects_dir):
+            path = os.path.join(self.objects_dir, key)
+            if key in live:
+                continue
+            try:
+                if os.path.getmtime(path) > cutoff:
+                    continue
+            except FileNotFoundError:
+                continue
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(key)
+
+        return removed
+
+    # ---------------- READ ----------------
+    def version(self, name):
+        """Key `name` currently points to, or None."""
+
+        try:
+            with open(os.path.join(self.refs_dir, name)) as fh:
+                return fh.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def has(self, name):
+        return self.version(name) is not None
+
+    def has_object(self, key):
+        return os.path.exists(os.path.join(self.objects_dir, key, "meta.json"))
+
+    def meta(self, name):
+        key = self.version(name)
+        if key is None:
+            return None
+        layout = self._read_meta(key)
+        return {**layout["meta"], "rows": layout["rows"]}
+
+    def get(self, name):
+        """Memory-mapped DataFrame stored under `name`, or None."""
+
+        key = self.version(name)
+        if key is None:
+            return None
+
+        return self.get_object(key)
+
+    def get_object(self, key):
+        """Memory-mapped DataFrame stored as object `key`."""
+
+        path = os.path.join(self.objects_dir, key)
+        layout = self._read_meta(key)
+
+        data = {
+            col["name"]: _read_column(path, col)
+            for col in layout["columns"]
+        }
+
+        return pd.DataFrame(data, copy=False)
+
+    def _read_meta(self, key):
+        with open(os.path.join(self.objects_dir, key, "meta.json")) as fh:
+            return json.load(fh)
+
+
+# --------------------------------------------------
+# COLUMN ENCODING
+# --------------------------------------------------
+def _write_column(path, stem, name, col):
+    dtype = col.dtype
+
+    if isinstance(dtype, pd.CategoricalDtype):
+        np.save(os.path.join(path, f"{stem}.npy"), col.array.codes)
+        with open(os.path.join(path, f"{stem}.dict"), "wb") as fh:
+            pickle.dump(dtype, fh)
+        return {"name": name, "file": stem, "kind": "category"}
+
+    if dtype.kind in "biufM" and isinstance(dtype, np.dtype):
+        np.save(os.path.join(path, f"{stem}.npy"), col.to_numpy())
+        return {"name": name, "file": stem, "kind": "array"}
+
+    if dtype == object or pd.api.types.is_string_dtype(dtype):
+        codes, uniques = pd.factorize(col)
+        np.save(os.path.join(path, f"{stem}.npy"), codes.astype(np.int32))
+        with open(os.path.join(path, f"{stem}.dict"), "wb") as fh:
+            pickle.dump(uniques, fh)
+        return {"name": name, "file": stem, "kind": "dictionary"}
+
+    # Anything else (tz-aware, nullable extension types) is rare here
+    with open(os.path.join(path, f"{stem}.pkl"), "wb") as fh:
+        pickle.dump(col.array, fh)
+    return {"name": name, "file": stem, "kind": "pickle"}
+
+
+def _load_mapped(path):
+    # Plain ndarray view over the mapping, so np.memmap never leaks into pandas
+    return np.load(path, mmap_mode="r").view(np.ndarray)
+
+
+def _read_column(path, col):
+    stem = os.path.join(path, col["file"])
+    kind = col["kind"]
+
+    if kind == "array":
+        return _load_mapped(f"{stem}.npy")
+
+    if kind == "pickle":
+        with open(f"{stem}.pkl", "rb") as fh:
+            return pickle.load(fh)
+
+    codes = _load_mapped(f"{stem}.npy")
+    with open(f"{stem}.dict", "rb") as fh:
+        dictionary = pickle.load(fh)
+
+    if kind == "category":
+        return pd.Series(
+            pd.Categorical.from_codes(codes, dtype=dictionary, validate=False),
+            copy=False
+        )
+
+    # Strings are materialized; only the codes are shared
+    return dictionary.take(codes, allow_fill=True, fill_value=np.nan)
@@ -0,0 +1,139 @@
+import copy
+import os
+
+import numpy as np
+import pandas as pd
+
+# Largest SLA threshold that can be queried; deliveries slower than this
+# share one overflow bin
+MAX_SLA_DAYS = int(os.environ.get("CONA_MAX_SLA_DAYS", 365))
+
+# Cell columns every histogram has; extra columns of the input frame
+# (e.g. posting-group flags) become further cell dimensions
+CELLS = ["Vendor_Key", "Month"]
+
+
+class DeliveryHistogram:
+    """
+    Delivery-days distribution per (vendor id, Month) as cumulative counts:
+    on_time[cell, s] = deliveries of the cell taking ≤ s days.
+
+    Built once from the POs a KPI measures; the on-time count for any SLA
+    threshold is then a column lookup, and a whole threshold curve one
+    slice, without touching the POs again.
+    """
+
+    def __init__(self, df: pd.DataFrame, max_days=MAX_SLA_DAYS, vendors=None):
+        """
+        `df` has one row per measured PO with Vendor_Key, Month, Days and
+        any extra cell columns. Negative days count as within every SLA
+        (bin 0). `vendors` (Vendor_Key → name, see logic.vendors) names
+        the vendors in counts().
+        """
+
+        df = df.dropna(subset=["Days"])
+        days = df["Days"].to_numpy(dtype=np.int64)
+
+        self.max_days = max_days
+        self.vendors = vendors
+        self.width = int(min(days.max(initial=0), max_days)) + 1
+
+        cells = df.groupby(
+            [col for col in df.columns if col != "Days"],
+            observed=True, sort=True, dropna=False
+        )
+        cell = cells.ngroup().to_numpy()
+        self.cells = cells.size().index.to_frame(index=False)
+
+        # Bins 0 … width-1 days, then one bin for slower than max_days
+        bins = np.where(days > max_days, self.width, np.clip(days, 0, None))
+        counts = np.bincount(
+            cell * (self.width + 1) + bins,
+            minlength=len(self.cells) * (self.width + 1)
+        ).reshape(len(self.cells), self.width + 1)
+
+        self.on_time = counts.cumsum(axis=1)
+        self._rollups = {}
+
+    def select(self, keep):
+        """Histogram of the cells where boolean array (or slice) `keep` holds."""
+
+        selected = copy.copy(self)
+        selected.cells = self.cells[keep].reset_index(drop=True)
+        selected.on_time = self.on_time[keep]
+        selected._rollups = {}
+        return selected
+
+    def vendor(self, vendor_key):
+        """
+        Histogram of one vendor id's cells. Cells are sorted by Vendor_Key
+        first, so they are one run found by binary search.
+        """
+
+        vendor_keys = self.cells["Vendor_Key"].to_numpy()
+        start, end = np.searchsorted(vendor_keys, [vendor_key, vendor_key + 1])
+        return self.select(slice(start, end))
+
+    def _column(self, sla_days):
+        if not 0 <= sla_days <= self.max_days:
+            raise ValueError(
+                f"SLA must be between 0 and {self.max_days} days: {sla_days}"
+            )
+        return min(sla_days, self.width - 1)
+
+    def _rollup(self, by):
+        # Cumulative counts summed over cells sharing the `by` columns
+        if by not in self._rollups:
+            if by:
+                groups = self.cells.groupby(
+                    list(by), observed=True, sort=True, dropna=False
+                )
+                codes = groups.ngroup().to_numpy()
+                labels = groups.size().index.to_frame(index=False)
+            else:
+                codes = np.zeros(len(self.cells), dtype=np.int64)
+                labels = pd.DataFrame(index=[0])
+
+            on_time = np.zeros((len(labels), self.width + 1), dtype=np.int64)
+            np.add.at(on_time, codes, self.on_time)
+            self._rollups[by] = (labels, on_time)
+
+        return self._rollups[by]
+
+    def counts(self, sla_days, by=("Vendor_Key",)):
+        """
+        Total / On_Time / Late deliveries per `by` columns (a tuple of
+        Vendor_Key and/or Month; () for the overall row) at `sla_days`.
+        Per-vendor counts are named (Vendor) when the histogram has names.
+        """
+
+        labels, on_time = self._rollup(tuple(by))
+        column = self._column(sla_days)
+
+        counts = labels.copy()
+        if "Vendor_Key" in by and self.vendors is not None:
+            counts["Vendor"] = self.vendors.reindex(
+                counts["Vendor_Key"]
+            ).to_numpy()
+        counts["Total"] = on_time[:, -1]
+        counts["On_Time"] = on_time[:, column]
+        counts["Late"] = counts["Total"] - counts["On_Time"]
+        return counts
+
+    def curve(self, thresholds=None):
+        """Overall On_Time_Pct at every SLA threshold (default 0 … slowest)."""
+
+        if thresholds is None:
+            thresholds = range(self.width)
+
+        _, on_time = self._rollup(())
+        total = on_time[0, -1]
+        columns = [self._column(sla) for sla in thresholds]
+
+        return pd.DataFrame({
+            "SLA_Days": list(thresholds),
+            "On_Time_Pct": (
+                np.round(on_time[0, columns] / total * 100, 2)
+                if total else np.zeros(len(columns))
+            ),
+        })
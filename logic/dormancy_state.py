@@ -0,0 +1,253 @@
+import numpy as np
+import pandas as pd
+
+STATE_NAME = "dormancy_state"
+
+KEYS = ["Item No.", "Location Code"]
+
+# Ledger columns the state is built from; "Entry No." (optional) is the
+# watermark that makes updates incremental
+LEDGER_COLUMNS = [
+    "Item No.",
+    "Location Code",
+    "Posting Date",
+    "Quantity",
+    "Remaining Quantity",
+    "Cost Amount (Actual)",
+    "Description",
+    "Item Category Code",
+    "Item Subcategory Code"
+]
+
+
+def clean_ledger(df: pd.DataFrame):
+    """Type cleaning of the Item Ledger columns used by component 2."""
+
+    df = df[LEDGER_COLUMNS]
+
+    df["Posting Date"] = pd.to_datetime(df["Posting Date"], errors="coerce")
+
+    df["Quantity"] = pd.to_numeric(df["Quantity"], errors="coerce").fillna(0)
+    df["Remaining Quantity"] = pd.to_numeric(
+        df["Remaining Quantity"], errors="coerce"
+    ).fillna(0)
+
+    df["Cost Amount (Actual)"] = pd.to_numeric(
+        df["Cost Amount (Actual)"], errors="coerce"
+    ).fillna(0)
+
+    df["Location Code"] = (
+        df["Location Code"]
+        .astype(str)
+        .str.strip()
+        .replace("nan", "UNKNOWN")
+    )
+
+    return df
+
+
+def _last_outward(df):
+    # Latest negative entry per item/location of the cleaned ledger `df`
+    return (
+        df[df["Quantity"] < 0]
+        .groupby(KEYS)["Posting Date"]
+        .max()
+        .rename("Last Outward Date")
+    )
+
+
+def _combine(df, last_outward):
+    # State of the cleaned ledger `df` given its last outward dates
+    current_stock = (
+        df[df["Remaining Quantity"] > 0]
+        .groupby(KEYS)
+        .agg(
+            Description=("Description", "first"),
+            Category=("Item Category Code", "first"),
+            Subcategory=("Item Subcategory Code", "first"),
+            On_Hand=("Remaining Quantity", "sum"),
+            Stock_Value=("Cost Amount (Actual)", "sum"),
+        )
+    )
+
+    state = current_stock.join(last_outward, how="outer").sort_index()
+
+    state["Has_Stock"] = state.index.isin(current_stock.index)
+    state[["On_Hand", "Stock_Value"]] = (
+        state[["On_Hand", "Stock_Value"]].fillna(0)
+    )
+
+    return state.reset_index()
+
+
+def build_dormancy_state(df: pd.DataFrame):
+    """
+    Per-(Item No., Location Code) dormancy state of ledger entries:
+
+        Description, Category, Subcategory   first seen (stock entries)
+        On_Hand, Stock_Value                 Remaining Quantity / Cost
+                                             Amount of entries with stock
+        Last Outward Date                    latest negative entry
+        Has_Stock                            any entry with stock
+    """
+
+    df = clean_ledger(df)
+    return _combine(df, _last_outward(df))
+
+
+def update_dormancy_state(state: pd.DataFrame, ledger: pd.DataFrame, entries):
+    """
+    State of `ledger` from `state` (built from an earlier upload of it)
+    and the ledger's `entries` not seen by that state.
+
+    Only the last outward dates are incremental: posting dates and
+    quantities of an entry never change, so the dates merge by max. The
+    stock columns are re-read from `ledger`, because Remaining Quantity
+    and Cost Amount of old entries change as stock is consumed.
+    """
+
+    last_outward = pd.concat([
+        state.set_index(KEYS)["Last Outward Date"].dropna(),
+        _last_outward(clean_ledger(entries)),
+    ]).groupby(level=KEYS).max()
+
+    return _combine(clean_ledger(ledger), last_outward)
+
+
+def load_dormancy_state(store, version):
+    """
+    Dormancy state caught up with the ledger dataset `version`.
+
+    The persisted state remembers the highest "Entry No." applied (the
+    watermark): the last outward dates of a new ledger upload only read
+    its entries above it, while stock is taken from the whole upload
+    (see update_dormancy_state). A ledger that does not continue the
+    state (no Entry No. column, or entries ending below the watermark)
+    rebuilds it from scratch.
+    """
+
+    meta = store.meta(STATE_NAME)
+    if meta and meta.get("ledger") == version:
+        return store.get(STATE_NAME)
+
+    ledger = store.get_object(version)
+    has_entries = "Entry No." in ledger.columns and len(ledger)
+    watermark = meta.get("watermark") if meta else None
+
+    if (
+        has_entries and watermark is not None
+        and int(ledger["Entry No."].max()) >= watermark
+    ):
+        state = update_dormancy_state(
+            store.get(STATE_NAME),
+            ledger,
+            ledger[ledger["Entry No."] > watermark]
+        )
+    else:
+        state = build_dormancy_state(ledger)
+
+    store.put(STATE_NAME, state, meta={
+        "ledger": version,
+        "watermark": int(ledger["Entry No."].max()) if has_entries else None,
+    })
+    return state
+
+
+# --------------------------------------------------
+# AS-OF TREND
+# --------------------------------------------------
+def _ranked(keys, ranks, n_ranks):
+    # (group, date rank) pairs as one sortable int64
+    return keys.astype(np.int64) * (n_ranks + 1) + ranks
+
+
+def dormancy_trend(df: pd.DataFrame, as_of_dates, slow_days, dead_days):
+    """
+    Dormancy summary at every date in `as_of_dates` in one pass, equal to
+    classifying the ledger entries posted on or before each date.
+
+    Outward and stock entries are sorted once by (item/location, posting
+    date); each as-of date is then a binary search per item/location for
+    the last outward date and the running stock totals, instead of a
+    rerun of the analysis.
+    """
+
+    df = clean_ledger(df)
+    as_of = pd.DatetimeIndex(as_of_dates)
+
+    group = df.groupby(KEYS, sort=True).ngroup().to_numpy()
+    n_groups = int(group.max()) + 1 if len(group) else 0
+
+    posted = df["Posting Date"].to_numpy()
+    valid = (group >= 0) & ~np.isnat(posted)
+
+    # Dates → ranks, so (group, date) pairs fit one int64
+    dates = np.unique(posted[valid])
+    date_rank = np.searchsorted(dates, posted)
+    as_of_rank = np.searchsorted(
+        dates, as_of.to_numpy().astype(dates.dtype), side="right"
+    ) - 1
+
+    groups = np.arange(n_groups)
+    query = _ranked(groups[None, :], as_of_rank[:, None], len(dates))
+    group_start = _ranked(groups, np.zeros_like(groups), len(dates))
+
+    # ---------------- LAST OUTWARD DATE ----------------
+    out = valid & (df["Quantity"].to_numpy() < 0)
+    out_key = _ranked(group[out], date_rank[out], len(dates))
+    order = np.argsort(out_key, kind="stable")
+    out_key = out_key[order]
+    out_date = posted[out][order]
+
+    pos = np.searchsorted(out_key, query, side="right") - 1
+    moved = pos >= np.searchsorted(out_key, group_start)[None, :]
+
+    last_outward = np.broadcast_to(
+        as_of.to_numpy().astype(posted.dtype)[:, None], query.shape
+    ).copy()
+    last_outward[moved] = out_date[pos[moved]]
+
+    # ---------------- STOCK (RUNNING TOTALS) ----------------
+    stock = valid & (df["Remaining Quantity"].to_numpy() > 0)
+    stock_key = _ranked(group[stock], date_rank[stock], len(dates))
+    order = np.argsort(stock_key, kind="stable")
+    stock_key = stock_key[order]
+    value_sum = np.concatenate(
+        [[0], np.cumsum(df["Cost Amount (Actual)"].to_numpy()[stock][order])]
+    )
+
+    end = np.searchsorted(stock_key, query, side="right")
+    start = np.searchsorted(stock_key, group_start)[None, :]
+    has_stock = end > start
+    stock_value = value_sum[end] - value_sum[start]
+
+    # ---------------- CLASSIFICATION ----------------
+    # Days since the last outward entry (0 where none: never moved)
+    days = (
+        as_of.to_numpy().astype(posted.dtype)[:, None] - last_outward
+    ) // np.timedelta64(1, "D")
+
+    slow = has_stock & moved & (days > slow_days) & (days <= dead_days)
+    dead = has_stock & (~moved | (days > dead_days))
+    active = has_stock & ~slow & ~dead
+
+    total_value = np.where(has_stock, stock_value, 0).sum(axis=1)
+    slow_value = np.where(slow, stock_value, 0).sum(axis=1)
+    dead_value = np.where(dead, stock_value, 0).sum(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slow_pct = np.where(total_value != 0, slow_value / total_value * 100, 0)
+        dead_pct = np.where(total_value != 0, dead_value / total_value * 100, 0)
+
+    return pd.DataFrame({
+        "As_Of": as_of,
+        "Total Items": has_stock.sum(axis=1),
+        "Active Items": active.sum(axis=1),
+        "Slow-Moving Items": slow.sum(axis=1),
+        "Dead Items": dead.sum(axis=1),
+        "Total Value": total_value,
+        "Slow-Moving Value": slow_value,
+        "Dead Value": dead_value,
+        "Slow %": slow_pct,
+        "Dead %": dead_pct,
+    })
@@ -0,0 +1,302 @@
+import hashlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from operator import itemgetter
+
+import pandas as pd
+from openpyxl import load_workbook
+
+from logic.dataset_store import DatasetStore
+from logic.keys import KeyDictionary, encode_keys
+from logic.vendors import encode_vendors
+from logic.normalize import normalize
+from logic.schemas import FIELD_SCHEMAS, apply_schema, memory_usage
+
+try:
+    import python_calamine  # noqa: F401  (optional fast reader)
+    HAS_CALAMINE = True
+except ImportError:
+    HAS_CALAMINE = False
+
+
+READERS = {}
+
+# Bump when the way uploads are turned into stored frames changes, so
+# content-addressed objects written by older code are not reused.
+INGEST_VERSION = 4
+
+# Readers tried in order when CONA_EXCEL_READER is not set
+READER_PREFERENCE = ["calamine", "openpyxl"]
+
+# Streaming readers report rows parsed this often
+PROGRESS_EVERY = 10000
+
+
+def register_reader(name, available=True):
+    """
+    Register an Excel reader backend.
+    A reader takes (file, columns, progress) and returns a DataFrame
+    holding only the header names in `columns` (all columns when
+    `columns` is None). `progress`, when given, is called with the number
+    of rows parsed so far.
+    """
+
+    def decorator(fn):
+        if available:
+            READERS[name] = fn
+        return fn
+
+    return decorator
+
+
+def _wanted(name, columns):
+    if name is None:
+        return False
+    return columns is None or str(name).strip() in columns
+
+
+# --------------------------------------------------
+# OPENPYXL — READ-ONLY STREAMING
+# --------------------------------------------------
+@register_reader("openpyxl")
+def read_openpyxl(file, columns=None, progress=None):
+    """
+    Streams the first sheet row by row and keeps only the projected
+    cells, so the full workbook is never materialized as Python objects.
+    """
+
+    wb = load_workbook(file, read_only=True, data_only=True, keep_links=False)
+
+    try:
+        ws = wb.worksheets[0]
+        ws.reset_dimensions()
+        rows = ws.iter_rows(values_only=True)
+
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+
+        picked = [
+            (i, name) for i, name in enumerate(header)
+            if _wanted(name, columns)
+        ]
+        if not picked:
+            return pd.DataFrame()
+
+        indices = [i for i, _ in picked]
+        names = [name for _, name in picked]
+
+        width = max(indices) + 1
+        pad = (None,) * width
+        getter = itemgetter(*indices)
+        single = len(indices) == 1
+
+        records = []
+        for row in rows:
+            if len(row) < width:
+                row = row + pad[len(row):]
+            values = getter(row)
+            if single:
+                values = (values,)
+            # pandas skips blank rows, do the same on the projection
+            if any(v is not None for v in values):
+                records.append(values)
+                if progress and len(records) % PROGRESS_EVERY == 0:
+                    progress(len(records))
+    finally:
+        wb.close()
+
+    if progress:
+        progress(len(records))
+
+    return pd.DataFrame.from_records(records, columns=names)
+
+
+# --------------------------------------------------
+# CALAMINE — RUST READER (OPTIONAL)
+# --------------------------------------------------
+@register_reader("calamine", available=HAS_CALAMINE)
+def read_calamine(file, columns=None, progress=None):
+    usecols = None
+    if columns is not None:
+        usecols = lambda name: _wanted(name, columns)  # noqa: E731
+
+    df = pd.read_excel(file, engine="calamine", usecols=usecols)
+    if progress:
+        progress(len(df))
+    return df
+
+
+def default_reader():
+    name = os.environ.get("CONA_EXCEL_READER")
+    if name:
+        if name not in READERS:
+            raise KeyError(
+                f"Excel reader '{name}' not available. Found: {sorted(READERS)}"
+            )
+        return name
+
+    for name in READER_PREFERENCE:
+        if name in READERS:
+            return name
+
+    raise KeyError("No Excel reader registered")
+
+
+def read_sheet(file, columns=None, reader=None, progress=None):
+    """
+    Read the first sheet of an uploaded workbook.
+    `columns` is a set of (stripped) header names to keep; headers that
+    are not present in the sheet are ignored.
+    """
+
+    return READERS[reader or default_reader()](file, columns, progress)
+
+
+# --------------------------------------------------
+# COLUMN PROJECTION
+# --------------------------------------------------
+def input_columns(*declarations):
+    """
+    Merge the INPUT_COLUMNS declared by each component into one
+    {upload field: set of header names} map. Files shared between
+    components are projected to the union of what all of them need.
+    """
+
+    merged = {}
+    for declared in declarations:
+        for field, cols in declared.items():
+            merged.setdefault(field, set()).update(cols)
+
+    return {field: frozenset(cols) for field, cols in merged.items()}
+
+
+# --------------------------------------------------
+# CONTENT ADDRESSING
+# --------------------------------------------------
+def file_digest(file, chunk_size=1 << 20):
+    """sha256 of an uploaded file; the stream is rewound afterwards."""
+
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: file.read(chunk_size), b""):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def dataset_key(digest, columns=None):
+    """
+    Store key for a parsed upload: the same bytes read with the same
+    projection always map to the same key.
+    """
+
+    projection = "*" if columns is None else "|".join(sorted(columns))
+    token = f"{INGEST_VERSION}:{digest}:{projection}"
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+# --------------------------------------------------
+# PARALLEL PARSING
+# --------------------------------------------------
+_pool = None
+
+
+def parse_pool():
+    """
+    Shared process pool for parsing, or None where processes are not
+    available (e.g. serverless sandboxes without /dev/shm).
+    forkserver/spawn keep children clear of the web server's threads.
+    """
+
+    global _pool
+    if _pool is None:
+        methods = multiprocessing.get_all_start_methods()
+        method = "forkserver" if "forkserver" in methods else "spawn"
+        workers = int(os.environ.get("CONA_PARSE_PROCESSES", os.cpu_count() or 1))
+        try:
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context(method)
+            )
+        except (OSError, NotImplementedError):
+            _pool = False
+    return _pool or None
+
+
+def prepare(field, raw, keys=None):
+    """
+    Ingestion pipeline: turn a frame as read into the canonical frame
+    stored for `field` (schema coercion, normalization, then integer key
+    and vendor id encoding against the shared KeyDictionary `keys`).
+    """
+
+    schema = FIELD_SCHEMAS.get(field)
+    if schema is None:
+        return raw
+
+    df = normalize(apply_schema(raw, schema), schema)
+    if keys is not None:
+        df = encode_keys(df, schema, keys)
+        df = encode_vendors(df, schema, keys)
+    return df
+
+
+def parse_into_store(store_root, upload, job=None):
+    """
+    Parse one spooled upload, apply its export schema and write it to
+    the dataset store. Runs inside a pool worker: only paths and row
+    counts cross the process boundary, never the frame itself.
+    """
+
+    field = upload["field"]
+    progress = job.progress(field) if job else None
+
+    raw = read_sheet(upload["path"], columns=upload["columns"], progress=progress)
+    df = prepare(field, raw, keys=KeyDictionary(store_root))
+
+    meta = dict(upload["meta"] or {})
+    meta["memory"] = memory_usage(raw, df)
+
+    DatasetStore(store_root).put(
+        upload["name"], df, meta=meta, key=upload["key"]
+    )
+    return len(df)
+
+
+def parse_uploads(store_root, uploads, job=None):
+    """
+    Parse independent uploads concurrently, one process per file, so
+    wall time tracks the largest file. Falls back to parsing in the
+    calling thread for a single file or when no pool is available.
+    Returns {field: rows}.
+    """
+
+    pool = parse_pool() if len(uploads) > 1 else None
+    if pool is None:
+        return {
+            upload["field"]: parse_into_store(store_root, upload, job)
+            for upload in uploads
+        }
+
+    global _pool
+    rows = {}
+    try:
+        futures = {
+            pool.submit(parse_into_store, store_root, upload, job): upload["field"]
+            for upload in uploads
+        }
+        for future in as_completed(futures):
+            field = futures[future]
+            rows[field] = future.result()
+            if job:
+                job.report(field, rows=rows[field], status="done")
+    except BrokenProcessPool:
+        # A worker died (OOM, killed): start a fresh pool next time and
+        # finish this job in the calling thread
+        _pool = None
+        for upload in uploads:
+            if upload["field"] not in rows:
+                rows[upload["field"]] = parse_into_store(store_root, upload, job)
+    return rows
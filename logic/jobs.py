@@ -0,0 +1,159 @@
+import json
+import os
+import shutil
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+# Finished job directories (state + progress) are kept this many seconds
+JOB_TTL = int(os.environ.get("CONA_JOB_TTL", 86400))
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _write_json(path, data):
+    tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(tmp, "w") as fh:
+        json.dump(data, fh)
+    os.replace(tmp, path)
+
+
+def _read_json(path):
+    try:
+        with open(path) as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return None
+
+
+class Job:
+    """
+    Handle passed to a running job.
+    Progress for each file goes to its own JSON file, so a job (or the
+    worker processes it starts) can report without rewriting shared state.
+    """
+
+    def __init__(self, path, job_id):
+        self.path = path
+        self.id = job_id
+        self.scratch = os.path.join(path, "scratch")
+
+    def file_path(self, name):
+        """
+        Scratch location inside the job directory (e.g. spooled uploads),
+        removed when the job finishes, whether it succeeded or failed.
+        """
+        os.makedirs(self.scratch, exist_ok=True)
+        return os.path.join(self.scratch, name)
+
+    def report(self, field, rows=None, status=None):
+        path = os.path.join(self.path, f"{field}.progress.json")
+        state = _read_json(path) or {}
+        if rows is not None:
+            state["rows"] = int(rows)
+        if status is not None:
+            state["status"] = status
+        _write_json(path, state)
+
+    def progress(self, field):
+        """Callback for read_sheet(progress=...)."""
+        return lambda rows: self.report(field, rows=rows, status="parsing")
+
+
+class JobQueue:
+    """
+    Local background job queue (thread pool) with job state kept as JSON
+    under <root>/jobs/<id>/, so any request or worker can poll it without
+    an external broker.
+    """
+
+    def __init__(self, root, max_workers=2):
+        self.root = os.path.join(root, "jobs")
+        os.makedirs(self.root, exist_ok=True)
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="cona-job"
+        )
+
+    def create(self, files=(), **info):
+        """Register a queued job; returns its Job handle."""
+
+        job_id = uuid.uuid4().hex
+        path = os.path.join(self.root, job_id)
+        os.makedirs(path)
+
+        _write_json(os.path.join(path, "job.json"), {
+            "id": job_id,
+            "status": "queued",
+            "created_at": _now(),
+            "files": list(files),
+            "error": None,
+            **info,
+        })
+
+        job = Job(path, job_id)
+        for field in files:
+            job.report(field, rows=0, status="queued")
+        return job
+
+    def start(self, job, fn, *args):
+        """Run fn(job, *args) in the background."""
+
+        self.executor.submit(self._run, job, fn, args)
+        return job.id
+
+    def _run(self, job, fn, args):
+        self._update(job, status="running", started_at=_now())
+        try:
+            fn(job, *args)
+        except Exception as exc:
+            traceback.print_exc()
+            self._update(
+                job, status="failed", finished_at=_now(), error=str(exc)
+            )
+        else:
+            self._update(job, status="done", finished_at=_now())
+        finally:
+            shutil.rmtree(job.scratch, ignore_errors=True)
+
+    def _update(self, job, **changes):
+        path = os.path.join(job.path, "job.json")
+        _write_json(path, {**_read_json(path), **changes})
+
+    def prune(self, ttl=JOB_TTL):
+        """
+        Remove the directories of jobs that finished (done or failed) more
+        than `ttl` seconds ago; returns their ids.
+        """
+
+        cutoff = (datetime.now() - timedelta(seconds=ttl)).isoformat(
+            timespec="seconds"
+        )
+
+        removed = []
+        for job_id in os.listdir(self.root):
+            state = _read_json(os.path.join(self.root, job_id, "job.json"))
+            if state is None or state["status"] not in ("done", "failed"):
+                continue
+            if state.get("finished_at", "") <= cutoff:
+                shutil.rmtree(os.path.join(self.root, job_id), ignore_errors=True)
+                removed.append(job_id)
+
+        return removed
+
+    def get(self, job_id):
+        """Job state with per-file progress, or None for unknown ids."""
+
+        path = os.path.join(self.root, os.path.basename(job_id))
+        state = _read_json(os.path.join(path, "job.json"))
+        if state is None:
+            return None
+
+        state["progress"] = {
+            field: _read_json(os.path.join(path, f"{field}.progress.json")) or {}
+            for field in state["files"]
+        }
+        return state
@@ -0,0 +1,181 @@
+import os
+import pickle
+import threading
+import uuid
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None
+
+# --------------------------------------------------
+# KEY DOMAINS
+# --------------------------------------------------
+# Every document / item number is encoded as a dense int32 code that is
+# shared by all exports carrying it, e.g. a PO has the same code in
+# Purchase Order "No.", Purchase Lines "Document No." and Posted Purchase
+# Receipts "Order No.". Missing keys are -1.
+KEY_DOMAINS = {
+    "PO_Key": {
+        "Purchase Order": ["No."],
+        "Purchase Lines": ["Document No.", "Document No"],
+        "Posted Purchase Receipts": ["Order No.", "Order No"],
+    },
+    "Receipt_Key": {
+        "Purchase Order": ["Last Receiving No."],
+        "Posted Purchase Receipts": ["No."],
+    },
+    "Item_Key": {
+        "Items": ["No."],
+        "Purchase Lines": ["No."],
+        "Item Ledger": ["Item No."],
+    },
+    "SO_Key": {
+        "Sales Order": ["No.", "No", "Document No."],
+        "Posted Sales Invoice": ["Order No.", "Order No"],
+    },
+}
+
+_thread_lock = threading.Lock()
+
+
+class KeyDictionary:
+    """
+    Append-only key → code dictionaries, one per domain, kept next to the
+    dataset store (<root>/keys/<domain>.pkl). Codes never change once
+    assigned, so frames encoded by earlier uploads stay valid.
+    """
+
+    def __init__(self, root):
+        self.path = os.path.join(root, "keys")
+        os.makedirs(self.path, exist_ok=True)
+
+    def _file(self, domain):
+        return os.path.join(self.path, f"{domain}.pkl")
+
+    def load(self, domain):
+        try:
+            with open(self._file(domain), "rb") as fh:
+                return pickle.load(fh)
+        except FileNotFoundError:
+            return pd.Index([], dtype=object)
+
+    def _save(self, domain, index):
+        path = self._file(domain)
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, "wb") as fh:
+            pickle.dump(index, fh)
+        os.replace(tmp, path)
+
+    def encode(self, domain, values):
+        """int32 codes for `values`, registering keys not seen before."""
+
+        values = pd.Index(values, dtype=object)
+
+        # Ingestion runs in several processes: serialize dictionary growth
+        with _thread_lock, open(os.path.join(self.path, ".lock"), "w") as lock:
+            if fcntl:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+
+            index = self.load(domain)
+            codes = index.get_indexer(values)
+
+            missing = (codes == -1) & values.notna()
+            if missing.any():
+                index = index.append(pd.Index(values[missing].unique(), dtype=object))
+                self._save(domain, index)
+                codes = index.get_indexer(values)
+
+        return codes.astype(np.int32)
+
+    def decode(self, domain, codes):
+        return self.load(domain).take(codes, allow_fill=True, fill_value=np.nan)
+
+
+def encode_keys(df: pd.DataFrame, schema, keys: KeyDictionary):
+    """Add one <Domain>_Key code column per key domain the export carries."""
+
+    for domain, exports in KEY_DOMAINS.items():
+        for name in exports.get(schema, []):
+            if name in df.columns:
+                df[domain] = keys.encode(domain, df[name])
+                break
+
+    return df
+
+
+# --------------------------------------------------
+# INTEGER JOIN HELPERS
+# --------------------------------------------------
+# Code arrays index dense tables directly: a join is a take, a groupby
+# is a bincount and a membership test is a boolean lookup.
+def domain_size(*code_arrays):
+    """Table length covering every code in the given arrays."""
+
+    return max((int(c.max()) + 1 for c in code_arrays if len(c)), default=0)
+
+
+def dense_sum(codes, values, size):
+    valid = codes >= 0
+    return np.bincount(codes[valid], weights=values[valid], minlength=size)
+
+
+def dense_count(codes, size):
+    return np.bincount(codes[codes >= 0], minlength=size)
+
+
+def dense_max(codes, values, size):
+    """Per-code max of datetime64 `values` (NaT ignored)."""
+
+    values = np.asarray(values)
+    if values.dtype.kind != "M":
+        values = values.astype("datetime64[ns]")
+    valid = (codes >= 0) & ~np.isnat(values)
+
+    table = np.full(size, np.iinfo(np.int64).min, dtype=np.int64)
+    np.maximum.at(table, codes[valid], values[valid].view(np.int64))
+
+    return table.view(values.dtype)  # int64 min is NaT
+
+
+def dense_or(codes, bits, size):
+    """Per-code bitwise OR of integer `bits` (0 where a code has none)."""
+
+    bits = np.asarray(bits)
+    valid = codes >= 0
+
+    table = np.zeros(size, dtype=bits.dtype)
+    np.bitwise_or.at(table, codes[valid], bits[valid])
+    return table
+
+
+def dense_table(codes, values, size, fill):
+    """Code → value table (the last row wins for repeated codes)."""
+
+    values = np.asarray(values)
+    table = np.full(size, fill, dtype=values.dtype)
+    valid = codes >= 0
+    table[codes[valid]] = values[valid]
+    return table
+
+
+def dense_lookup(table, codes, fill):
+    """table[codes] with `fill` for missing (-1) or out-of-range codes."""
+
+    codes = np.asarray(codes)
+    found = (codes >= 0) & (codes < len(table))
+    out = np.full(len(codes), fill, dtype=table.dtype)
+    out[found] = table[codes[found]]
+    return out
+
+
+def member_mask(member_codes, size):
+    """Boolean table: True for every code in `member_codes`."""
+
+    mask = np.zeros(size, dtype=bool)
+    member_codes = np.asarray(member_codes)
+    mask[member_codes[member_codes >= 0]] = True
+    return mask
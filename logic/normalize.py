@@ -0,0 +1,41 @@
+import pandas as pd
+
+# --------------------------------------------------
+# KEY COLUMNS PER EXPORT
+# --------------------------------------------------
+# Document / item numbers used to join exports. They are cleaned once at
+# ingestion (text, stripped, upper-case) so components can join on them
+# directly instead of re-cleaning on every dashboard request.
+KEY_COLUMNS = {
+    "Transfer Lines": ["Document No."],
+    "Item Ledger": ["Item No."],
+    "Purchase Order": ["No.", "Last Receiving No."],
+    "Purchase Lines": ["Document No.", "Document No", "No."],
+    "Posted Purchase Receipts": ["No.", "Order No.", "Order No"],
+    "Sales Order": ["No.", "No", "Document No."],
+    "Posted Sales Invoice": ["Order No.", "Order No"],
+    "Items": ["No."],
+}
+
+
+def clean_key(col: pd.Series):
+    """str → strip → upper, keeping missing values missing."""
+
+    cleaned = col.astype(str).str.strip().str.upper()
+    return cleaned.where(col.notna())
+
+
+def normalize(df: pd.DataFrame, schema):
+    """
+    Canonical form of an export: stripped header names and cleaned key
+    columns. Runs once per upload; components rely on it and neither
+    copy nor re-clean their inputs.
+    """
+
+    df = df.rename(columns=lambda name: str(name).strip())
+
+    for name in KEY_COLUMNS.get(schema, []):
+        if name in df.columns:
+            df[name] = clean_key(df[name])
+
+    return df
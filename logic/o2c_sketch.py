@@ -0,0 +1,179 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from logic.component4_sales_invoice import (
+    MAX_O2C_DAYS, PERCENTILES, WITHIN_DAYS, o2c_cycles
+)
+
+# Bump when the sketch layout or rules change
+SKETCH_VERSION = 1
+
+SKETCH_NAME = "o2c_sketch"
+
+# Upload fields the sketch is built from
+SKETCH_INPUTS = ["sales_order_file", "sales_invoice_file"]
+
+# O2C_Days of orders without a valid cycle (no invoice, or outside the
+# 0 … MAX_O2C_DAYS range)
+NO_CYCLE = -1
+
+
+def build_o2c_sketch(df_so: pd.DataFrame, df_inv: pd.DataFrame):
+    """
+    Sales orders counted per (Month, Customer, Shipped, O2C_Days), Month
+    being the SO date's.
+
+    O2C days are whole days in 0 … MAX_O2C_DAYS, so these counts are an
+    exact, mergeable quantile sketch: any set of months / customers is
+    summarized by adding their counts, and the percentiles read off the
+    sum equal those of the orders themselves (see o2c_metrics).
+    """
+
+    df = o2c_cycles(df_so, df_inv)
+
+    days = df["O2C_Days"]
+    valid = (days >= 0) & (days <= MAX_O2C_DAYS)
+
+    return (
+        pd.DataFrame({
+            "Month": df["SO_Date"].dt.to_period("M").astype(str),
+            "Customer": df["Customer"].astype("category"),
+            "Shipped": df["Completely_Shipped"] != 0,
+            "O2C_Days": days.where(valid, NO_CYCLE).astype(np.int16),
+        })
+        .groupby(
+            ["Month", "Customer", "Shipped", "O2C_Days"],
+            observed=True, dropna=False
+        )
+        .size()
+        .reset_index(name="Count")
+    )
+
+
+def sketch_key(versions):
+    """Store key of the sketch built from the given input dataset versions."""
+
+    token = f"{SKETCH_VERSION}:" + "|".join(versions)
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def load_o2c_sketch(store, versions):
+    """Sketch for the given store versions of SKETCH_INPUTS, built once."""
+
+    key = sketch_key(versions)
+    if not store.has_object(key):
+        store.put(
+            SKETCH_NAME,
+            build_o2c_sketch(*(store.get_object(v) for v in versions)),
+            key=key
+        )
+
+    return store.get_object(key)
+
+
+def select(sketch, start=None, end=None, customer=None):
+    """Sketch rows of months start … end ("YYYY-MM", inclusive) / a customer."""
+
+    keep = np.ones(len(sketch), dtype=bool)
+    if start:
+        keep &= (sketch["Month"] >= start).to_numpy()
+    if end:
+        keep &= (sketch["Month"] <= end).to_numpy()
+    if customer:
+        keep &= (sketch["Customer"] == customer).to_numpy()
+
+    return sketch[keep]
+
+
+def _percentile(cumulative, q):
+    # np.percentile (linear) of the values counted in `cumulative`
+    n = cumulative[-1]
+    q = q / 100
+    rank = n * q + (1 - q) - 1   # numpy's virtual index, same rounding
+    below = np.floor(rank)
+    t = rank - below
+
+    a, b = np.searchsorted(
+        cumulative, [below, min(below + 1, n - 1)], side="right"
+    )
+
+    if t >= 0.5:
+        return b - (b - a) * (1 - t)
+    return a + (b - a) * t
+
+
+def cycle_stats(sketch):
+    """Mean, median, percentiles and within-N-days shares of O2C_Days."""
+
+    cycles = sketch[sketch["O2C_Days"] != NO_CYCLE]
+    counts = np.bincount(
+        cycles["O2C_Days"].to_numpy(),
+        weights=cycles["Count"].to_numpy(),
+        minlength=MAX_O2C_DAYS + 1
+    ).astype(np.int64)
+
+    cumulative = counts.cumsum()
+    n = int(cumulative[-1])
+
+    if not n:
+        return {
+            "avg_cycle": np.nan,
+            "median_cycle": np.nan,
+            **{f"pct_{days}": np.nan for days in WITHIN_DAYS},
+            **{f"p{q}_cycle": 0 for q in PERCENTILES},
+        }
+
+    return {
+        "avg_cycle": round(
+            (counts * np.arange(len(counts))).sum() / n, 2
+        ),
+        "median_cycle": round(_percentile(cumulative, 50), 2),
+        **{
+            f"pct_{days}": round(cumulative[days] / n * 100, 2)
+            for days in WITHIN_DAYS
+        },
+        **{
+            f"p{q}_cycle": round(_percentile(cumulative, q), 2)
+            for q in PERCENTILES
+        },
+    }
+
+
+def o2c_metrics(sketch, start=None, end=None, customer=None):
+    """
+    Component 4 metrics of the orders in months start … end of one
+    customer (all if None), from the sketch alone; equal to
+    run_component4 on those orders.
+    """
+
+    sketch = select(sketch, start, end, customer)
+
+    counts = sketch["Count"].to_numpy()
+    total_sos = int(counts.sum())
+    shipped_sos = int(counts[sketch["Shipped"].to_numpy()].sum())
+
+    stats = cycle_stats(sketch)
+
+    return {
+        "total_sos": total_sos,
+        "shipment_pct": round(
+            (shipped_sos / total_sos) * 100,
+            2
+        ) if total_sos else 0,
+        "avg_cycle": stats.pop("avg_cycle"),
+        "median_cycle": stats.pop("median_cycle"),
+        **stats,
+    }
+
+
+def o2c_monthly(sketch, start=None, end=None, customer=None):
+    """O2C cycle statistics per month (one merged sketch slice each)."""
+
+    sketch = select(sketch, start, end, customer)
+
+    return pd.DataFrame([
+        {"Month": month, **cycle_stats(rows)}
+        for month, rows in sketch.groupby("Month", sort=True)
+    ])
@@ -0,0 +1,209 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from logic.keys import (
+    dense_count, dense_lookup, dense_max, dense_or, dense_sum, dense_table,
+    domain_size
+)
+
+# Bump when the facts table layout or rules change
+FACTS_VERSION = 4
+
+FACTS_NAME = "po_facts"
+
+# Upload fields the facts are built from; items_file is optional
+# (posting groups)
+FACT_INPUTS = ["po_file", "receipt_file", "lines_file", "items_file"]
+
+# Facts column per Inventory Posting Group: "Group_RM", "Group_PM", …
+GROUP_PREFIX = "Group_"
+
+# Columns read from each upload (see logic.ingest)
+INPUT_COLUMNS = {
+    "items_file": ["No.", "Inventory Posting Group"],
+    "po_file": [
+        "No.", "Pay-to Name", "Buy-from Vendor Name", "Order Date",
+        "Last Receiving No."
+    ],
+    "receipt_file": ["No.", "Order No.", "Order No", "Posting Date"],
+    "lines_file": [
+        "Document No.", "Document No", "No.", "Quantity",
+        "Outstanding Quantity"
+    ]
+}
+
+
+def _column(df, name, fill=np.nan):
+    # Optional export columns: each KPI only needs some of them
+    if name in df.columns:
+        return df[name]
+    return pd.Series(fill, index=df.index)
+
+
+def build_po_facts(
+    df_po: pd.DataFrame,
+    df_rcpt: pd.DataFrame,
+    df_lines: pd.DataFrame,
+    df_items: pd.DataFrame = None
+):
+    """
+    One row per purchase order with everything the purchase KPIs
+    (3A, 3B, 5, 5A) derive from the three purchase exports:
+
+        PO_No, Vendor (Pay-to), Buy_From_Vendor  canonical vendor names
+        Vendor_Key, Buy_From_Vendor_Key  their vendor ids (see logic.vendors)
+        Order_Date,
+        Last_Receiving_No,
+        Receipt_Date       posting date of the PO's Last Receiving No.
+        Last_Receipt_Date  latest receipt posted against the PO (Order No.)
+        Has_Lines, Ordered_Qty, Outstanding_Qty (0 without lines),
+        Completed          has lines and nothing outstanding
+        Group_<posting group>  at least one line is an item of that
+                           Inventory Posting Group (Group_RM, Group_PM, …)
+
+    Expects normalized frames with key codes (see logic.keys) and vendor
+    ids (see logic.vendors)
+    """
+
+    po_codes = df_po["PO_Key"].to_numpy()
+    po_receipts = df_po["Receipt_Key"].to_numpy()
+    line_codes = df_lines["PO_Key"].to_numpy()
+    rcpt_codes = df_rcpt["Receipt_Key"].to_numpy()
+    rcpt_orders = _column(df_rcpt, "PO_Key", -1).to_numpy(dtype=np.int32)
+
+    size = domain_size(po_codes, line_codes, rcpt_orders)
+
+    # ---------------- RECEIPTS ----------------
+    posting_date = pd.to_datetime(
+        df_rcpt["Posting Date"], errors="coerce"
+    ).to_numpy()
+
+    receipt_dates = dense_table(
+        rcpt_codes,
+        posting_date,
+        domain_size(rcpt_codes, po_receipts),
+        np.datetime64("NaT")
+    )
+
+    last_receipt = dense_max(rcpt_orders, posting_date, size)
+
+    # ---------------- LINES ----------------
+    outstanding_qty = pd.to_numeric(
+        df_lines["Outstanding Quantity"], errors="coerce"
+    ).fillna(0).to_numpy()
+
+    ordered_qty = pd.to_numeric(
+        _column(df_lines, "Quantity", 0), errors="coerce"
+    ).fillna(0).to_numpy()
+
+    has_lines = dense_count(line_codes, size) > 0
+    ordered = dense_sum(line_codes, ordered_qty, size)
+    outstanding = dense_sum(line_codes, outstanding_qty, size)
+
+    # ---------------- POSTING GROUPS ----------------
+    # Bit g of an item / PO mask: item of (PO with a line of) group g.
+    # One pass over the lines serves every group and combination.
+    groups = []
+    po_groups = np.zeros(size, dtype=np.uint64)
+
+    if df_items is not None:
+        item_codes = df_items["Item_Key"].to_numpy()
+        line_items = df_lines["Item_Key"].to_numpy()
+
+        posting_group = df_items["Inventory Posting Group"].astype("category")
+        groups = list(posting_group.cat.categories)
+        if len(groups) > 64:
+            raise ValueError(f"Too many Inventory Posting Groups: {len(groups)}")
+
+        group_codes = posting_group.cat.codes.to_numpy()
+        item_groups = dense_or(
+            item_codes,
+            np.where(
+                group_codes >= 0,
+                np.left_shift(np.uint64(1), group_codes.astype(np.uint64)),
+                np.uint64(0)
+            ),
+            domain_size(item_codes, line_items)
+        )
+        po_groups = dense_or(
+            line_codes, dense_lookup(item_groups, line_items, 0), size
+        )
+
+    # ---------------- FACTS ----------------
+    facts = pd.DataFrame({
+        "PO_No": df_po["No."],
+        "PO_Key": po_codes,
+        "Vendor": _column(df_po, "Pay-to Name"),
+        "Buy_From_Vendor": _column(df_po, "Buy-from Vendor Name"),
+        "Vendor_Key": _column(df_po, "Vendor_Key", -1).to_numpy(dtype=np.int32),
+        "Buy_From_Vendor_Key": _column(
+            df_po, "Buy_From_Vendor_Key", -1
+        ).to_numpy(dtype=np.int32),
+        "Order_Date": pd.to_datetime(df_po["Order Date"], errors="coerce"),
+        "Last_Receiving_No": df_po["Last Receiving No."],
+        "Receipt_Date": dense_lookup(receipt_dates, po_receipts, np.datetime64("NaT")),
+        "Last_Receipt_Date": dense_lookup(last_receipt, po_codes, np.datetime64("NaT")),
+        "Has_Lines": dense_lookup(has_lines, po_codes, False),
+        "Ordered_Qty": dense_lookup(ordered, po_codes, 0),
+        "Outstanding_Qty": dense_lookup(outstanding, po_codes, 0),
+    }).reset_index(drop=True)
+
+    po_mask = dense_lookup(po_groups, po_codes, 0)
+    for bit, group in enumerate(groups):
+        facts[f"{GROUP_PREFIX}{group}"] = (
+            (po_mask >> np.uint64(bit)) & np.uint64(1)
+        ).astype(bool)
+
+    facts["Completed"] = facts["Has_Lines"] & (facts["Outstanding_Qty"] == 0)
+
+    return facts
+
+
+def posting_groups(df):
+    """Posting groups with a Group_ column in `df` (facts or histogram cells)."""
+
+    return [
+        col[len(GROUP_PREFIX):]
+        for col in df.columns
+        if col.startswith(GROUP_PREFIX)
+    ]
+
+
+def in_groups(df, groups):
+    """Rows of `df` in any of the posting `groups` (unknown groups: none)."""
+
+    keep = np.zeros(len(df), dtype=bool)
+    for group in groups:
+        if f"{GROUP_PREFIX}{group}" in df.columns:
+            keep |= df[f"{GROUP_PREFIX}{group}"].to_numpy()
+    return keep
+
+
+def facts_key(versions):
+    """Store key of the facts built from the given input dataset versions."""
+
+    token = f"{FACTS_VERSION}:" + "|".join(v or "-" for v in versions)
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def load_po_facts(store, versions):
+    """
+    Facts for the given store versions of FACT_INPUTS, built once per set
+    of input versions and reused by every purchase KPI. None if PO,
+    receipts or lines are missing.
+    """
+
+    if None in versions[:3]:
+        return None
+
+    key = facts_key(versions)
+    if not store.has_object(key):
+        frames = [
+            store.get_object(version) if version else None
+            for version in versions
+        ]
+        store.put(FACTS_NAME, build_po_facts(*frames), key=key)
+
+    return store.get_object(key)
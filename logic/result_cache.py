@@ -0,0 +1,97 @@
+import os
+import threading
+from collections import OrderedDict
+
+# Entries kept per process (a dashboard result is a few KB of metrics
+# plus its chart JSON)
+CACHE_SIZE = int(os.environ.get("CONA_RESULT_CACHE_SIZE", 32))
+
+
+def _hashable(value):
+    # Mapping parameters (e.g. per-group thresholds) as sorted pairs
+    if isinstance(value, dict):
+        return tuple(sorted((k, _hashable(v)) for k, v in value.items()))
+    return value
+
+
+class ResultCache:
+    """
+    In-process LRU of computed KPI results.
+
+    Keys are built from the store versions of the input datasets and the
+    component parameters, so a re-upload (new version) or a changed
+    parameter simply misses; stale entries age out of the LRU.
+    """
+
+    def __init__(self, maxsize=CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._computing = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(name, versions, params=None):
+        return (
+            name,
+            tuple(versions),
+            tuple(sorted(
+                (param, _hashable(value))
+                for param, value in (params or {}).items()
+            )),
+        )
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def get_or_compute(self, key, compute):
+        """
+        Cached value for `key`, computing it on a miss. Concurrent misses
+        on one key (a request racing the upload precompute job) wait for a
+        single computation instead of repeating it.
+        """
+
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            key_lock = self._computing.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                value = self._entries.get(key)
+            if value is None:
+                value = self.put(key, compute())
+
+        with self._lock:
+            self._computing.pop(key, None)
+        return value
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -0,0 +1,120 @@
+import pandas as pd
+
+# --------------------------------------------------
+# BUSINESS CENTRAL EXPORT SCHEMAS
+# --------------------------------------------------
+# Column types applied once at ingestion:
+#   "category"  repeated codes / names  → pandas categorical
+#   "datetime"  dates                   → datetime64 (unparseable → NaT)
+#   "float32"   quantities              → float32 (unparseable → NaN)
+#   "float64"   amounts                 → float64 (unparseable → NaN)
+#   "int32"     counters                → int32 (missing → 0)
+# Columns not listed (document / item numbers, flags) are kept as read.
+
+SCHEMAS = {
+    "Transfer Lines": {
+        "Transfer-from Code": "category",
+        "Transfer-to Code": "category",
+        "Quantity": "float32",
+        "Quantity Shipped": "float32",
+        "Quantity Received": "float32",
+        "Created At": "datetime",
+    },
+    "Item Ledger": {
+        "Entry No.": "int32",
+        "Location Code": "category",
+        "Posting Date": "datetime",
+        "Quantity": "float32",
+        "Remaining Quantity": "float32",
+        "Cost Amount (Actual)": "float64",
+        "Description": "category",
+        "Item Category Code": "category",
+        "Item Subcategory Code": "category",
+    },
+    "Purchase Order": {
+        "Pay-to Name": "category",
+        "Buy-from Vendor Name": "category",
+        "Order Date": "datetime",
+    },
+    "Purchase Lines": {
+        "Quantity": "float32",
+        "Outstanding Quantity": "float32",
+    },
+    "Posted Purchase Receipts": {
+        "Posting Date": "datetime",
+    },
+    "Sales Order": {
+        "Document Date": "datetime",
+        "Sell-to Customer No.": "category",
+        "Location Code": "category",
+        "Salesperson Code": "category",
+    },
+    "Posted Sales Invoice": {
+        "Posting Date": "datetime",
+    },
+    "Items": {
+        "Inventory Posting Group": "category",
+        "Gen. Prod. Posting Group": "category",
+    },
+}
+
+# Upload field → export it carries
+FIELD_SCHEMAS = {
+    "transfer_file": "Transfer Lines",
+    "ledger_file": "Item Ledger",
+    "po_file": "Purchase Order",
+    "lines_file": "Purchase Lines",
+    "receipt_file": "Posted Purchase Receipts",
+    "sales_order_file": "Sales Order",
+    "sales_invoice_file": "Posted Sales Invoice",
+    "items_file": "Items",
+}
+
+
+def _coerce(col, kind):
+    if kind == "category":
+        return col.astype("category")
+    if kind == "datetime":
+        return pd.to_datetime(col, errors="coerce")
+    if kind in ("float32", "float64"):
+        return pd.to_numeric(col, errors="coerce").astype(kind)
+    if kind == "int32":
+        return pd.to_numeric(col, errors="coerce").fillna(0).astype(kind)
+    raise KeyError(f"Unknown column type: {kind}")
+
+
+def apply_schema(df: pd.DataFrame, schema):
+    """
+    Coerce the columns of `df` listed in `schema` (a SCHEMAS name).
+    Header names are matched after stripping; absent columns are skipped.
+    """
+
+    types = SCHEMAS[schema]
+    df = df.copy(deep=False)
+
+    for name in df.columns:
+        kind = types.get(str(name).strip())
+        if kind is not None:
+            df[name] = _coerce(df[name], kind)
+
+    return df
+
+
+# --------------------------------------------------
+# MEMORY REPORT
+# --------------------------------------------------
+def memory_usage(raw: pd.DataFrame, typed: pd.DataFrame):
+    """In-memory size of a frame as read vs after apply_schema."""
+
+    raw_bytes = int(raw.memory_usage(deep=True, index=False).sum())
+    typed_bytes = int(typed.memory_usage(deep=True, index=False).sum())
+
+    return {
+        "raw_bytes": raw_bytes,
+        "typed_bytes": typed_bytes,
+        "reduction_pct": round(
+            (1 - typed_bytes / raw_bytes) * 100,
+            2
+        ) if raw_bytes else 0,
+    }
+
@@ -0,0 +1,87 @@
+import hashlib
+
+import pandas as pd
+
+from logic.component6_short_closed_so import (
+    DIMENSION_COLUMNS, non_shipped_orders, short_closure_metrics
+)
+
+# Bump when the cube layout or rules change
+CUBE_VERSION = 2
+
+CUBE_NAME = "short_closure_cube"
+
+DIMENSIONS = ["Month"] + list(DIMENSION_COLUMNS)
+
+MEASURES = ["Total_Non_Shipped", "Short_Closed"]
+
+
+def build_short_closure_cube(df: pd.DataFrame):
+    """
+    Non-shipped and short-closed sales order counts per
+    Month × Customer × Location × Salesperson (missing members kept as
+    NaN). Every slice / drill-down of component 6 is a sum over its rows.
+    """
+
+    df = non_shipped_orders(df)
+
+    return (
+        df.groupby(DIMENSIONS, observed=True, dropna=False)
+        .agg(
+            Total_Non_Shipped=("SO_No", "count"),
+            Short_Closed=("Short_Closed", "sum")
+        )
+        .reset_index()
+    )
+
+
+def cube_key(version):
+    """Store key of the cube built from the Sales Order dataset `version`."""
+
+    token = f"{CUBE_VERSION}:{version}"
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def load_short_closure_cube(store, version):
+    """Cube of the Sales Order dataset `version`, built once per upload."""
+
+    key = cube_key(version)
+    if not store.has_object(key):
+        store.put(
+            CUBE_NAME,
+            build_short_closure_cube(store.get_object(version)),
+            key=key
+        )
+
+    return store.get_object(key)
+
+
+def slice_cube(cube, by=("Month",), **members):
+    """
+    Component 6 metrics and per-`by` table (Total_Non_Shipped,
+    Short_Closed, Not_Short_Closed) over the cube rows matching
+    `members`, e.g. slice_cube(cube, by=("Location",), Customer="C1").
+    """
+
+    keep = pd.Series(True, index=cube.index)
+    for dimension, member in members.items():
+        if member:
+            keep &= cube[dimension].astype(str) == member
+    cube = cube[keep]
+
+    table = (
+        cube.groupby(list(by), observed=True)[MEASURES]
+        .sum()
+        .reset_index()
+    )
+
+    table["Not_Short_Closed"] = (
+        table["Total_Non_Shipped"] -
+        table["Short_Closed"]
+    )
+
+    metrics = short_closure_metrics(
+        int(cube["Total_Non_Shipped"].sum()), int(cube["Short_Closed"].sum())
+    )
+
+    return metrics, table
@@ -0,0 +1,222 @@
+import hashlib
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from logic.vendors import vendor_names
+
+# Bump when the events layout or rules change
+EVENTS_VERSION = 2
+
+EVENTS_NAME = "vendor_events"
+
+# Receipt days are offset into 0 … 2 × _DAY_OFFSET so that
+# (vendor id, receipt day) pairs fit one sortable int64. The span covers
+# every date pandas can hold (1677 … 2262); days beyond it are clipped.
+_DAY_OFFSET = 1 << 17
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def delivery_events(po_facts: pd.DataFrame):
+    """
+    One delivery event per received PO of the facts table (unsorted):
+
+        PO_Key
+        Vendor_Key, Vendor   vendor id and canonical name (Pay-to)
+        Receipt_Date         posting date of the PO's Last Receiving No.
+        Lead_Days            Receipt_Date - Order_Date (≥ 0)
+        Ordered_Qty, Received_Qty   line quantities ordered / received
+    """
+
+    df = po_facts[po_facts["Vendor_Key"] >= 0].dropna(
+        subset=["Order_Date", "Receipt_Date"]
+    )
+
+    lead_days = (df["Receipt_Date"] - df["Order_Date"]).dt.days
+    df = df[lead_days >= 0]
+
+    return pd.DataFrame({
+        "PO_Key": df["PO_Key"].to_numpy(),
+        "Vendor_Key": df["Vendor_Key"].to_numpy(),
+        "Vendor": df["Vendor"].array,
+        "Receipt_Date": df["Receipt_Date"].to_numpy(),
+        "Lead_Days": lead_days[lead_days >= 0].to_numpy(dtype=np.int32),
+        "Ordered_Qty": df["Ordered_Qty"].to_numpy(),
+        "Received_Qty": (df["Ordered_Qty"] - df["Outstanding_Qty"]).to_numpy(),
+    })
+
+
+def _days(dates):
+    return np.asarray(dates).astype("datetime64[D]").astype(np.int64)
+
+
+def _event_key(vendor_keys, days):
+    # (vendor id, receipt day) pairs as one sortable int64
+    return (
+        np.asarray(vendor_keys, dtype=np.int64) * (2 * _DAY_OFFSET)
+        + np.clip(days, -_DAY_OFFSET, _DAY_OFFSET - 1) + _DAY_OFFSET
+    )
+
+
+def _as_of_day(as_of):
+    # Days since 1970-01-01; ISO date strings go through datetime.date,
+    # so any year 1 … 9999 works (pd.Timestamp stops at 2262)
+    if isinstance(as_of, str):
+        return date.fromisoformat(as_of).toordinal() - _EPOCH_ORDINAL
+    return (pd.Timestamp(as_of) - pd.Timestamp(0)).days
+
+
+def _sort_key(events):
+    return _event_key(
+        events["Vendor_Key"].to_numpy(),
+        _days(events["Receipt_Date"])
+    )
+
+
+def build_vendor_events(po_facts: pd.DataFrame):
+    """
+    Delivery events sorted by (Vendor_Key, Receipt_Date): every vendor's
+    deliveries are one contiguous, date-ordered run, so any rolling
+    window is a pair of binary searches (see vendor_scorecard).
+    """
+
+    events = delivery_events(po_facts)
+    order = np.argsort(_sort_key(events), kind="stable")
+    return events.iloc[order].reset_index(drop=True)
+
+
+def events_key(facts_key):
+    """Store key of the events built from the facts stored as `facts_key`."""
+
+    token = f"{EVENTS_VERSION}:{facts_key}"
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def load_vendor_events(store, facts_key, po_facts):
+    """Sorted delivery events of the facts stored as `facts_key`, built once."""
+
+    key = events_key(facts_key)
+    if not store.has_object(key):
+        store.put(EVENTS_NAME, build_vendor_events(po_facts), key=key)
+
+    return store.get_object(key)
+
+
+# --------------------------------------------------
+# ROLLING WINDOWS
+# --------------------------------------------------
+def _window_percentiles(lead_days, lo, hi, percentiles):
+    # np.percentile (linear) of lead_days[lo:hi] for every vendor at once
+    counts = hi - lo
+    vendor = np.repeat(np.arange(len(lo)), counts)
+    starts = np.cumsum(counts) - counts
+    rows = np.repeat(lo - starts, counts) + np.arange(counts.sum())
+
+    # (vendor, lead days) pairs as one int64: a single sort orders both
+    span = int(lead_days.max(initial=0)) + 1
+    lead = (
+        np.sort(vendor * span + lead_days[rows]) % span
+    ).astype(np.float64)
+
+    out = {}
+    has = counts > 0
+    for q in percentiles:
+        rank = (counts[has] - 1) * (q / 100)
+        below = np.floor(rank).astype(np.int64)
+        above = np.minimum(below + 1, counts[has] - 1)
+        a = lead[starts[has] + below]
+        b = lead[starts[has] + above]
+
+        values = np.full(len(lo), np.nan)
+        values[has] = a + (b - a) * (rank - below)
+        out[q] = values
+
+    return out
+
+
+def _vendor_rows(events, vendor_keys):
+    # Events of the given vendors: one contiguous run each
+    sorted_keys = events["Vendor_Key"].to_numpy()
+    lo = np.searchsorted(sorted_keys, vendor_keys, side="left")
+    hi = np.searchsorted(sorted_keys, vendor_keys, side="right")
+    return events.iloc[np.concatenate(
+        [np.arange(start, end) for start, end in zip(lo, hi)] + [[]]
+    ).astype(np.int64)]
+
+
+def vendor_scorecard(events, as_of=None, sla_days=10,
+                     windows=(30, 90, 365), percentiles=(50, 90),
+                     vendor_keys=None):
+    """
+    Per-vendor delivery scorecard over rolling windows ending `as_of`
+    (default: the latest receipt). For each window of N days — receipts
+    dated as_of - N + 1 … as_of — the columns are:
+
+        Deliveries_N       received POs
+        On_Time_Pct_N      share received within `sla_days` of ordering
+        Lead_PQ_N          Q-th percentile of lead days (per `percentiles`)
+        Fill_Rate_N        received / ordered quantity of those POs, %
+
+    `events` must be sorted as built by build_vendor_events. Counts and
+    quantities are prefix sums read at two binary-search positions per
+    vendor; percentiles sort only the deliveries inside the window.
+    Vendors without deliveries in the longest window are left out.
+    `vendor_keys` limits the scorecard to those vendor ids (their events
+    are found by binary search; the others are not read).
+    """
+
+    if as_of is None:
+        as_of = events["Receipt_Date"].max() if len(events) else 0
+    as_of_day = _as_of_day(as_of)
+
+    if vendor_keys is not None:
+        events = _vendor_rows(events, np.sort(np.asarray(vendor_keys)))
+
+    vendors = vendor_names(events["Vendor_Key"], events["Vendor"])
+    codes = vendors.index.to_numpy()
+    key = _sort_key(events)
+
+    lead_days = events["Lead_Days"].to_numpy()
+    totals = {
+        "Deliveries": np.ones(len(events)),
+        "On_Time": (lead_days <= sla_days).astype(np.float64),
+        "Ordered": events["Ordered_Qty"].to_numpy(dtype=np.float64),
+        "Received": events["Received_Qty"].to_numpy(dtype=np.float64),
+    }
+    prefix = {
+        name: np.concatenate([[0], np.cumsum(values)])
+        for name, values in totals.items()
+    }
+
+    scorecard = {
+        "Vendor_Key": codes,
+        "Vendor": vendors.reindex(codes).to_numpy(),
+    }
+    for days in windows:
+        lo = np.searchsorted(key, _event_key(codes, as_of_day - days + 1), side="left")
+        hi = np.searchsorted(key, _event_key(codes, as_of_day), side="right")
+        sums = {name: p[hi] - p[lo] for name, p in prefix.items()}
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scorecard[f"Deliveries_{days}"] = sums["Deliveries"].astype(np.int64)
+            scorecard[f"On_Time_Pct_{days}"] = np.round(
+                sums["On_Time"] / sums["Deliveries"] * 100, 2
+            )
+            for q, values in _window_percentiles(
+                lead_days, lo, hi, percentiles
+            ).items():
+                scorecard[f"Lead_P{q}_{days}"] = np.round(values, 2)
+            scorecard[f"Fill_Rate_{days}"] = np.round(
+                np.where(
+                    sums["Ordered"] > 0,
+                    sums["Received"] / sums["Ordered"] * 100,
+                    np.nan
+                ), 2
+            )
+
+    scorecard = pd.DataFrame(scorecard)
+    return scorecard[
+        scorecard[f"Deliveries_{max(windows)}"] > 0
+    ].reset_index(drop=True)
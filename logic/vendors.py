@@ -0,0 +1,157 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+from logic.keys import dense_table, domain_size
+
+# --------------------------------------------------
+# VENDOR DIMENSION
+# --------------------------------------------------
+# Vendor names are free text and differ per export column (Pay-to Name,
+# Buy-from Vendor Name) and per spelling. At ingestion every spelling is
+# matched on a normalized key and encoded to one integer vendor id shared
+# by all purchase KPIs (KeyDictionary domain "Vendor"); the spellings are
+# kept as aliases (domain "Vendor_Alias"). Ids never change once assigned.
+VENDOR_DOMAIN = "Vendor"
+ALIAS_DOMAIN = "Vendor_Alias"
+
+DIMENSION_NAME = "vendor_dim"
+
+# Bump when vendor_dimension changes, so stored dimensions are rebuilt
+DIMENSION_VERSION = 1
+
+# Export column → vendor id column added at ingestion
+VENDOR_COLUMNS = {
+    "Purchase Order": {
+        "Pay-to Name": "Vendor_Key",
+        "Buy-from Vendor Name": "Buy_From_Vendor_Key",
+    },
+}
+
+
+def clean_name(names):
+    """Display form of vendor names: stripped, single spaces."""
+
+    return (
+        pd.Series(names, dtype=object)
+        .astype(str)
+        .str.strip()
+        .str.replace(r"\s+", " ", regex=True)
+    )
+
+
+def match_key(names):
+    """
+    Key the spellings of one vendor share: upper-case words without
+    punctuation ("Acme Pvt. Ltd" and "ACME PVT LTD" match). Blank → NaN.
+    """
+
+    key = (
+        pd.Series(names, dtype=object)
+        .str.upper()
+        .str.replace(r"[^\w&]+", " ", regex=True)
+        .str.strip()
+    )
+    return key.where(key != "")
+
+
+def vendor_dimension(keys):
+    """
+    Vendor dimension from the KeyDictionary `keys`, one row per alias:
+
+        Vendor_Key   integer vendor id
+        Vendor       canonical name (the vendor's first spelling seen)
+        Alias        a spelling of the vendor in the uploaded exports
+    """
+
+    aliases = keys.load(ALIAS_DOMAIN)
+    ids = keys.load(VENDOR_DOMAIN).get_indexer(match_key(aliases))
+
+    dim = pd.DataFrame({"Vendor_Key": ids.astype(np.int32), "Alias": aliases})
+    dim = dim[dim["Vendor_Key"] >= 0]
+    dim.insert(1, "Vendor", dim.groupby("Vendor_Key")["Alias"].transform("first"))
+
+    return dim.sort_values("Vendor_Key", kind="stable").reset_index(drop=True)
+
+
+def dimension_key(keys):
+    """
+    Store key of the vendor dimension of the KeyDictionary `keys`: a hash
+    of its vendor and alias dictionaries.
+    """
+
+    digest = hashlib.sha256(f"{DIMENSION_VERSION}".encode())
+    for domain in (VENDOR_DOMAIN, ALIAS_DOMAIN):
+        values = keys.load(domain)
+        digest.update(f":{domain}:{len(values)}:".encode())
+        hashes = pd.util.hash_array(values.to_numpy(dtype=object))
+        digest.update(hashes.tobytes())
+    return digest.hexdigest()
+
+
+def load_vendor_dimension(store, keys):
+    """
+    Vendor dimension of the KeyDictionary `keys`, stored as DIMENSION_NAME
+    once per state of its dictionaries.
+    """
+
+    key = dimension_key(keys)
+    if not store.has_object(key):
+        store.put(DIMENSION_NAME, vendor_dimension(keys), key=key)
+    elif store.version(DIMENSION_NAME) != key:
+        store.link(DIMENSION_NAME, key)
+
+    return store.get_object(key)
+
+
+def _canonical_names(ids, canonical):
+    # Categorical of the canonical names of vendor ids (-1 → NaN)
+    present = np.unique(ids[ids >= 0])
+    return pd.Categorical.from_codes(
+        np.where(ids >= 0, np.searchsorted(present, ids), -1),
+        categories=canonical.reindex(present).to_numpy()
+    )
+
+
+def encode_vendors(df: pd.DataFrame, schema, keys):
+    """
+    Add the vendor id columns of VENDOR_COLUMNS and rewrite the name
+    columns to each vendor's canonical name. Only the distinct names are
+    matched; rows are remapped through their category codes.
+    """
+
+    for name, key_column in VENDOR_COLUMNS.get(schema, {}).items():
+        if name not in df.columns:
+            continue
+
+        names = df[name].astype("category")
+        codes = names.cat.codes.to_numpy()
+
+        spellings = clean_name(names.cat.categories)
+        matched = match_key(spellings)
+        keys.encode(ALIAS_DOMAIN, spellings.where(matched.notna()))
+        ids = keys.encode(VENDOR_DOMAIN, matched)
+
+        dim = vendor_dimension(keys).drop_duplicates("Vendor_Key")
+        canonical = pd.Series(dim["Vendor"].to_numpy(), index=dim["Vendor_Key"])
+
+        row_ids = np.where(codes >= 0, ids[codes], -1).astype(np.int32)
+        df[key_column] = row_ids
+        df[name] = _canonical_names(row_ids, canonical)
+
+    return df
+
+
+def vendor_names(vendor_keys, names):
+    """Vendor_Key → name of the (id, name) pairs of the given rows."""
+
+    vendor_keys = np.asarray(vendor_keys)
+    names = pd.Categorical(names)
+
+    table = dense_table(
+        vendor_keys, names.codes, domain_size(vendor_keys), -1
+    )
+    present = np.flatnonzero(table >= 0)
+
+    return pd.Series(names.categories.take(table[present]), index=present)
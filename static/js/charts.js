@@ -0,0 +1,15 @@
+// Renders the figures a page carries as JSON (see chart_html in app.py):
+// each <script type="application/json" class="plotly-figure"> becomes a
+// chart drawn with the shared layout template (plotly-template.js).
+document.addEventListener("DOMContentLoaded", function () {
+    document.querySelectorAll("script.plotly-figure").forEach(function (spec) {
+        const figure = JSON.parse(spec.textContent);
+        figure.layout = Object.assign(
+            {template: window.PLOTLY_TEMPLATE}, figure.layout
+        );
+
+        const chart = document.createElement("div");
+        spec.after(chart);
+        Plotly.newPlot(chart, figure.data, figure.layout, {responsive: true});
+    });
+});
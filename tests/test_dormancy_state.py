@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import item_ledger
+from logic.dataset_store import DatasetStore
+from logic.dormancy_state import build_dormancy_state, load_dormancy_state
+
+
+def consume(ledger, share, seed):
+    # Stock drawn from old entries: lower Remaining Quantity and Cost Amount
+    rng = np.random.default_rng(seed)
+    ledger = ledger.copy()
+    used = rng.random(len(ledger)) < share
+    ledger.loc[used, "Remaining Quantity"] = 0
+    ledger.loc[used, "Cost Amount (Actual)"] *= 0.5
+    return ledger
+
+
+@pytest.fixture
+def store(tmp_path):
+    return DatasetStore(str(tmp_path))
+
+
+def upload(store, ledger):
+    store.put("ledger", ledger)
+    return load_dormancy_state(store, store.version("ledger"))
+
+
+def test_incremental_state_equals_full_build(store):
+    ledger = item_ledger(2000, extra_cols=0)
+
+    upload(store, ledger.iloc[:1200])
+    current = consume(ledger, 0.3, seed=1)
+    state = upload(store, current)
+
+    pd.testing.assert_frame_equal(state, build_dormancy_state(current))
+
+
+def test_reupload_at_watermark_rereads_stock(store):
+    ledger = item_ledger(2000, extra_cols=0)
+
+    upload(store, ledger)
+    current = consume(ledger, 0.5, seed=2)
+    state = upload(store, current)
+
+    pd.testing.assert_frame_equal(state, build_dormancy_state(current))
+    assert state["On_Hand"].sum() < build_dormancy_state(ledger)["On_Hand"].sum()
+
+
+def test_ledger_below_watermark_rebuilds(store):
+    ledger = item_ledger(2000, extra_cols=0)
+
+    upload(store, ledger)
+    state = upload(store, ledger.iloc[:500])
+
+    pd.testing.assert_frame_equal(state, build_dormancy_state(ledger.iloc[:500]))
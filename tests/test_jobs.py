@@ -0,0 +1,45 @@
+import time
+
+import pytest
+
+from logic.jobs import JobQueue
+
+
+def wait(queue, job_id):
+    for _ in range(200):
+        state = queue.get(job_id)
+        if state["status"] in ("done", "failed"):
+            return state
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def spool(job, fail):
+    with open(job.file_path("upload.xlsx"), "wb") as fh:
+        fh.write(b"spooled")
+    if fail:
+        raise ValueError("bad sheet")
+
+
+@pytest.mark.parametrize("fail, status", [(False, "done"), (True, "failed")])
+def test_scratch_removed(tmp_path, fail, status):
+    queue = JobQueue(str(tmp_path), max_workers=1)
+    job = queue.create(files=["po_file"])
+
+    state = wait(queue, queue.start(job, spool, fail))
+
+    assert state["status"] == status
+    assert state["error"] == ("bad sheet" if fail else None)
+    assert not (tmp_path / "jobs" / job.id / "scratch").exists()
+
+
+def test_prune_finished_jobs(tmp_path):
+    queue = JobQueue(str(tmp_path), max_workers=1)
+    done = queue.create(files=["po_file"])
+    wait(queue, queue.start(done, spool, False))
+    queued = queue.create(files=["po_file"])
+
+    assert queue.prune(ttl=3600) == []
+    assert queue.prune(ttl=-1) == [done.id]
+    assert queue.get(done.id) is None
+    assert queue.get(queued.id)["status"] == "queued"
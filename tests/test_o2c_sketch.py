@@ -0,0 +1,127 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import sales_set
+from logic.component4_sales_invoice import PERCENTILES, run_component4
+from logic.ingest import prepare
+from logic.keys import KeyDictionary
+from logic.o2c_sketch import build_o2c_sketch, o2c_metrics, o2c_monthly
+
+
+def prepared(tmp_path, frames):
+    keys = KeyDictionary(str(tmp_path))
+    return tuple(
+        prepare(field, frames[field], keys=keys)
+        for field in ("sales_order_file", "sales_invoice_file")
+    )
+
+
+def assert_same(expected, actual):
+    # Equal values; NaN (no valid cycle) matches NaN
+    assert expected.keys() == actual.keys()
+    for name in expected:
+        e, a = expected[name], actual[name]
+        assert e == a or (np.isnan(e) and np.isnan(a)), (name, e, a)
+
+
+@pytest.fixture(scope="module")
+def sales(tmp_path_factory):
+    df_so, df_inv = prepared(tmp_path_factory.mktemp("keys"), sales_set(3000))
+    return df_so, df_inv, build_o2c_sketch(df_so, df_inv)
+
+
+def orders_in(df_so, start=None, end=None, customer=None):
+    month = df_so["Document Date"].dt.to_period("M").astype(str)
+    keep = pd.Series(True, index=df_so.index)
+    if start:
+        keep &= month >= start
+    if end:
+        keep &= month <= end
+    if customer:
+        keep &= df_so["Sell-to Customer No."] == customer
+    return df_so[keep]
+
+
+def test_whole_range(sales):
+    df_so, df_inv, sketch = sales
+
+    expected, _ = run_component4(df_so, df_inv)
+    assert_same(expected, o2c_metrics(sketch))
+
+
+@pytest.mark.parametrize("start, end", [
+    ("2024-06", "2024-06"),
+    ("2024-01", "2024-03"),
+    ("2024-04", None),
+    (None, "2024-02"),
+    ("2030-01", "2030-12"),  # no orders
+])
+def test_month_ranges(sales, start, end):
+    df_so, df_inv, sketch = sales
+
+    expected, _ = run_component4(orders_in(df_so, start, end), df_inv)
+    assert_same(expected, o2c_metrics(sketch, start, end))
+
+
+@pytest.mark.parametrize("start, end", [(None, None), ("2024-02", "2024-05")])
+def test_customer(sales, start, end):
+    df_so, df_inv, sketch = sales
+    customer = df_so["Sell-to Customer No."].dropna().iloc[0]
+
+    expected, _ = run_component4(orders_in(df_so, start, end, customer), df_inv)
+    assert_same(expected, o2c_metrics(sketch, start, end, customer))
+
+
+def test_monthly(sales):
+    df_so, df_inv, sketch = sales
+
+    monthly = o2c_monthly(sketch, "2024-02", "2024-05")
+    assert list(monthly["Month"]) == ["2024-02", "2024-03", "2024-04", "2024-05"]
+
+    for row in monthly.to_dict("records"):
+        month = row.pop("Month")
+        expected, _ = run_component4(orders_in(df_so, month, month), df_inv)
+        for name in ("total_sos", "shipment_pct"):
+            expected.pop(name)
+        assert_same(expected, row)
+
+
+def test_empty_range(sales):
+    _, _, sketch = sales
+
+    assert o2c_monthly(sketch, "2030-01", "2030-12").empty
+    assert o2c_metrics(sketch, "2030-01", "2030-12")["total_sos"] == 0
+
+
+@pytest.mark.parametrize("days", [
+    [12],                       # one order
+    [5, 5, 5, 5],               # all tied
+    [0, 3, 3, 3, 3, 3, 40],     # ties around the median
+    [1, 2],
+    list(range(0, 366, 7)),     # up to MAX_O2C_DAYS
+])
+def test_percentiles(tmp_path, days):
+    ordered = pd.Timestamp("2024-01-10")
+    so_no = [f"SO-{i}" for i in range(len(days))]
+    frames = {
+        "sales_order_file": pd.DataFrame({
+            "No.": so_no,
+            "Document Date": ordered,
+            "Completely Shipped": True,
+            "Sell-to Customer No.": "C1",
+        }),
+        "sales_invoice_file": pd.DataFrame({
+            "Order No.": so_no,
+            "Posting Date": ordered + pd.to_timedelta(days, unit="D"),
+        }),
+    }
+    df_so, df_inv = prepared(tmp_path, frames)
+    metrics = o2c_metrics(build_o2c_sketch(df_so, df_inv))
+
+    assert metrics["median_cycle"] == round(np.percentile(days, 50), 2)
+    for q in PERCENTILES:
+        assert metrics[f"p{q}_cycle"] == round(np.percentile(days, q), 2)
+
+    expected, _ = run_component4(df_so, df_inv)
+    assert_same(expected, metrics)
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import sales_set
+from logic.component6_short_closed_so import DIMENSION_COLUMNS, run_component6
+from logic.ingest import prepare
+from logic.keys import KeyDictionary
+from logic.short_closure_cube import build_short_closure_cube, slice_cube
+
+
+@pytest.fixture(scope="module")
+def orders(tmp_path_factory):
+    df = sales_set(3000)["sales_order_file"]
+
+    # Blank order numbers (e.g. total lines) are not orders
+    blank = np.random.default_rng(1).random(len(df)) < 0.05
+    df["No."] = df["No."].where(~blank)
+
+    keys = KeyDictionary(str(tmp_path_factory.mktemp("keys")))
+    df = prepare("sales_order_file", df, keys=keys)
+    assert df["No."].isna().any()
+
+    return df, build_short_closure_cube(df)
+
+
+def orders_in(df, month=None, **members):
+    keep = pd.Series(True, index=df.index)
+    if month:
+        keep &= df["Document Date"].dt.to_period("M").astype(str) == month
+    for dimension, member in members.items():
+        keep &= df[DIMENSION_COLUMNS[dimension]].astype(str) == member
+    return df[keep]
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"Customer": "C3"},
+    {"Location": "LF-1", "Salesperson": "SP2"},
+    {"Month": "2024-06", "Customer": "C5"},
+])
+def test_slice_matches_component6(orders, filters):
+    df, cube = orders
+    members = {k: v for k, v in filters.items() if k != "Month"}
+
+    metrics, monthly = slice_cube(cube, **filters)
+    expected_metrics, expected_monthly = run_component6(
+        orders_in(df, filters.get("Month"), **members)
+    )
+
+    assert expected_metrics["Total_Non_Shipped"] > 0
+    assert metrics == expected_metrics
+    pd.testing.assert_frame_equal(
+        monthly, expected_monthly, check_dtype=False
+    )
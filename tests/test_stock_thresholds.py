@@ -0,0 +1,27 @@
+import re
+
+import pytest
+
+from logic.component7_cost_optimization import parse_thresholds
+
+
+def test_valid():
+    assert parse_thresholds('{"PKG": [10000, 40000], "RM": [0, 0.5]}') == {
+        "PKG": (10000, 40000), "RM": (0, 0.5)
+    }
+    assert parse_thresholds("{}") == {}
+
+
+@pytest.mark.parametrize("text, message", [
+    ('{"PKG": [1, 2]', "not valid JSON"),
+    ('[[1, 2]]', "must be an object"),
+    ('{" ": [1, 2]}', "blank posting group"),
+    ('{"PKG": [1]}', "expected [RED max, YELLOW max]"),
+    ('{"PKG": [1, "2"]}', "expected [RED max, YELLOW max]"),
+    ('{"PKG": [true, 2]}', "expected [RED max, YELLOW max]"),
+    ('{"PKG": 5}', "expected [RED max, YELLOW max]"),
+    ('{"PKG": [40000, 10000]}', "RED max 40000 is above YELLOW max 10000"),
+])
+def test_invalid(text, message):
+    with pytest.raises(ValueError, match=re.escape(message)):
+        parse_thresholds(text)
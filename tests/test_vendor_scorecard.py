@@ -0,0 +1,38 @@
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import purchase_set
+from logic.component3c_vendor_performance import run_component3c_scorecard
+from logic.ingest import prepare
+from logic.keys import KeyDictionary
+from logic.po_facts import build_po_facts
+from logic.vendor_scorecard import build_vendor_events, vendor_scorecard
+
+
+@pytest.fixture(scope="module")
+def events(tmp_path_factory):
+    frames = purchase_set(2000, n_items=200)
+    keys = KeyDictionary(str(tmp_path_factory.mktemp("keys")))
+    facts = build_po_facts(*(
+        prepare(field, frames[field], keys=keys)
+        for field in ("po_file", "receipt_file", "lines_file", "items_file")
+    ))
+    return build_vendor_events(facts)
+
+
+def test_iso_as_of_matches_timestamp(events):
+    as_of = events["Receipt_Date"].max() - pd.Timedelta(days=40)
+
+    pd.testing.assert_frame_equal(
+        vendor_scorecard(events, as_of.date().isoformat()),
+        vendor_scorecard(events, as_of)
+    )
+
+
+@pytest.mark.parametrize("as_of", ["0001-01-01", "1500-06-30", "2500-01-01", "9999-12-31"])
+def test_as_of_beyond_pandas_range(events, as_of):
+    # No receipts that far out: every window is empty, nothing raises
+    assert vendor_scorecard(events, as_of).empty
+
+    metrics, scorecard, _ = run_component3c_scorecard(events, as_of)
+    assert scorecard.empty
@@ -0,0 +1,31 @@
+import os
+
+import pandas as pd
+
+from logic.dataset_store import DatasetStore
+from logic.keys import KeyDictionary
+from logic.vendors import DIMENSION_NAME, encode_vendors, load_vendor_dimension
+
+
+def upload(store, keys, names):
+    encode_vendors(pd.DataFrame({"Pay-to Name": names}), "Purchase Order", keys)
+    load_vendor_dimension(store, keys)
+    return store.version(DIMENSION_NAME)
+
+
+def test_dimension_stored_once_per_dictionary_state(tmp_path):
+    store = DatasetStore(str(tmp_path))
+    keys = KeyDictionary(store.root)
+
+    first = upload(store, keys, ["Acme Pvt. Ltd", "Beta Corp"])
+
+    # Re-upload with the same spellings: the stored dimension is reused
+    assert upload(store, keys, ["Beta Corp", "Acme Pvt. Ltd"]) == first
+    assert len(os.listdir(store.objects_dir)) == 1
+
+    # A new spelling is a new alias row
+    second = upload(store, keys, ["ACME PVT LTD"])
+    assert second != first
+    assert store.get(DIMENSION_NAME)["Alias"].tolist() == [
+        "Acme Pvt. Ltd", "ACME PVT LTD", "Beta Corp"
+    ]